@@ -0,0 +1 @@
+# 改进版 ARL MCP 服务器：配置、ARL 客户端、本地存储与按分组注册的 MCP 工具
@@ -0,0 +1,4 @@
+# python -m arl_mcp 启动入口
+from .app import main
+
+main()
@@ -0,0 +1,147 @@
+# MCP 服务实例与启动入口
+import argparse
+import hmac
+import logging
+import os
+import sys
+
+import anyio
+from mcp.server.fastmcp import FastMCP
+from starlette.responses import JSONResponse
+
+from .config import (
+    ARL_CLIENT_CONCURRENCY,
+    ARL_MCP_AUTH_TOKEN,
+    ARL_MCP_FILE_DIRS,
+    ARL_MCP_HOST,
+    ARL_MCP_PORT,
+    ARL_MCP_TRANSPORT,
+    ARL_TOKEN,
+    ARL_TOOL_GROUPS,
+    ARL_URL,
+)
+from .metrics import instrument_tool
+from .sessions import limit_per_client, sessions
+
+TRANSPORTS = ("stdio", "sse", "streamable-http")
+LOOPBACK_HOSTS = ("127.0.0.1", "localhost", "::1")
+
+# 初始化 MCP 服务；监听地址只在 sse/streamable-http 模式下使用
+mcp = FastMCP("ARL-Improved", host=ARL_MCP_HOST, port=ARL_MCP_PORT)
+
+# httpx 默认为每个请求输出 INFO 日志，会刷屏 stderr
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+# 网络模式下工具参数中的服务端路径只能位于这些目录内；stdio 模式下调用方即本机用户，为 None 不做限制
+_file_dirs: list[str] | None = None
+
+
+def tool(*args, **kwargs):
+    """
+    工具注册装饰器，代替 mcp.tool()：先包装按会话的并发限制（见 sessions）与计时统计（见 metrics），
+    再注册到 mcp。参数原样传给 mcp.tool()。
+    """
+    def decorator(fn):
+        return mcp.tool(*args, **kwargs)(instrument_tool(limit_per_client(fn)))
+    return decorator
+
+
+def server_path(path: str) -> str:
+    """
+    把工具参数中的服务端文件路径展开为绝对路径。
+
+    网络模式下调用方不一定能登录本机，路径（解析符号链接后）须位于 ARL_MCP_FILE_DIRS 内，
+    否则抛出 PermissionError。
+    """
+    path = os.path.abspath(os.path.expanduser(path))
+    if _file_dirs is not None:
+        real = os.path.realpath(path)
+        if not any(os.path.commonpath([real, d]) == d for d in _file_dirs):
+            raise PermissionError(f"网络模式下只能访问以下目录内的文件: {', '.join(_file_dirs)}")
+    return path
+
+
+class _BearerAuth:
+    """网络模式的访问令牌校验：HTTP 请求须携带 Authorization: Bearer <令牌>，否则返回 401"""
+
+    def __init__(self, app, token: str):
+        self.app = app
+        self.token = token.encode()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            header = dict(scope["headers"]).get(b"authorization", b"")
+            scheme, _, credential = header.partition(b" ")
+            # 逐字节比较耗时与令牌内容无关，避免按响应时间猜出令牌
+            if scheme.lower() != b"bearer" or not hmac.compare_digest(credential.strip(), self.token):
+                response = JSONResponse({"error": "unauthorized"}, status_code=401, headers={"WWW-Authenticate": "Bearer"})
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+async def _serve(transport: str) -> None:
+    """与 mcp.run 相同地以 uvicorn 运行网络传输，在 MCP 应用外包一层访问令牌校验"""
+    import uvicorn
+
+    app = mcp.sse_app() if transport == "sse" else mcp.streamable_http_app()
+    if ARL_MCP_AUTH_TOKEN:
+        app = _BearerAuth(app, ARL_MCP_AUTH_TOKEN)
+    config = uvicorn.Config(
+        app,
+        host=mcp.settings.host,
+        port=mcp.settings.port,
+        log_level=mcp.settings.log_level.lower(),
+    )
+    await uvicorn.Server(config).serve()
+
+
+def _listen_on(host: str, port: int) -> None:
+    """
+    命令行覆盖监听地址。
+
+    FastMCP 在监听回环地址时自动开启 DNS 重绑定防护，只接受 localhost 的 Host 头；
+    改为监听其他地址时关闭该防护，否则远程客户端的请求会被拒绝，此时由访问令牌校验调用方（见 main）。
+    """
+    if host not in LOOPBACK_HOSTS and mcp.settings.host in LOOPBACK_HOSTS:
+        if getattr(mcp.settings, "transport_security", None) is not None:
+            mcp.settings.transport_security = None
+    mcp.settings.host = host
+    mcp.settings.port = port
+
+
+def main():
+    from .tools import register_tools
+
+    parser = argparse.ArgumentParser(description="ARL MCP 服务器")
+    parser.add_argument("--transport", choices=TRANSPORTS, default=ARL_MCP_TRANSPORT, help="MCP 传输方式")
+    parser.add_argument("--host", default=ARL_MCP_HOST, help="网络模式的监听地址")
+    parser.add_argument("--port", type=int, default=ARL_MCP_PORT, help="网络模式的监听端口")
+    args = parser.parse_args()
+    if args.transport not in TRANSPORTS:
+        parser.error(f"不支持的传输方式: {args.transport}，可选值：{', '.join(TRANSPORTS)}")
+    if args.transport != "stdio" and args.host not in LOOPBACK_HOSTS and not ARL_MCP_AUTH_TOKEN:
+        parser.error(f"监听非回环地址 {args.host} 时必须设置 ARL_MCP_AUTH_TOKEN")
+
+    groups = register_tools(ARL_TOOL_GROUPS)
+    # stdout 是 stdio 传输的协议通道，启动信息输出到 stderr
+    print(f"[+] ARL MCP 改进版正在运行", file=sys.stderr)
+    print(f"[+] ARL URL: {ARL_URL}", file=sys.stderr)
+    print(f"[+] Token: {ARL_TOKEN[:10]}...", file=sys.stderr)
+    print(f"[+] 工具分组: {', '.join(groups)}", file=sys.stderr)
+    if args.transport == "stdio":
+        mcp.run(transport="stdio")
+        return
+
+    global _file_dirs
+    _listen_on(args.host, args.port)
+    # 多个客户端共用一个进程，限制每个会话同时执行的工具调用数
+    sessions.limit = ARL_CLIENT_CONCURRENCY
+    # 调用方可能来自其他主机：工具读写的服务端文件限制在配置的目录内
+    _file_dirs = [os.path.realpath(os.path.expanduser(d)) for d in ARL_MCP_FILE_DIRS]
+    path = mcp.settings.sse_path if args.transport == "sse" else mcp.settings.streamable_http_path
+    print(f"[+] 传输方式: {args.transport}，监听 http://{args.host}:{args.port}{path}", file=sys.stderr)
+    print(f"[+] 访问令牌: {'已启用' if ARL_MCP_AUTH_TOKEN else '未设置（仅限回环地址）'}", file=sys.stderr)
+    print(f"[+] 允许访问的服务端目录: {', '.join(_file_dirs)}", file=sys.stderr)
+    print(f"[+] 每个客户端同时执行的工具调用数: {ARL_CLIENT_CONCURRENCY or '不限'}", file=sys.stderr)
+    anyio.run(_serve, args.transport)
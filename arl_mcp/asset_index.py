@@ -0,0 +1,326 @@
+# 跨任务资产的本地检索索引（SQLite FTS5），按资产范围从 ARL 批量同步，由用到它的工具在首次调用时导入
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from .backends import current_backend, fan_out, merge_failures, should_fan_out
+from .client import fetch_all_items, iter_pages
+from .config import ARL_ASSET_INDEX_PATH
+
+# 资产类型 -> ARL 资产接口
+ASSET_KINDS = {
+    "domain": "/api/asset_domain/",
+    "ip": "/api/asset_ip/",
+    "site": "/api/asset_site/",
+}
+
+# 可检索的文本列；trigram 分词支持任意位置的子串匹配
+TEXT_COLUMNS = ("domain", "ip", "site", "title", "finger")
+
+
+def _names(values) -> list[str]:
+    if isinstance(values, list):
+        return [str(v) for v in values if v not in (None, "")]
+    return [str(values)] if values not in (None, "") else []
+
+
+def _host(url: str) -> str:
+    host = url.split("://", 1)[-1].split("/", 1)[0]
+    return host.rsplit(":", 1)[0] if host.count(":") == 1 else host
+
+
+def _port(url: str) -> int:
+    host = url.split("://", 1)[-1].split("/", 1)[0]
+    if host.count(":") == 1 and host.rsplit(":", 1)[1].isdigit():
+        return int(host.rsplit(":", 1)[1])
+    return 443 if url.startswith("https://") else 80
+
+
+def index_fields(kind: str, item: dict) -> tuple[dict, list[int]]:
+    """资产记录中参与检索的文本列与端口列表"""
+    if kind == "domain":
+        ips = dict.fromkeys(_names(item.get("ips")) + _names(item.get("record")))
+        return {"domain": item.get("domain", ""), "ip": " ".join(ips)}, []
+    if kind == "ip":
+        port_info = [p for p in item.get("port_info") or [] if isinstance(p, dict)]
+        services = []
+        for p in port_info:
+            services.extend(_names(p.get("service_name")) + _names(p.get("product")))
+        ports = [int(p["port_id"]) for p in port_info if str(p.get("port_id", "")).isdigit()]
+        return {
+            "domain": " ".join(_names(item.get("domain"))),
+            "ip": item.get("ip", ""),
+            "finger": " ".join(dict.fromkeys(services)),
+        }, ports
+    site = item.get("site", "")
+    fingers = [f.get("name", "") for f in item.get("finger") or [] if isinstance(f, dict)]
+    return {
+        "domain": _host(site),
+        "ip": " ".join(_names(item.get("ip"))),
+        "site": site,
+        "title": item.get("title", ""),
+        "finger": " ".join(_names(fingers)),
+    }, [_port(site)] if site else []
+
+
+class AssetIndex:
+    """
+    资产范围内的域名、IP、站点的本地检索索引。
+
+    每条资产以 (类型, 资产范围, 节点, _id) 为键保存原始记录，检索列写入 trigram 分词的
+    FTS5 表，端口单独建索引；按域名、IP、站点、标题、指纹的子串或前缀与端口检索时不再访问 ARL。
+    同一库中记录每个 类型+资产范围+节点 的上次同步时间与条数。
+    方法均为阻塞调用，在事件循环中需经 asyncio.to_thread 执行。
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS assets (
+                    kind TEXT NOT NULL,
+                    scope_id TEXT NOT NULL,
+                    backend TEXT NOT NULL,
+                    asset_id TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    UNIQUE (kind, scope_id, backend, asset_id)
+                );
+                CREATE VIRTUAL TABLE IF NOT EXISTS assets_fts USING fts5(
+                    domain, ip, site, title, finger, tokenize = 'trigram'
+                );
+                CREATE TABLE IF NOT EXISTS asset_ports (
+                    asset INTEGER NOT NULL,
+                    port INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS asset_ports_port ON asset_ports (port);
+                CREATE INDEX IF NOT EXISTS asset_ports_asset ON asset_ports (asset);
+                CREATE TABLE IF NOT EXISTS syncs (
+                    kind TEXT NOT NULL,
+                    scope_id TEXT NOT NULL,
+                    backend TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    synced_at REAL NOT NULL,
+                    PRIMARY KEY (kind, scope_id, backend)
+                );
+                """
+            )
+            self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def _delete_rows(conn: sqlite3.Connection, rowids: list[int]) -> None:
+        for start in range(0, len(rowids), 500):
+            chunk = rowids[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            conn.execute(f"DELETE FROM assets WHERE rowid IN ({marks})", chunk)
+            conn.execute(f"DELETE FROM assets_fts WHERE rowid IN ({marks})", chunk)
+            conn.execute(f"DELETE FROM asset_ports WHERE asset IN ({marks})", chunk)
+
+    def known_ids(self, kind: str, scope_id: str, backend: str) -> set[str]:
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT asset_id FROM assets WHERE kind = ? AND scope_id = ? AND backend = ?",
+                (kind, scope_id, backend),
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def save(self, kind: str, scope_id: str, backend: str, items: list[dict], replace: bool = False) -> int:
+        """
+        写入资产记录并更新同步时间，返回该 类型+资产范围+节点 的条数。
+
+        replace 为 True 时先清空该 类型+资产范围+节点 的旧记录（全量同步）。
+        """
+        with self._lock:
+            conn = self._connect()
+            if replace:
+                rows = conn.execute(
+                    "SELECT rowid FROM assets WHERE kind = ? AND scope_id = ? AND backend = ?",
+                    (kind, scope_id, backend),
+                ).fetchall()
+                self._delete_rows(conn, [row[0] for row in rows])
+            for item in items:
+                asset_id = str(item.get("_id", ""))
+                if not asset_id:
+                    continue
+                old = conn.execute(
+                    "SELECT rowid FROM assets WHERE kind = ? AND scope_id = ? AND backend = ? AND asset_id = ?",
+                    (kind, scope_id, backend, asset_id),
+                ).fetchone()
+                if old is not None:
+                    self._delete_rows(conn, [old[0]])
+                rowid = conn.execute(
+                    "INSERT INTO assets (kind, scope_id, backend, asset_id, data) VALUES (?, ?, ?, ?, ?)",
+                    (kind, scope_id, backend, asset_id, json.dumps(item, ensure_ascii=False)),
+                ).lastrowid
+                text, ports = index_fields(kind, item)
+                conn.execute(
+                    "INSERT INTO assets_fts (rowid, domain, ip, site, title, finger) VALUES (?, ?, ?, ?, ?, ?)",
+                    (rowid, *(text.get(column, "") for column in TEXT_COLUMNS)),
+                )
+                conn.executemany(
+                    "INSERT INTO asset_ports (asset, port) VALUES (?, ?)",
+                    [(rowid, port) for port in dict.fromkeys(ports)],
+                )
+            count = conn.execute(
+                "SELECT COUNT(*) FROM assets WHERE kind = ? AND scope_id = ? AND backend = ?",
+                (kind, scope_id, backend),
+            ).fetchone()[0]
+            conn.execute(
+                "INSERT OR REPLACE INTO syncs VALUES (?, ?, ?, ?, ?)",
+                (kind, scope_id, backend, count, time.time()),
+            )
+            conn.commit()
+        return count
+
+    def search(
+        self,
+        kind: str,
+        scope_id: str,
+        terms: dict[str, str],
+        port: int = 0,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> tuple[int, list[tuple[str, str, dict]]]:
+        """
+        检索资产，返回 (总条数, [(节点, 类型, 原始记录)])。
+
+        terms 为 检索列 -> 关键词，关键词以 * 结尾时按前缀匹配，否则按子串匹配，均不区分大小写；
+        3 个字符及以上的关键词先经 FTS5 缩小范围，更短的关键词逐条比较。
+        kind、scope_id 为空时不限制。
+        """
+        where, params, matches = [], [], []
+        if kind:
+            where.append("a.kind = ?")
+            params.append(kind)
+        if scope_id:
+            where.append("a.scope_id = ?")
+            params.append(scope_id)
+        for column, term in terms.items():
+            prefix = term.endswith("*")
+            value = term.rstrip("*")
+            if not value:
+                continue
+            if len(value) >= 3:
+                matches.append(f'{column} : "{value.replace(chr(34), chr(34) * 2)}"')
+            escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            if prefix:
+                # 多个取值以空格拼接，前缀可以出现在任一取值的开头
+                where.append(f"(f.{column} LIKE ? ESCAPE '\\' OR f.{column} LIKE ? ESCAPE '\\')")
+                params.extend([f"{escaped}%", f"% {escaped}%"])
+            elif len(value) < 3:
+                where.append(f"f.{column} LIKE ? ESCAPE '\\'")
+                params.append(f"%{escaped}%")
+        if matches:
+            where.append("assets_fts MATCH ?")
+            params.append(" AND ".join(matches))
+        if port:
+            where.append("a.rowid IN (SELECT asset FROM asset_ports WHERE port = ?)")
+            params.append(port)
+
+        clause = f"WHERE {' AND '.join(where)}" if where else ""
+        source = "assets AS a JOIN assets_fts AS f ON f.rowid = a.rowid"
+        with self._lock:
+            conn = self._connect()
+            total = conn.execute(f"SELECT COUNT(*) FROM {source} {clause}", params).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT a.backend, a.kind, a.data FROM {source} {clause} ORDER BY a.kind, a.rowid LIMIT ? OFFSET ?",
+                [*params, limit, offset],
+            ).fetchall()
+        return total, [(backend, item_kind, json.loads(data)) for backend, item_kind, data in rows]
+
+    def stats(self) -> dict:
+        if not self.enabled:
+            return {"enabled": False}
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT kind, scope_id, backend, count, synced_at FROM syncs ORDER BY scope_id, kind, backend"
+            ).fetchall()
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        return {
+            "enabled": True,
+            "path": self.path,
+            "bytes": size,
+            "assets": sum(row[3] for row in rows),
+            "synced": [
+                {"kind": kind, "scope_id": scope_id, "backend": backend, "count": count, "synced_at": synced_at}
+                for kind, scope_id, backend, count, synced_at in rows
+            ],
+        }
+
+
+asset_index = AssetIndex(ARL_ASSET_INDEX_PATH)
+
+# 同一 类型+资产范围 同时只进行一次同步
+_sync_locks: dict[tuple[str, str], asyncio.Lock] = {}
+
+
+async def _sync_backend(kind: str, scope_id: str, full: bool) -> dict:
+    """
+    在当前节点上同步一个 类型+资产范围。
+
+    增量同步依赖 ARL 按 _id 倒序返回：从第一页起只写入新记录，遇到已有记录的页即停止；
+    之后若本地条数与 ARL 的 total 不一致（有资产被删除，或返回顺序不同），改为全量同步。
+    已有资产的内容变化（如标题、端口）只在全量同步时更新。
+    """
+    backend = current_backend().name
+    path = ASSET_KINDS[kind]
+    params = {"scope_id": scope_id}
+    known = set() if full else await asyncio.to_thread(asset_index.known_ids, kind, scope_id, backend)
+
+    if known:
+        fresh, total, pages = [], None, 0
+        pager = iter_pages(path, params)
+        try:
+            async for items, page_total in pager:
+                pages += 1
+                total = page_total if isinstance(page_total, int) else total
+                new = [item for item in items if item.get("_id") not in known]
+                fresh.extend(new)
+                if len(new) < len(items):
+                    break
+        finally:
+            await pager.aclose()
+        if total is None or len(known) + len(fresh) == total:
+            count = await asyncio.to_thread(asset_index.save, kind, scope_id, backend, fresh)
+            return {"mode": "incremental", "added": len(fresh), "count": count, "pages": pages}
+
+    items = await fetch_all_items(path, params)
+    count = await asyncio.to_thread(asset_index.save, kind, scope_id, backend, items, True)
+    ids = {item.get("_id") for item in items}
+    return {"mode": "full", "added": len(ids - known), "removed": len(known - ids), "count": count}
+
+
+async def sync_assets(kind: str, scope_id: str, full: bool = False) -> dict:
+    """
+    把一个资产范围的某类资产同步到本地索引，返回同步结果；配置了多个节点时分别同步每个节点。
+
+    全部节点失败时抛出异常；部分节点失败时在结果的 failed 中给出。
+    """
+    lock = _sync_locks.setdefault((kind, scope_id), asyncio.Lock())
+    async with lock:
+        if not should_fan_out():
+            return await _sync_backend(kind, scope_id, full)
+        succeeded, failures = merge_failures(await fan_out(_sync_backend, kind, scope_id, full))
+        result = {"backends": {backend.name: r for backend, r in succeeded}}
+        result["added"] = sum(r["added"] for _, r in succeeded)
+        result["removed"] = sum(r.get("removed", 0) for _, r in succeeded)
+        result["count"] = sum(r["count"] for _, r in succeeded)
+        if failures:
+            result["failed"] = failures
+        return result
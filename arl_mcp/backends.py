@@ -0,0 +1,184 @@
+# 多个 ARL 节点：节点表、当前节点上下文、任务提交路由与并发扇出
+import asyncio
+import contextvars
+from contextlib import contextmanager
+
+from .config import (
+    ARL_BACKENDS,
+    ARL_BREAKER_COOLDOWN,
+    ARL_BREAKER_THRESHOLD,
+    ARL_LATENCY_TARGET,
+    ARL_MAX_INFLIGHT,
+    ARL_MIN_INFLIGHT,
+)
+from .resilience import AdaptiveLimiter, CircuitBreaker
+
+
+class Backend:
+    """单个 ARL 节点：地址、Token，以及各自独立的熔断器与自适应并发上限"""
+
+    def __init__(self, name: str, url: str, token: str):
+        self.name = name
+        self.url = url
+        self.token = token
+        self.breaker = CircuitBreaker(ARL_BREAKER_THRESHOLD, ARL_BREAKER_COOLDOWN)
+        self.limiter = AdaptiveLimiter(ARL_MIN_INFLIGHT, ARL_MAX_INFLIGHT, ARL_LATENCY_TARGET)
+
+    def snapshot(self) -> dict:
+        return {"url": self.url, "breaker": self.breaker.snapshot(), "concurrency": self.limiter.snapshot()}
+
+
+backends = [Backend(name, url, token) for name, url, token in ARL_BACKENDS]
+MULTI_BACKEND = len(backends) > 1
+
+# 当前请求固定发往的节点；未固定（None）时单个请求发往第一个节点，搜索与全量拉取查询全部节点
+_current: contextvars.ContextVar[Backend | None] = contextvars.ContextVar("arl_backend", default=None)
+
+
+def current_backend() -> Backend:
+    return _current.get() or backends[0]
+
+
+def get_backend(name: str) -> Backend | None:
+    for backend in backends:
+        if backend.name == name:
+            return backend
+    return None
+
+
+def should_fan_out() -> bool:
+    """配置了多个节点且当前未固定节点时，搜索与全量拉取需要查询全部节点"""
+    return MULTI_BACKEND and _current.get() is None
+
+
+def backend_label(backend: Backend) -> str:
+    """指标与返回值中标注的节点名；只有一个节点时为空，保持单节点输出不变"""
+    return backend.name if MULTI_BACKEND else ""
+
+
+@contextmanager
+def use_backend(backend: Backend):
+    """在 with 块内把请求固定发往指定节点；with 块不能跨越异步生成器的 yield"""
+    token = _current.set(backend)
+    try:
+        yield backend
+    finally:
+        _current.reset(token)
+
+
+async def fan_out(fn, *args, **kwargs) -> list[tuple[Backend, object]]:
+    """
+    在每个节点上并发执行协程函数 fn，返回 [(节点, 结果或异常)]，顺序与节点配置一致。
+
+    每个节点在独立的任务中执行，节点上下文互不影响。
+    """
+    async def run(backend: Backend):
+        with use_backend(backend):
+            return await fn(*args, **kwargs)
+
+    results = await asyncio.gather(*(run(b) for b in backends), return_exceptions=True)
+    return list(zip(backends, results))
+
+
+def merge_failures(results: list[tuple[Backend, object]]) -> tuple[list[tuple[Backend, object]], dict]:
+    """
+    拆分扇出结果，返回 (成功结果, {节点名: 错误信息})。
+
+    全部节点失败时抛出第一个节点的异常；取消等非 Exception 异常直接抛出。
+    """
+    succeeded, failures = [], {}
+    for backend, result in results:
+        if isinstance(result, BaseException):
+            if not isinstance(result, Exception):
+                raise result
+            failures[backend.name] = str(result) or type(result).__name__
+        else:
+            succeeded.append((backend, result))
+    if not succeeded:
+        raise results[0][1]
+    return succeeded, failures
+
+
+async def _running_tasks() -> int:
+    from .client import ARLRequestError, arl_get
+
+    resp = await arl_get("/api/task/", {"status": "running", "size": "1"}, timeout=10)
+    if resp.status_code != 200:
+        raise ARLRequestError(f"HTTP {resp.status_code}")
+    return int(resp.json().get("total") or 0)
+
+
+async def _has_item(path: str, item_id: str) -> bool:
+    from .client import arl_get
+
+    resp = await arl_get(path, {"_id": item_id, "size": "1"}, timeout=10)
+    return resp.status_code == 200 and bool(resp.json().get("items"))
+
+
+async def submit_loads(policy_id: str = "") -> dict[str, int]:
+    """
+    可接收新任务的节点及其运行中任务数；查询失败（含熔断中）的节点不参与分配。
+
+    指定 policy_id 时只保留存在该策略的节点（策略 ID 属于创建它的节点）。
+    只有一个节点时不查询，直接返回该节点。
+    """
+    if not MULTI_BACKEND:
+        return {backends[0].name: 0}
+    results = await fan_out(_running_tasks)
+    loads = {backend.name: result for backend, result in results if not isinstance(result, BaseException)}
+    if not loads:
+        raise results[0][1]
+    if policy_id:
+        found = await fan_out(_has_item, "/api/policy/", policy_id)
+        owners = {backend.name for backend, ok in found if ok is True}
+        loads = {name: n for name, n in loads.items() if name in owners}
+        if not loads:
+            raise LookupError(f"没有可用节点包含策略: {policy_id}")
+    return loads
+
+
+def least_loaded(loads: dict[str, int]) -> Backend:
+    """运行中任务最少的节点，数量相同时按配置顺序；批量提交时调用方每分配一个任务把对应计数加一"""
+    return min((b for b in backends if b.name in loads), key=lambda b: loads[b.name])
+
+
+async def pick_backend(policy_id: str = "") -> Backend:
+    """选择提交新任务的节点，见 submit_loads 与 least_loaded"""
+    return least_loaded(await submit_loads(policy_id))
+
+
+async def _find_task(params: dict) -> dict | None:
+    from .client import ARLRequestError, arl_get
+
+    resp = await arl_get("/api/task/", {**params, "size": "1"}, timeout=10)
+    if resp.status_code != 200:
+        raise ARLRequestError(f"HTTP {resp.status_code}")
+    items = resp.json().get("items", [])
+    return items[0] if items else None
+
+
+async def locate_task(name: str = "", task_id: str = "") -> tuple[Backend, dict | None]:
+    """
+    按任务名或任务 ID 查找任务所在节点，返回 (节点, 任务记录)；未找到时任务记录为 None。
+
+    只有一个节点时不查询，直接返回 (该节点, None)，由调用方照常请求。
+    多个节点同名时取配置顺序中的第一个；其余节点均未找到而有节点查询失败时抛出异常，
+    因为任务可能正在失败的节点上。
+    """
+    from .client import ARLRequestError
+
+    if not MULTI_BACKEND:
+        return backends[0], None
+    params = {"_id": task_id} if task_id else {"name": name}
+    succeeded, failures = merge_failures(await fan_out(_find_task, params))
+    for backend, item in succeeded:
+        if item is not None:
+            return backend, item
+    if failures:
+        detail = "；".join(f"{node}: {error}" for node, error in failures.items())
+        raise ARLRequestError(f"任务未在可用节点中找到，以下节点查询失败：{detail}")
+    return backends[0], None
+
+
+def snapshot() -> dict:
+    return {backend.name: backend.snapshot() for backend in backends}
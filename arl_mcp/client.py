@@ -0,0 +1,734 @@
+# ARL HTTP 客户端：共享连接池、重试、熔断与自适应并发、响应缓存、请求合并、分页拉取与多节点合并
+import asyncio
+import functools
+import hashlib
+import math
+import os
+import time
+from collections import OrderedDict, deque
+
+import httpx
+
+from .config import (
+    ARL_CACHE_MAX_BYTES,
+    ARL_CACHE_MAX_ENTRIES,
+    ARL_MAX_RETRIES,
+    ARL_PAGE_SIZE,
+    ARL_PAGE_WORKERS,
+    ARL_POOL_SIZE,
+    ARL_RETRY_BACKOFF,
+    ARL_SEARCH_MAX_RESULTS,
+    CACHE_TTLS,
+    DEFAULT_TIMEOUT,
+    ENDPOINT_TIMEOUTS,
+)
+from .backends import (
+    Backend,
+    backend_label,
+    backends,
+    current_backend,
+    fan_out,
+    merge_failures,
+    should_fan_out,
+)
+from .metrics import metrics
+from .resilience import CircuitOpenError, is_backend_failure
+
+# 触发 GET 重试的状态码
+RETRY_STATUS_CODES = frozenset({500, 502, 503, 504})
+
+# 多节点合并结果时判定同一资产的字段：接口路径前缀 -> 字段名
+MERGE_KEYS = {
+    "/api/domain/": ("domain",),
+    "/api/ip/": ("ip",),
+    "/api/site/": ("site",),
+    "/api/fileleak/": ("url",),
+    "/api/asset_domain/": ("domain",),
+    "/api/asset_ip/": ("ip",),
+    "/api/asset_site/": ("site",),
+    "/api/nuclei_result/": ("url", "template_id"),
+}
+
+# 流式下载时每次写入文件的块大小
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# 共享异步客户端，与创建它的事件循环绑定
+_client: httpx.AsyncClient | None = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """
+    获取复用 TCP/TLS 连接的共享异步客户端。
+
+    连接池归属于事件循环，若当前循环与创建客户端时不同则重新创建。
+    所有 ARL 节点共用一个客户端，连接数上限为每个节点 ARL_POOL_SIZE；Token 随请求按节点设置。
+    传输层只在连接建立失败（请求尚未发出）时重试，5xx 与读错误的重试见 _send。
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        limits = httpx.Limits(
+            max_connections=ARL_POOL_SIZE * len(backends),
+            max_keepalive_connections=ARL_POOL_SIZE * len(backends),
+        )
+        transport = httpx.AsyncHTTPTransport(
+            verify=False,
+            limits=limits,
+            retries=ARL_MAX_RETRIES,
+        )
+        _client = httpx.AsyncClient(
+            transport=transport,
+            headers={"Accept": "application/json"},
+        )
+        _client_loop = loop
+    return _client
+
+
+def _match_prefix(table: dict, path: str, default=None):
+    """按接口路径最长前缀在配置表中取值"""
+    matched = [prefix for prefix in table if path.startswith(prefix)]
+    if not matched:
+        return default
+    return table[max(matched, key=len)]
+
+
+def _endpoint_timeout(path: str) -> float:
+    """按接口路径最长前缀匹配超时时间"""
+    return _match_prefix(ENDPOINT_TIMEOUTS, path, DEFAULT_TIMEOUT)
+
+
+class ResponseCache:
+    """
+    只读接口的进程内响应缓存。
+
+    以 接口路径+规范化参数+节点名 为键，条目按 CACHE_TTLS 过期；
+    条目数或响应体总字节数超限时按最近最少使用（LRU）淘汰。
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple, tuple[float, httpx.Response]] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(path: str, params: dict | None, backend: str = "") -> tuple:
+        """参数按键排序并统一转为字符串，使等价查询命中同一条目"""
+        items = sorted((str(k), str(v)) for k, v in (params or {}).items())
+        return (path, tuple(items), backend)
+
+    def get(self, key: tuple) -> httpx.Response | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, resp = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return resp
+
+    def put(self, key: tuple, resp: httpx.Response, ttl: float) -> None:
+        size = len(resp.content)
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic() + ttl, resp)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate(self, *prefixes: str) -> None:
+        """删除路径匹配任一前缀的条目；不传前缀时清空全部"""
+        for key in list(self._entries):
+            if not prefixes or key[0].startswith(prefixes):
+                self._remove(key)
+
+    def _remove(self, key: tuple) -> None:
+        _, resp = self._entries.pop(key)
+        self._bytes -= len(resp.content)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+response_cache = ResponseCache(ARL_CACHE_MAX_ENTRIES, ARL_CACHE_MAX_BYTES)
+
+
+class SingleFlight:
+    """
+    合并相同的并发请求：同一键在上一次执行结束前再次调用时，直接等待同一个任务的结果。
+
+    共享任务以 asyncio.shield 等待，任一调用方被取消不影响其他等待者；
+    任务结束后即移除，之后的调用重新发起请求，不充当缓存。
+    """
+
+    def __init__(self):
+        self._calls: dict[tuple, asyncio.Task] = {}
+
+    def join(self, key: tuple, factory) -> tuple[asyncio.Future, bool]:
+        """
+        返回 (可等待的结果, 是否复用了进行中的请求)。
+
+        factory 为无参协程函数，只在没有进行中的同键请求时调用。
+        """
+        task = self._calls.get(key)
+        shared = task is not None and task.get_loop() is asyncio.get_running_loop()
+        if not shared:
+            task = asyncio.ensure_future(factory())
+            self._calls[key] = task
+            task.add_done_callback(functools.partial(self._done, key))
+        return asyncio.shield(task), shared
+
+    def _done(self, key: tuple, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # 所有等待者都已取消时也要取走异常，避免 "exception was never retrieved" 警告
+            task.exception()
+
+    def forget(self, *prefixes: str) -> None:
+        """让路径匹配任一前缀的进行中请求不再被新调用复用；不传前缀时全部不再复用"""
+        for key in list(self._calls):
+            if not prefixes or key[0].startswith(prefixes):
+                del self._calls[key]
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+
+inflight_requests = SingleFlight()
+
+# 每次 invalidate_reads 加一；请求发出后若有写操作发生，其响应不再写入缓存
+_read_generation = 0
+
+
+def invalidate_reads(*prefixes: str) -> None:
+    """
+    写操作后调用：清除匹配前缀的响应缓存，并让写操作之前发出、尚未返回的相同查询不再被复用。
+
+    不传前缀时作用于全部接口。
+    """
+    global _read_generation
+    _read_generation += 1
+    response_cache.invalidate(*prefixes)
+    inflight_requests.forget(*prefixes)
+
+
+async def _send(
+    method: str,
+    path: str,
+    params: dict | None = None,
+    payload: dict | None = None,
+    timeout: float | None = None,
+    backend: Backend | None = None,
+) -> httpx.Response:
+    """
+    发送请求；GET 在 5xx 或连接被重置时按指数退避重试。
+
+    POST 会创建任务等写操作，不做应用层重试，避免重复提交。
+    每次尝试的耗时、状态码、响应字节数或异常类型都计入 metrics。
+    每次尝试都经过所在节点的自适应并发上限排队与熔断检查：节点连续超时/5xx 后
+    直接抛出 CircuitOpenError，不再占用连接等待超时。
+    backend 为空时发往当前节点（见 backends.current_backend）。
+    """
+    client = _get_client()
+    backend = backend or current_backend()
+    breaker, limiter = backend.breaker, backend.limiter
+    label = backend_label(backend)
+    headers = {"Token": backend.token}
+    timeout = timeout or _endpoint_timeout(path)
+    for attempt in range(ARL_MAX_RETRIES + 1):
+        retryable = method == "GET" and attempt < ARL_MAX_RETRIES
+        await limiter.acquire()
+        try:
+            probe = breaker.before_request()
+        except CircuitOpenError:
+            limiter.release()
+            raise
+        start = time.perf_counter()
+        try:
+            resp = await client.request(
+                method,
+                f"{backend.url}{path}",
+                params=params,
+                json=payload,
+                headers=headers,
+                timeout=timeout,
+            )
+        except Exception as e:
+            elapsed = time.perf_counter() - start
+            failed = is_backend_failure(error=e)
+            limiter.release(elapsed, failed)
+            breaker.record(failed, probe, f"{method} {path}: {type(e).__name__}")
+            metrics.record_request(method, path, elapsed, error=e, backend=label)
+            if not retryable or not isinstance(e, (httpx.ReadError, httpx.RemoteProtocolError)):
+                raise
+        except BaseException:
+            limiter.release()
+            breaker.record(None, probe)
+            raise
+        else:
+            elapsed = time.perf_counter() - start
+            failed = is_backend_failure(resp.status_code)
+            limiter.release(elapsed, failed)
+            breaker.record(failed, probe, f"{method} {path}: HTTP {resp.status_code}")
+            metrics.record_request(method, path, elapsed, resp.status_code, len(resp.content), backend=label)
+            if not retryable or resp.status_code not in RETRY_STATUS_CODES:
+                return resp
+        await asyncio.sleep(ARL_RETRY_BACKOFF * (2 ** attempt))
+
+
+async def arl_get(
+    path: str,
+    params: dict | None = None,
+    timeout: float | None = None,
+    cache: bool = False,
+    backend: Backend | None = None,
+) -> httpx.Response:
+    """
+    通过共享连接池向 ARL 发送 GET 请求。
+
+    相同 接口路径+参数+节点 的并发调用合并为一次请求，所有调用方拿到同一个响应（超时取先发起者的设置）。
+
+    参数：
+    - path: 接口路径，如 /api/task/
+    - params: 查询参数
+    - timeout: 超时时间，默认按 ENDPOINT_TIMEOUTS 取值
+    - cache: 是否使用响应缓存，仅对 CACHE_TTLS 中列出的接口生效，只缓存 200 响应
+    - backend: 目标节点，默认为当前节点
+    """
+    backend = backend or current_backend()
+    ttl = _match_prefix(CACHE_TTLS, path) if cache else None
+    key = ResponseCache.make_key(path, params, backend.name)
+    if ttl is not None:
+        resp = response_cache.get(key)
+        if resp is not None:
+            return resp
+
+    async def fetch() -> httpx.Response:
+        generation = _read_generation
+        resp = await _send("GET", path, params=params, timeout=timeout, backend=backend)
+        if ttl is not None and resp.status_code == 200 and generation == _read_generation:
+            response_cache.put(key, resp, ttl)
+        return resp
+
+    waiter, shared = inflight_requests.join(key, fetch)
+    if shared:
+        metrics.record_coalesced(path, backend_label(backend))
+    return await waiter
+
+
+async def arl_post(
+    path: str, payload: dict, timeout: float | None = None, backend: Backend | None = None
+) -> httpx.Response:
+    """
+    通过共享连接池向 ARL 发送 JSON POST 请求。
+
+    参数：
+    - path: 接口路径
+    - payload: JSON 请求体
+    - timeout: 超时时间，默认按 ENDPOINT_TIMEOUTS 取值
+    - backend: 目标节点，默认为当前节点
+    """
+    return await _send("POST", path, payload=payload, timeout=timeout, backend=backend)
+
+
+class ARLRequestError(Exception):
+    """ARL 接口返回非 200 状态码"""
+
+
+async def arl_download(
+    path: str, dest: str, timeout: float | None = None, backend: Backend | None = None
+) -> dict:
+    """
+    以流式 GET 把响应体分块写入本地文件，边写边计算 SHA-256，内存中只保留一个块。
+
+    先写入 dest.part，完成后再改名为 dest，失败时删除临时文件。
+    超时作用于每次读取而非整个下载，大文件不会因总耗时被中断。
+    下载同样受熔断保护，但耗时取决于文件大小，不占用自适应并发名额、不参与上限调整。
+
+    参数：
+    - path: 接口路径，如 /api/export/<task_id>
+    - dest: 目标文件路径
+    - timeout: 单次读取超时，默认按 ENDPOINT_TIMEOUTS 取值
+    - backend: 目标节点，默认为当前节点
+
+    返回：
+    - bytes、sha256、content_type、content_disposition
+    """
+    client = _get_client()
+    backend = backend or current_backend()
+    breaker, label = backend.breaker, backend_label(backend)
+    probe = breaker.before_request()
+    temp = f"{dest}.part"
+    digest = hashlib.sha256()
+    size = 0
+    status_code = None
+    start = time.perf_counter()
+    try:
+        async with client.stream(
+            "GET",
+            f"{backend.url}{path}",
+            headers={"Token": backend.token},
+            timeout=timeout or _endpoint_timeout(path),
+        ) as resp:
+            status_code = resp.status_code
+            if resp.status_code != 200:
+                raise ARLRequestError(f"Request failed: {resp.status_code}")
+            with open(temp, "wb") as f:
+                async for chunk in resp.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    await asyncio.to_thread(f.write, chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+        os.replace(temp, dest)
+    except BaseException as e:
+        if isinstance(e, Exception):
+            failed = is_backend_failure(error=e) or is_backend_failure(status_code)
+            reason = type(e).__name__ if isinstance(e, httpx.TransportError) else f"HTTP {status_code}"
+            breaker.record(failed, probe, f"GET {path}: {reason}")
+        else:
+            breaker.record(None, probe)
+        metrics.record_request("GET", path, time.perf_counter() - start, status_code, size, error=e, backend=label)
+        if os.path.exists(temp):
+            os.remove(temp)
+        raise
+    breaker.record(False, probe)
+    metrics.record_request("GET", path, time.perf_counter() - start, status_code, size, backend=label)
+    return {
+        "bytes": size,
+        "sha256": digest.hexdigest(),
+        "content_type": resp.headers.get("content-type", ""),
+        "content_disposition": resp.headers.get("content-disposition", ""),
+    }
+
+
+async def _fetch_page(
+    path: str, params: dict, page: int, size: int, cache: bool = False, backend: Backend | None = None
+) -> tuple[list[dict], int | None]:
+    """拉取单页数据，返回 (items, total)"""
+    backend = backend or current_backend()
+    resp = await arl_get(path, {**params, "page": page, "size": size}, cache=cache, backend=backend)
+    if resp.status_code != 200:
+        raise ARLRequestError(f"Request failed: {resp.status_code}")
+    start = time.perf_counter()
+    data = resp.json()
+    items = data.get("items", [])
+    metrics.record_page(path, len(items), time.perf_counter() - start, backend_label(backend))
+    return items, data.get("total")
+
+
+def _merge_key(item, fields: tuple | None):
+    """多节点合并时的去重键；不是字典、没有对应字段或接口不在 MERGE_KEYS 中时返回 None，不去重"""
+    if not fields or not isinstance(item, dict):
+        return None
+    key = tuple(str(item.get(field, "")) for field in fields)
+    return key if any(key) else None
+
+
+async def fetch_all_items(path: str, params: dict, size: int = ARL_PAGE_SIZE) -> list[dict]:
+    """
+    拉取分页接口的全部数据，结果按页码顺序拼接。
+
+    先读取第一页得到 total，计算总页数后以 ARL_PAGE_WORKERS 为并发上限拉取剩余页；
+    扫描进行中 total 可能继续增长，因此若最后一页仍是满页，会继续顺序向后翻页。
+    配置了多个节点时并发拉取全部节点，按节点顺序拼接并按 MERGE_KEYS 去掉重复资产；
+    任一节点失败即抛出异常，避免把不完整的结果当作全量（如写入增量基线）。
+
+    参数：
+    - path: 接口路径，如 /api/domain/
+    - params: 除 page/size 以外的查询参数
+    - size: 每页数量
+    """
+    if should_fan_out():
+        fields = _match_prefix(MERGE_KEYS, path)
+        items, seen = [], set()
+        for backend, result in await fan_out(fetch_all_items, path, params, size):
+            if isinstance(result, Exception):
+                raise ARLRequestError(f"节点 {backend.name}: {str(result) or type(result).__name__}") from result
+            if isinstance(result, BaseException):
+                raise result
+            for item in result:
+                key = _merge_key(item, fields)
+                if key is not None:
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                items.append(item)
+        return items
+
+    page_items, total = await _fetch_page(path, params, 1, size)
+    items = list(page_items)
+    page = 1
+
+    if len(page_items) == size and isinstance(total, int) and ARL_PAGE_WORKERS > 1:
+        page_count = math.ceil(total / size)
+        if page_count > 1:
+            semaphore = asyncio.Semaphore(ARL_PAGE_WORKERS)
+
+            async def fetch(p: int) -> tuple[list[dict], int | None]:
+                async with semaphore:
+                    return await _fetch_page(path, params, p, size)
+
+            pages = await asyncio.gather(*(fetch(p) for p in range(2, page_count + 1)))
+            for page_items, _ in pages:
+                items.extend(page_items)
+            page = page_count
+
+    while len(page_items) == size:
+        page += 1
+        page_items, _ = await _fetch_page(path, params, page, size)
+        items.extend(page_items)
+    return items
+
+
+async def iter_pages(
+    path: str,
+    params: dict,
+    size: int = ARL_PAGE_SIZE,
+    start: int = 1,
+    prefetch: int = 1,
+    cache: bool = False,
+    expected_pages: int = 0,
+    backend: Backend | None = None,
+):
+    """
+    从第 start 页起按页码顺序逐页产出 (items, total)。
+
+    所有页都发往同一个节点：backend 为空时取首次迭代时的当前节点。
+
+    prefetch > 1 时在消费当前页的同时预取后续页，同时在途的页数不超过 prefetch，
+    预取不超过按首页 total 算出的末页，指定 expected_pages 时也不超过第 start+expected_pages-1 页；
+    超出预取范围后，只要消费方继续迭代且上一页是满页，就逐页向后翻。
+    消费方提前结束迭代（break 或 aclose）时取消尚未返回的预取请求。
+    """
+    backend = backend or current_backend()
+    items, total = await _fetch_page(path, params, start, size, cache, backend)
+    yield items, total
+    if len(items) < size:
+        return
+
+    last = math.ceil(total / size) if isinstance(total, int) else 0
+    if expected_pages > 0:
+        last = min(last, start + expected_pages - 1)
+    pending: deque[asyncio.Task] = deque()
+    scheduled = start
+    try:
+        while True:
+            while len(pending) < max(prefetch, 1) and (scheduled < last or not pending):
+                scheduled += 1
+                pending.append(asyncio.ensure_future(_fetch_page(path, params, scheduled, size, cache, backend)))
+            items, _ = await pending.popleft()
+            yield items, total
+            if len(items) < size:
+                return
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def collect_pages(
+    path: str,
+    params: dict,
+    max_results: int,
+    size: int = ARL_PAGE_SIZE,
+    start: int = 1,
+    select=None,
+    cache: bool = False,
+) -> dict:
+    """
+    自动翻页收集记录，以 ARL_PAGE_WORKERS 为并发上限预取，凑满 max_results 条后立即停止。
+
+    参数：
+    - path: 接口路径
+    - params: 除 page/size 以外的查询参数
+    - max_results: 最多返回的条数
+    - size: 每页数量
+    - start: 起始页码
+    - select: 可选的过滤函数，接收一页记录返回保留的记录（如 RowQuery.filter），在计数前应用
+    - cache: 是否使用响应缓存
+
+    返回：
+    - items：按 _id 去重后的记录（翻页期间数据变动可能使同一条记录出现在相邻两页）
+    - total：ARL 返回的总数；pages：拉取的页数；duplicates：去掉的重复条数
+    - truncated：是否因达到 max_results 而未取完
+    """
+    items, seen = [], set()
+    total, pages, duplicates, scanned = 0, 0, 0, 0
+    truncated = False
+    # 不过滤时可以算出凑满 max_results 需要的页数，避免预取用不到的页
+    expected = 0 if select is not None else math.ceil(max_results / size)
+    pager = iter_pages(path, params, size, start, ARL_PAGE_WORKERS, cache, expected)
+    try:
+        async for page_items, page_total in pager:
+            pages += 1
+            total = page_total or total
+            scanned += len(page_items)
+            more = len(page_items) == size and (not total or (start - 1) * size + scanned < total)
+            if select is not None:
+                page_items = select(page_items)
+            for item in page_items:
+                item_id = item.get("_id") if isinstance(item, dict) else None
+                if item_id is not None:
+                    if item_id in seen:
+                        duplicates += 1
+                        continue
+                    seen.add(item_id)
+                if len(items) >= max_results:
+                    truncated = True
+                    break
+                items.append(item)
+            if truncated or len(items) >= max_results:
+                truncated = truncated or more
+                break
+    finally:
+        await pager.aclose()
+    return {"items": items, "total": total, "pages": pages, "duplicates": duplicates, "truncated": truncated}
+
+
+async def search_pages(
+    path: str,
+    params: dict,
+    page: int,
+    size: int,
+    all_pages: bool = False,
+    max_results: int = 0,
+    select=None,
+    cache: bool = False,
+) -> tuple[list[dict], int, dict | None]:
+    """
+    搜索类工具的翻页入口，返回 (items, total, meta)。
+
+    默认只取第 page 页，meta 为 None；all_pages 或 max_results > 0 时从第 page 页起
+    调用 collect_pages 自动翻页，meta 中的 pagination 为翻页信息，
+    all_pages 未指定 max_results 时最多返回 ARL_SEARCH_MAX_RESULTS 条。
+    配置了多个节点时并发查询全部节点后合并，见 _search_backends。
+    select 为可选的记录过滤函数。接口返回非 200 时抛出 ARLRequestError。
+    """
+    if should_fan_out():
+        return await _search_backends(path, params, page, size, all_pages, max_results, select, cache)
+
+    if not all_pages and max_results <= 0:
+        resp = await arl_get(path, {**params, "page": page, "size": size}, cache=cache)
+        if resp.status_code != 200:
+            raise ARLRequestError(f"HTTP {resp.status_code}")
+        data = resp.json()
+        items = data.get("items", [])
+        return (select(items) if select else items), data.get("total", 0), None
+
+    limit = max_results if max_results > 0 else ARL_SEARCH_MAX_RESULTS
+    result = await collect_pages(path, params, limit, size, max(page, 1), select, cache)
+    pagination = {
+        "pages": result["pages"],
+        "max_results": limit,
+        "truncated": result["truncated"],
+        "duplicates": result["duplicates"],
+    }
+    return result["items"], result["total"], {"pagination": pagination}
+
+
+async def _search_backends(
+    path: str,
+    params: dict,
+    page: int,
+    size: int,
+    all_pages: bool,
+    max_results: int,
+    select,
+    cache: bool,
+) -> tuple[list[dict], int, dict]:
+    """
+    在每个节点上执行 search_pages 后合并：每个节点各取第 page 页（或各自自动翻页），
+    total 为各节点之和，同一资产按 MERGE_KEYS 只保留配置顺序中靠前节点的记录，
+    每条记录以 _backend 标注来源节点。
+
+    meta 中的 backends 给出每个节点的 total 或错误信息；部分节点失败时照常返回其余节点的结果，
+    全部失败时抛出第一个节点的异常。自动翻页时合并后的条数仍不超过 max_results。
+    """
+    results = await fan_out(search_pages, path, params, page, size, all_pages, max_results, select, cache)
+    succeeded, failures = merge_failures(results)
+    fields = _match_prefix(MERGE_KEYS, path)
+    items, seen, total = [], set(), 0
+    pages, duplicates, truncated, limit = 0, 0, False, 0
+    nodes = {}
+    for backend, (node_items, node_total, node_meta) in succeeded:
+        total += node_total or 0
+        nodes[backend.name] = {"total": node_total or 0}
+        pagination = (node_meta or {}).get("pagination")
+        if pagination:
+            pages += pagination["pages"]
+            duplicates += pagination["duplicates"]
+            truncated = truncated or pagination["truncated"]
+            limit = pagination["max_results"]
+        for item in node_items:
+            key = _merge_key(item, fields)
+            if key is not None:
+                if key in seen:
+                    duplicates += 1
+                    continue
+                seen.add(key)
+            if isinstance(item, dict):
+                item["_backend"] = backend.name
+            items.append(item)
+    for name, error in failures.items():
+        nodes[name] = {"error": error}
+
+    meta = {"backends": {b.name: nodes[b.name] for b in backends}}
+    if limit:
+        if len(items) > limit:
+            items, truncated = items[:limit], True
+        meta["pagination"] = {"pages": pages, "max_results": limit, "truncated": truncated, "duplicates": duplicates}
+    return items, total, meta
+
+
+def with_meta(result: dict, meta: dict | None) -> dict:
+    """在工具返回值中附带 search_pages 给出的翻页信息（pagination）与各节点结果（backends）"""
+    if meta:
+        result.update(meta)
+    return result
+
+
+class TokenBucket:
+    """异步令牌桶：每秒补充 rate 个令牌，最多积累 capacity 个，获取按先来后到排队"""
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        # rate <= 0 时补充等待时间为负数或除以零，acquire 会空转或抛出 ZeroDivisionError
+        if rate <= 0:
+            raise ValueError(f"令牌桶速率必须大于 0: {rate}")
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
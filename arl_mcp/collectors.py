@@ -0,0 +1,118 @@
+# 各结果模块（子域名、IP、站点、文件泄露）的全量拉取
+import asyncio
+import hashlib
+import time
+
+from .client import fetch_all_items
+
+
+def _params(param: str, domain: str, task_id: str) -> dict:
+    """查询参数；指定 task_id 时只取该任务的结果，否则为该域名在全部任务中的结果"""
+    params = {param: domain}
+    if task_id:
+        params["task_id"] = task_id
+    return params
+
+
+async def collect_subdomains(domain: str, task_id: str = "") -> list[str]:
+    items = await fetch_all_items("/api/domain/", _params("domain", domain, task_id))
+    subdomains = [item.get("domain") for item in items if item.get("domain")]
+    return list(dict.fromkeys(subdomains))
+
+
+async def collect_ips(domain: str, task_id: str = "") -> list[str]:
+    items = await fetch_all_items("/api/ip/", _params("domain", domain, task_id))
+    return [item.get("ip") for item in items if item.get("ip")]
+
+
+async def collect_sites(domain: str, task_id: str = "") -> list[str]:
+    items = await fetch_all_items("/api/site/", _params("site", domain, task_id))
+    return [item.get("site") for item in items if item.get("site")]
+
+
+async def collect_fileleaks(domain: str, task_id: str = "") -> list[str]:
+    items = await fetch_all_items("/api/fileleak/", _params("url", domain, task_id))
+    return [item.get("url") for item in items if item.get("url")]
+
+
+async def extract_module(key: str, collect, domain: str, task_id: str, snapshot: bool = False) -> list[str]:
+    """
+    拉取单个任务在某个模块的数据（按 task_id 过滤）。
+
+    snapshot 为 True（任务已结束）时优先读取本地快照，未命中则拉取后写入快照；
+    只有按任务过滤的结果才会快照，按域名跨任务的结果会随其他任务变化。
+    拉取失败时返回错误信息且不写入快照。
+    """
+    from .store import result_store
+
+    store_key = f"{key}:{domain}"
+    snapshot = snapshot and bool(task_id)
+    if snapshot:
+        cached = await asyncio.to_thread(result_store.load, task_id, store_key)
+        if cached is not None:
+            return cached
+
+    try:
+        result = await collect(domain, task_id)
+    except Exception as e:
+        return [f"Error: {str(e)}"]
+
+    if snapshot:
+        await asyncio.to_thread(result_store.save, task_id, store_key, result)
+    return result
+
+
+def result_digest(items: list[str]) -> str:
+    """结果集指纹：排序去重后逐行拼接的 SHA-256，与 ARL 返回顺序无关"""
+    return hashlib.sha256("\n".join(items).encode("utf-8")).hexdigest()
+
+
+async def sync_delta(key: str, collect, domain: str, baseline: str = "") -> dict:
+    """
+    拉取模块数据并与本地基线比较，返回新增与消失的条目，然后以本次结果覆盖基线。
+
+    基线按 结果类型+主域名+基线名 保存，整个进程（及共用快照库的进程）共享：同一基线的每次调用
+    都会消费掉变化，多个调用方各自跟踪变化时应使用不同的 baseline 名称；为空时使用默认基线。
+    指纹相同时直接判定无变化，不再逐条比较；首次同步时全部条目计为新增。
+    拉取失败时抛出异常且不修改基线。
+    """
+    from .store import result_store
+
+    if not result_store.enabled:
+        return {"status": "error", "reason": "增量模式需要启用本地存储（ARL_STORE_PATH）"}
+
+    # 命名基线与默认基线存于同一张表，以 结果类型:基线名 区分，默认基线沿用原有的键
+    kind = f"{key}:{baseline}" if baseline else key
+    items = sorted(set(await collect(domain)))
+    digest = result_digest(items)
+    saved = await asyncio.to_thread(result_store.load_baseline, kind, domain)
+
+    if saved is None:
+        previous, last_sync = [], ""
+    else:
+        previous_digest, previous, synced_at = saved
+        last_sync = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(synced_at))
+
+    if saved is not None and previous_digest == digest:
+        added, removed = [], []
+        await asyncio.to_thread(result_store.touch_baseline, kind, domain)
+    else:
+        current_set, previous_set = set(items), set(previous)
+        added = [item for item in items if item not in previous_set]
+        removed = [item for item in previous if item not in current_set]
+        await asyncio.to_thread(result_store.save_baseline, kind, domain, digest, items)
+
+    return {
+        "status": "success",
+        "kind": key,
+        "domain": domain,
+        "baseline": baseline,
+        "baseline_created": saved is None,
+        "last_sync": last_sync,
+        "changed": bool(added or removed),
+        "total": len(items),
+        "previous_total": len(previous),
+        "unchanged_count": len(items) - len(added),
+        "added": added,
+        "removed": removed
+    }
@@ -0,0 +1,134 @@
+# 配置项，全部从环境变量读取
+import os
+
+# 从环境变量读取配置
+ARL_URL = os.getenv("ARL_URL", "https://127.0.0.1:5192")
+ARL_TOKEN = os.getenv("ARL_TOKEN", "")
+
+
+def _parse_backends(text: str) -> list[tuple[str, str, str]]:
+    """
+    解析 ARL_BACKENDS：每项为 名称=地址 或 名称=地址|Token，逗号或换行分隔，
+    未单独设置 Token 的节点使用 ARL_TOKEN。为空时只有 ARL_URL 一个节点，名称为 default。
+    """
+    backends = []
+    for entry in text.replace("\n", ",").split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name, sep, rest = entry.partition("=")
+        if not sep or not name.strip() or not rest.strip():
+            raise ValueError(f"ARL_BACKENDS 格式错误: {entry!r}，应为 名称=地址 或 名称=地址|Token")
+        url, _, token = rest.partition("|")
+        backends.append((name.strip(), url.strip().rstrip("/"), token.strip() or ARL_TOKEN))
+    names = [name for name, _, _ in backends]
+    if len(set(names)) != len(names):
+        raise ValueError(f"ARL_BACKENDS 中存在重复的节点名称: {', '.join(names)}")
+    return backends or [("default", ARL_URL, ARL_TOKEN)]
+
+
+# 多个 ARL 节点：任务提交路由到运行中任务最少的节点，搜索与提取并发查询全部节点后合并
+ARL_BACKENDS = _parse_backends(os.getenv("ARL_BACKENDS", ""))
+
+if not all(token for _, _, token in ARL_BACKENDS):
+    raise ValueError("ARL_TOKEN 环境变量未设置！请在 MCP 配置中设置 ARL_TOKEN")
+
+# HTTP 连接池与重试配置
+ARL_POOL_SIZE = int(os.getenv("ARL_POOL_SIZE", "10"))
+ARL_MAX_RETRIES = int(os.getenv("ARL_MAX_RETRIES", "3"))
+ARL_RETRY_BACKOFF = float(os.getenv("ARL_RETRY_BACKOFF", "0.5"))
+
+# 分页采集配置：首页拿到 total 后，其余页并发拉取（1 表示逐页顺序拉取）
+ARL_PAGE_SIZE = 100
+ARL_PAGE_WORKERS = int(os.getenv("ARL_PAGE_WORKERS", "8"))
+
+# 搜索类工具 all_pages 模式未指定 max_results 时最多返回的条数
+ARL_SEARCH_MAX_RESULTS = int(os.getenv("ARL_SEARCH_MAX_RESULTS", "2000"))
+
+# query_and_extract 的整体耗时预算（秒），超时的模块返回部分结果
+ARL_EXTRACT_TIMEOUT = float(os.getenv("ARL_EXTRACT_TIMEOUT", "120"))
+
+# 各接口的请求超时（秒），未列出的接口使用默认值
+DEFAULT_TIMEOUT = 10
+ENDPOINT_TIMEOUTS = {
+    "/api/task/": 30,
+    "/api/task/delete/": 10,
+    "/api/task/stop/": 10,
+    "/api/export/": 30,
+}
+
+# 只读接口的响应缓存：各接口有效期（秒），未列出的接口不缓存
+ARL_CACHE_MAX_ENTRIES = int(os.getenv("ARL_CACHE_MAX_ENTRIES", "256"))
+ARL_CACHE_MAX_BYTES = int(os.getenv("ARL_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+CACHE_TTLS = {
+    "/api/policy/": 300,
+    "/api/asset_scope/": 120,
+    "/api/asset_domain/": 30,
+    "/api/site/": 30,
+    "/api/nuclei_result/": 30,
+}
+
+# 已完成任务结果的本地持久化存储（SQLite），ARL_STORE_PATH 置空则关闭
+ARL_STORE_PATH = os.getenv(
+    "ARL_STORE_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "arl-mcp", "results.db"),
+)
+ARL_STORE_MAX_BYTES = int(os.getenv("ARL_STORE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# 跨任务资产的本地检索索引（SQLite FTS5），由 sync_asset_index 按资产范围同步，ARL_ASSET_INDEX_PATH 置空则关闭
+ARL_ASSET_INDEX_PATH = os.getenv(
+    "ARL_ASSET_INDEX_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "arl-mcp", "assets.db"),
+)
+
+# 流式分块读取：同时打开的游标数上限与空闲过期时间（秒）
+ARL_STREAM_MAX_OPEN = int(os.getenv("ARL_STREAM_MAX_OPEN", "32"))
+ARL_STREAM_IDLE_TIMEOUT = float(os.getenv("ARL_STREAM_IDLE_TIMEOUT", "600"))
+
+# wait_for_task 轮询间隔（秒）：任务有进展时回到初始值，否则按倍率退避到上限
+ARL_POLL_INITIAL = float(os.getenv("ARL_POLL_INITIAL", "2"))
+ARL_POLL_MAX = float(os.getenv("ARL_POLL_MAX", "30"))
+ARL_POLL_BACKOFF = 1.5
+
+# 公共后缀解析：默认只用 tldextract 自带的后缀表快照，不联网刷新；
+# ARL_SUFFIX_LIST 可指定本地 public_suffix_list.dat 文件
+ARL_SUFFIX_LIST = os.getenv("ARL_SUFFIX_LIST", "")
+ARL_SUFFIX_CACHE_SIZE = int(os.getenv("ARL_SUFFIX_CACHE_SIZE", "65536"))
+
+# 批量提交任务的并发上限与速率（个/秒）
+ARL_BULK_CONCURRENCY = int(os.getenv("ARL_BULK_CONCURRENCY", "4"))
+ARL_BULK_RATE = float(os.getenv("ARL_BULK_RATE", "2"))
+if ARL_BULK_RATE <= 0:
+    raise ValueError(f"ARL_BULK_RATE 必须大于 0: {ARL_BULK_RATE}")
+
+# 导出文件落盘：默认输出目录与同时进行的导出数
+ARL_EXPORT_DIR = os.getenv(
+    "ARL_EXPORT_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "arl-mcp", "exports"),
+)
+ARL_EXPORT_CONCURRENCY = int(os.getenv("ARL_EXPORT_CONCURRENCY", "4"))
+
+# 过载保护：连续 ARL_BREAKER_THRESHOLD 次超时/5xx 后熔断 ARL_BREAKER_COOLDOWN 秒（0 为关闭熔断）；
+# 同时在途的请求数在 [ARL_MIN_INFLIGHT, ARL_MAX_INFLIGHT] 间按延迟自适应，
+# 请求耗时超过 ARL_LATENCY_TARGET 秒时减半，否则逐步回升（0 为固定使用上限）
+ARL_BREAKER_THRESHOLD = int(os.getenv("ARL_BREAKER_THRESHOLD", "5"))
+ARL_BREAKER_COOLDOWN = float(os.getenv("ARL_BREAKER_COOLDOWN", "30"))
+ARL_MAX_INFLIGHT = int(os.getenv("ARL_MAX_INFLIGHT", str(ARL_POOL_SIZE)))
+ARL_MIN_INFLIGHT = int(os.getenv("ARL_MIN_INFLIGHT", "1"))
+ARL_LATENCY_TARGET = float(os.getenv("ARL_LATENCY_TARGET", "3"))
+
+# MCP 传输方式：stdio（默认，由客户端拉起进程）、sse 或 streamable-http（常驻进程，多个客户端共用连接池与缓存）；
+# 网络模式下的监听地址，以及每个客户端会话同时执行的工具调用数（0 为不限制）
+ARL_MCP_TRANSPORT = os.getenv("ARL_MCP_TRANSPORT", "stdio")
+ARL_MCP_HOST = os.getenv("ARL_MCP_HOST", "127.0.0.1")
+ARL_MCP_PORT = int(os.getenv("ARL_MCP_PORT", "8000"))
+ARL_CLIENT_CONCURRENCY = int(os.getenv("ARL_CLIENT_CONCURRENCY", "4"))
+
+# 网络模式的访问令牌：设置后客户端须携带 Authorization: Bearer <令牌>，监听非回环地址时必须设置；
+# 网络模式下工具参数中的服务端文件路径（导出目录、指标文件、流量文件）只能位于 ARL_MCP_FILE_DIRS 内，
+# 多个目录以 os.pathsep 分隔，默认只允许 ARL_EXPORT_DIR
+ARL_MCP_AUTH_TOKEN = os.getenv("ARL_MCP_AUTH_TOKEN", "")
+ARL_MCP_FILE_DIRS = [d for d in os.getenv("ARL_MCP_FILE_DIRS", ARL_EXPORT_DIR).split(os.pathsep) if d]
+
+# 启动时加载的工具分组，逗号分隔，为空时加载全部；未列出的分组不会被导入
+ARL_TOOL_GROUPS = os.getenv("ARL_TOOL_GROUPS", "")
@@ -0,0 +1,109 @@
+# 主域名解析与流量主机名提取；依赖 tldextract，由工具在首次调用时导入
+import functools
+import heapq
+import mmap
+import os
+import re
+from collections import Counter
+
+import tldextract
+
+from .config import ARL_SUFFIX_CACHE_SIZE, ARL_SUFFIX_LIST
+
+# 离线后缀解析器：后缀表在首次解析时载入一次并构建为 trie
+_tld_extractor = tldextract.TLDExtract(
+    cache_dir=None,
+    suffix_list_urls=(f"file://{os.path.abspath(ARL_SUFFIX_LIST)}",) if ARL_SUFFIX_LIST else (),
+    fallback_to_snapshot=True,
+)
+
+
+@functools.lru_cache(maxsize=ARL_SUFFIX_CACHE_SIZE)
+def registrable_domain(host: str) -> str:
+    """返回主机名的可注册域名（主域名），无法识别后缀时返回空字符串"""
+    extracted = _tld_extractor(host)
+    if extracted.domain and extracted.suffix:
+        return f"{extracted.domain}.{extracted.suffix}"
+    return ""
+
+
+IPV4_PREFIX = re.compile(r"^\d+\.\d+\.\d+\.\d+")
+
+# 流量数据中的主机名来源：HTTP Host 头、HAR 中的 Host 头记录、完整 URL
+_TRAFFIC_HOST_PATTERNS = (
+    re.compile(rb"(?im)^[ \t]*host[ \t]*:[ \t]*([^\s:/\"'<>,;]+)"),
+    re.compile(rb'(?i)"name"\s*:\s*"host"\s*,\s*"value"\s*:\s*"([^":/]+)'),
+    re.compile(rb"(?i)\b(?:https?|wss?)://(?:[^/\s@\"'<>]*@)?([^/\s:\"'<>?#\\\]]+)"),
+)
+
+
+# 单个请求记录的起点，按优先级取文件中出现的第一种：Burp XML 的 <item>、HAR 的 request 对象、HTTP 请求行。
+# 同一请求的 URL 与 Host 头（HAR 中还有 url 字段）指向同一主机，按记录去重后才不会重复计数
+_TRAFFIC_RECORD_PATTERNS = (
+    re.compile(rb"<item>"),
+    re.compile(rb'"request"\s*:\s*\{'),
+    re.compile(rb"\b(?:GET|POST|PUT|DELETE|HEAD|OPTIONS|PATCH|CONNECT|TRACE) \S+ HTTP/\d"),
+)
+
+
+def _record_starts(buffer):
+    """按位置顺序产出请求记录的起点；没有可识别的请求边界时为空"""
+    for pattern in _TRAFFIC_RECORD_PATTERNS:
+        if pattern.search(buffer):
+            return (match.start() for match in pattern.finditer(buffer))
+    return iter(())
+
+
+def scan_traffic(buffer) -> tuple[Counter, int]:
+    """
+    在 bytes 或 mmap 上用预编译正则扫描主机名，返回 (主域名计数, 主机名出现次数)。
+
+    主域名计数为提到该主域名的请求记录数：同一个请求（HTTP 请求、HAR 条目、Burp 条目）中
+    多次出现的同一主域名只计一次；第一个请求边界之前或找不到请求边界的文本（如每行一个 URL 的
+    代理日志）按每次出现计数。主机名出现次数为正则的原始匹配次数。
+    三个正则的匹配按位置归并后顺序处理，只需记住当前请求中出现过的主域名，内存占用与文件大小无关；
+    直接在字节缓冲区上匹配，只为命中的主机名创建字符串。
+    """
+    domains = Counter()
+    hits = 0
+    starts = _record_starts(buffer)
+    next_start = next(starts, None)
+    record = 0
+    record_domains = set()
+    matches = heapq.merge(*(p.finditer(buffer) for p in _TRAFFIC_HOST_PATTERNS), key=lambda m: m.start())
+    for match in matches:
+        host = match.group(1).decode("ascii", "ignore").strip(".").lower()
+        if not host:
+            continue
+        hits += 1
+        domain = host if IPV4_PREFIX.match(host) else registrable_domain(host)
+        if not domain:
+            continue
+        while next_start is not None and match.start() >= next_start:
+            next_start = next(starts, None)
+            record += 1
+            record_domains.clear()
+        if record == 0:
+            domains[domain] += 1
+        elif domain not in record_domains:
+            record_domains.add(domain)
+            domains[domain] += 1
+    return domains, hits
+
+
+def scan_traffic_file(path: str) -> tuple[Counter, int, int]:
+    """以 mmap 只读映射文件后扫描，返回 (主域名计数, 主机名出现次数, 文件字节数)"""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return Counter(), 0, 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            domains, hits = scan_traffic(mapped)
+    return domains, hits, size
+
+
+def normalize_target(text: str) -> str:
+    """返回主域名；IP 地址与 IP 段原样返回"""
+    if "/" in text or IPV4_PREFIX.match(text):
+        return text.strip()
+    return registrable_domain(text) or text
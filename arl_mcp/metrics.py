@@ -0,0 +1,352 @@
+# 运行指标：工具调用与 ARL 请求的次数、耗时分布、字节数、分页数与错误类型
+import functools
+import inspect
+import json
+import math
+import os
+import re
+import time
+from collections import Counter
+
+# 耗时直方图的桶上界（秒）
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, math.inf)
+
+# 工具返回值中表示失败的 status/state 取值
+FAILED_STATUSES = frozenset({"error", "exception", "fail"})
+
+
+class Histogram:
+    """固定桶的耗时直方图，分位数按所在桶的上界估算（不超过观测到的最大值）"""
+
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        """Prometheus 格式的累计桶计数"""
+        result, total = [], 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "avg": round(self.sum / self.count, 6) if self.count else 0.0,
+            "max": round(self.max, 6),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+class CallStats:
+    """单个工具或接口的调用统计"""
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.errors = Counter()
+        self.statuses = Counter()
+        self.bytes = 0
+        self.pages = 0
+        self.items = 0
+        self.coalesced = 0
+
+    @property
+    def calls(self) -> int:
+        return self.latency.count
+
+    def snapshot(self) -> dict:
+        result = {"calls": self.calls, "latency": self.latency.snapshot()}
+        if self.errors:
+            result["errors"] = dict(self.errors)
+        if self.statuses:
+            result["statuses"] = dict(self.statuses)
+        if self.bytes:
+            result["bytes"] = self.bytes
+        if self.pages:
+            result["pages"] = self.pages
+            result["items"] = self.items
+        if self.coalesced:
+            result["coalesced"] = self.coalesced
+        return result
+
+
+class Metrics:
+    """进程内指标表，只在事件循环线程中更新"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.started_at = time.time()
+        self.tools: dict[str, CallStats] = {}
+        self.requests: dict[tuple[str, str, str], CallStats] = {}
+        self.json_decode = Histogram()
+
+    def tool(self, name: str) -> CallStats:
+        stats = self.tools.get(name)
+        if stats is None:
+            stats = self.tools[name] = CallStats()
+        return stats
+
+    def request(self, method: str, path: str, backend: str = "") -> CallStats:
+        """backend 为 ARL 节点名，只配置了一个节点时为空"""
+        key = (method, endpoint_label(path), backend)
+        stats = self.requests.get(key)
+        if stats is None:
+            stats = self.requests[key] = CallStats()
+        return stats
+
+    def record_tool(self, name: str, elapsed: float, result=None, error: BaseException | None = None) -> None:
+        stats = self.tool(name)
+        stats.latency.observe(elapsed)
+        if error is not None:
+            stats.errors[type(error).__name__] += 1
+        elif isinstance(result, dict):
+            status = result.get("status", result.get("state"))
+            if status in FAILED_STATUSES:
+                stats.errors[f"status:{status}"] += 1
+
+    def record_request(
+        self,
+        method: str,
+        path: str,
+        elapsed: float,
+        status_code: int | None = None,
+        size: int = 0,
+        error: BaseException | None = None,
+        backend: str = "",
+    ) -> None:
+        stats = self.request(method, path, backend)
+        stats.latency.observe(elapsed)
+        stats.bytes += size
+        if status_code is not None:
+            stats.statuses[str(status_code)] += 1
+        if error is not None:
+            stats.errors[type(error).__name__] += 1
+
+    def record_coalesced(self, path: str, backend: str = "") -> None:
+        """GET 请求复用了进行中的相同请求，没有单独访问 ARL"""
+        self.request("GET", path, backend).coalesced += 1
+
+    def record_page(self, path: str, items: int, decode_seconds: float, backend: str = "") -> None:
+        stats = self.request("GET", path, backend)
+        stats.pages += 1
+        stats.items += items
+        self.json_decode.observe(decode_seconds)
+
+    def snapshot(self) -> dict:
+        """只有一个 ARL 节点时给出 breaker/concurrency，多个节点时按节点名给出 backends"""
+        from . import backends
+        from .sessions import sessions
+
+        result = {
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "tools": {name: stats.snapshot() for name, stats in sorted(self.tools.items())},
+            "requests": {
+                f"{method} {endpoint}" + (f" @{backend}" if backend else ""): stats.snapshot()
+                for (method, endpoint, backend), stats in sorted(self.requests.items())
+            },
+            "json_decode": self.json_decode.snapshot(),
+        }
+        if backends.MULTI_BACKEND:
+            result["backends"] = backends.snapshot()
+        else:
+            backend = backends.backends[0]
+            result["breaker"] = backend.breaker.snapshot()
+            result["concurrency"] = backend.limiter.snapshot()
+        result["clients"] = sessions.snapshot()
+        return result
+
+    def prometheus(self) -> str:
+        """Prometheus 文本格式；配置了多个 ARL 节点时请求与节点指标带 backend 标签"""
+        from .backends import backend_label, backends
+        from .resilience import BREAKER_STATES
+
+        lines = []
+
+        def histogram(name: str, help_text: str, series: list[tuple[dict, Histogram]]) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, hist in series:
+                for bound, count in hist.cumulative():
+                    le = "+Inf" if math.isinf(bound) else repr(bound)
+                    lines.append(f"{name}_bucket{_labels({**labels, 'le': le})} {count}")
+                lines.append(f"{name}_sum{_labels(labels)} {hist.sum:.6f}")
+                lines.append(f"{name}_count{_labels(labels)} {hist.count}")
+
+        def counter(name: str, help_text: str, series: list[tuple[dict, int]], kind: str = "counter") -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in series:
+                lines.append(f"{name}{_labels(labels)} {value}")
+
+        def gauge(name: str, help_text: str, series: list[tuple[dict, int]]) -> None:
+            counter(name, help_text, series, "gauge")
+
+        def per_backend(value) -> list[tuple[dict, int]]:
+            return [({"backend": backend_label(b)} if backend_label(b) else {}, value(b)) for b in backends]
+
+        tools = sorted(self.tools.items())
+        requests = [
+            ({"method": m, "endpoint": e, **({"backend": b} if b else {})}, s)
+            for (m, e, b), s in sorted(self.requests.items())
+        ]
+
+        histogram(
+            "arl_mcp_tool_duration_seconds",
+            "Tool call latency.",
+            [({"tool": name}, stats.latency) for name, stats in tools],
+        )
+        counter(
+            "arl_mcp_tool_errors_total",
+            "Tool calls that raised or returned a failed status, by error class.",
+            [({"tool": name, "error": error}, n) for name, stats in tools for error, n in sorted(stats.errors.items())],
+        )
+        histogram(
+            "arl_mcp_request_duration_seconds",
+            "Outbound ARL request latency per attempt.",
+            [(labels, stats.latency) for labels, stats in requests],
+        )
+        counter(
+            "arl_mcp_request_status_total",
+            "Outbound ARL responses by HTTP status.",
+            [({**labels, "status": code}, n) for labels, stats in requests for code, n in sorted(stats.statuses.items())],
+        )
+        counter(
+            "arl_mcp_request_errors_total",
+            "Outbound ARL requests that failed, by exception class.",
+            [({**labels, "error": error}, n) for labels, stats in requests for error, n in sorted(stats.errors.items())],
+        )
+        counter(
+            "arl_mcp_response_bytes_total",
+            "Response body bytes received from ARL.",
+            [(labels, stats.bytes) for labels, stats in requests],
+        )
+        counter(
+            "arl_mcp_pages_fetched_total",
+            "Paginated result pages fetched from ARL.",
+            [(labels, stats.pages) for labels, stats in requests if stats.pages],
+        )
+        counter(
+            "arl_mcp_requests_coalesced_total",
+            "GET calls that joined an identical in-flight request instead of contacting ARL.",
+            [(labels, stats.coalesced) for labels, stats in requests if stats.coalesced],
+        )
+        histogram("arl_mcp_json_decode_seconds", "Time spent decoding page JSON.", [({}, self.json_decode)])
+        gauge(
+            "arl_mcp_breaker_state",
+            "Circuit breaker state (0 closed, 1 half-open, 2 open).",
+            per_backend(lambda b: BREAKER_STATES.index(b.breaker.state)),
+        )
+        counter("arl_mcp_breaker_trips_total", "Times the circuit breaker opened.", per_backend(lambda b: b.breaker.trips))
+        counter(
+            "arl_mcp_breaker_rejected_total",
+            "Requests rejected without contacting ARL while the breaker was open.",
+            per_backend(lambda b: b.breaker.rejected),
+        )
+        gauge(
+            "arl_mcp_concurrency_limit",
+            "Current adaptive limit on in-flight ARL requests.",
+            per_backend(lambda b: b.limiter.limit),
+        )
+        gauge("arl_mcp_inflight_requests", "ARL requests currently in flight.", per_backend(lambda b: b.limiter.inflight))
+        gauge("arl_mcp_waiting_requests", "ARL requests queued for a concurrency slot.", per_backend(lambda b: b.limiter.waiting))
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    body = ",".join(f'{k}="{_escape_label(v)}"' for k, v in labels.items())
+    return "{" + body + "}"
+
+
+def _escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_ENDPOINT_WORD = re.compile(r"^[a-z_]+$")
+
+
+def endpoint_label(path: str) -> str:
+    """把接口路径中的任务 ID 等变量段替换为 :id，避免指标按 ID 无限膨胀"""
+    parts = path.strip("/").split("/")
+    label = [p if i < 2 or _ENDPOINT_WORD.match(p) else ":id" for i, p in enumerate(parts)]
+    return "/" + "/".join(label) + ("/" if path.endswith("/") else "")
+
+
+metrics = Metrics()
+
+
+def instrument_tool(fn):
+    """包装工具函数，记录调用耗时、异常类型及失败状态；保留原函数签名供 MCP 生成参数 schema"""
+    name = fn.__name__
+
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = await fn(*args, **kwargs)
+            except BaseException as e:
+                metrics.record_tool(name, time.perf_counter() - start, error=e)
+                raise
+            metrics.record_tool(name, time.perf_counter() - start, result)
+            return result
+    else:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                metrics.record_tool(name, time.perf_counter() - start, error=e)
+                raise
+            metrics.record_tool(name, time.perf_counter() - start, result)
+            return result
+
+    return wrapper
+
+
+def dump(path: str, fmt: str = "json") -> str:
+    """把当前指标写入文件（json 或 prometheus），先写临时文件再改名，返回绝对路径"""
+    path = os.path.abspath(os.path.expanduser(path))
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if fmt == "prometheus":
+        text = metrics.prometheus()
+    else:
+        text = json.dumps(metrics.snapshot(), ensure_ascii=False, indent=2)
+    temp = f"{path}.tmp"
+    with open(temp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(temp, path)
+    return path
@@ -0,0 +1,135 @@
+# 资产记录的本地过滤、投影与分组统计
+import json
+import re
+from collections import Counter
+
+
+def _pick_path(value, path: str):
+    """按点分路径取值，遇到列表时对每个元素取值，保留原有结构"""
+    for part in path.split("."):
+        if isinstance(value, list):
+            value = [_pick_path(v, part) for v in value]
+        elif isinstance(value, dict):
+            value = value.get(part)
+        else:
+            return None
+    return value
+
+
+def _flatten_values(value) -> list:
+    """把嵌套列表展开为扁平的非空值列表"""
+    if isinstance(value, list):
+        return [v for sub in value for v in _flatten_values(sub)]
+    if value is None or value == "" or value == {}:
+        return []
+    return [value]
+
+
+class RowQuery:
+    """
+    在本地对已拉取的资产记录做过滤、投影和分组统计。
+
+    字段使用 ARL 原始字段名，支持点分路径访问嵌套字段并自动展开列表，
+    如 port_info.port_id、finger.name、geo_asn.location。
+
+    where 由分号分隔的条件组成，全部满足才保留：
+    - 字段 = 值 / 字段 != 值（不区分大小写）
+    - 字段 ~ 子串 / 字段 !~ 子串
+    - 字段 > 数值、>=、<、<=
+    - 字段 in 值1,值2 / 字段 not in 值1,值2
+    - 字段 exists / 字段 empty
+    字段为列表时，任一元素满足即视为满足；取反的操作符要求所有元素都不满足。
+    """
+
+    _NEGATIONS = {"!=": "=", "!~": "~", "not in": "in", "empty": "exists"}
+    _SYMBOL_CLAUSE = re.compile(r"^([\w.]+)\s*(!=|!~|>=|<=|=|~|>|<)\s*(.*)$")
+    _WORD_CLAUSE = re.compile(r"^([\w.]+)\s+(not\s+in|in)\s+(.+)$", re.IGNORECASE)
+    _UNARY_CLAUSE = re.compile(r"^([\w.]+)\s+(exists|empty)$", re.IGNORECASE)
+
+    def __init__(self, where: str = "", fields: str = "", group_by: str = ""):
+        self.conditions = [self._parse(c) for c in where.split(";") if c.strip()]
+        self.fields = [f.strip() for f in fields.split(",") if f.strip()]
+        self.group_by = group_by.strip()
+
+    @property
+    def reshapes(self) -> bool:
+        """是否需要替换工具默认的输出格式"""
+        return bool(self.fields or self.group_by)
+
+    @property
+    def select(self):
+        """传给 search_pages 的过滤函数；没有 where 条件时为 None，以便按条数推算需要的页数"""
+        return self.filter if self.conditions else None
+
+    @classmethod
+    def _parse(cls, clause: str) -> tuple[str, str, object]:
+        clause = clause.strip()
+        match = cls._UNARY_CLAUSE.match(clause)
+        if match:
+            return match.group(1), match.group(2).lower(), None
+        match = cls._WORD_CLAUSE.match(clause)
+        if match:
+            op = " ".join(match.group(2).lower().split())
+            operand = {v.strip().casefold() for v in match.group(3).split(",") if v.strip()}
+            return match.group(1), op, operand
+        match = cls._SYMBOL_CLAUSE.match(clause)
+        if match:
+            return match.group(1), match.group(2), match.group(3).strip()
+        raise ValueError(f"无法解析的过滤条件: {clause}")
+
+    @staticmethod
+    def _test(value, op: str, operand) -> bool:
+        text = str(value).casefold()
+        if op == "=":
+            return text == operand.casefold()
+        if op == "~":
+            return operand.casefold() in text
+        if op == "in":
+            return text in operand
+        try:
+            left, right = float(value), float(operand)
+        except (TypeError, ValueError):
+            return False
+        return {">": left > right, ">=": left >= right, "<": left < right, "<=": left <= right}[op]
+
+    def _matches(self, item: dict) -> bool:
+        for path, op, operand in self.conditions:
+            values = _flatten_values(_pick_path(item, path))
+            positive = self._NEGATIONS.get(op, op)
+            if positive == "exists":
+                hit = bool(values)
+            else:
+                hit = any(self._test(v, positive, operand) for v in values)
+            if hit == (op in self._NEGATIONS):
+                return False
+        return True
+
+    def filter(self, items: list[dict]) -> list[dict]:
+        if not self.conditions:
+            return items
+        return [item for item in items if self._matches(item)]
+
+    def project(self, items: list[dict]) -> list[dict]:
+        return [{f: _pick_path(item, f) for f in self.fields} for item in items]
+
+    def group(self, items: list[dict]) -> list[dict]:
+        """按字段计数，每条记录对同一取值只计一次，无取值的记录归入 (none)"""
+        counts = Counter()
+        for item in items:
+            values = _flatten_values(_pick_path(item, self.group_by))
+            keys = {
+                v if isinstance(v, (str, int, float, bool)) else json.dumps(v, ensure_ascii=False, sort_keys=True)
+                for v in values
+            }
+            counts.update(keys or {"(none)"})
+        return [{"value": value, "count": count} for value, count in counts.most_common()]
+
+    def response(self, total: int, items: list[dict], key: str) -> dict:
+        """生成分组统计或字段投影格式的工具返回值，items 为已过滤的记录"""
+        result = {"status": "success", "total": total, "matched": len(items)}
+        if self.group_by:
+            result["group_by"] = self.group_by
+            result["groups"] = self.group(items)
+        else:
+            result[key] = self.project(items)
+        return result
@@ -0,0 +1,213 @@
+# 过载保护：ARL 接口的熔断器与按延迟自适应的并发上限（AIMD），每个 ARL 节点各有一组，见 backends.py
+import asyncio
+import time
+from collections import Counter, deque
+
+import httpx
+
+# 计为后端故障的状态码；4xx 说明 ARL 能正常响应，不计入
+FAILURE_STATUS_CODES = frozenset({500, 502, 503, 504})
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+# 指标中以下标表示状态
+BREAKER_STATES = (CLOSED, HALF_OPEN, OPEN)
+
+
+class CircuitOpenError(Exception):
+    """熔断器打开期间直接拒绝请求，不再访问 ARL"""
+
+    def __init__(self, retry_after: float, reason: str):
+        self.retry_after = retry_after
+        super().__init__(
+            f"ARL 服务暂时不可用（{reason}），已熔断，约 {retry_after:.0f} 秒后自动恢复，请稍后再试"
+        )
+
+
+def is_backend_failure(status_code: int | None = None, error: BaseException | None = None) -> bool:
+    """超时、连接/读取错误与 5xx 视为 ARL 过载或不可用"""
+    if error is not None:
+        return isinstance(error, httpx.TransportError)
+    return status_code in FAILURE_STATUS_CODES
+
+
+class CircuitBreaker:
+    """
+    连续失败计数熔断器。
+
+    - closed：正常放行，连续 threshold 次失败后转为 open
+    - open：cooldown 秒内所有请求直接抛出 CircuitOpenError
+    - half_open：冷却结束后只放行一个探测请求，成功则恢复 closed，失败则重新 open
+
+    threshold 为 0 时关闭熔断。
+    """
+
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.last_failure = ""
+        self._probing = False
+        self.trips = 0
+        self.rejected = 0
+        self.transitions = Counter()
+
+    def _set_state(self, state: str) -> None:
+        if state != self.state:
+            self.transitions[f"{self.state}->{state}"] += 1
+            self.state = state
+
+    def before_request(self) -> bool:
+        """
+        请求前调用；熔断中抛出 CircuitOpenError。
+
+        返回本次请求是否为半开探测，请求结束后须原样传给 record。
+        """
+        if not self.threshold or self.state == CLOSED:
+            return False
+        remaining = self.opened_at + self.cooldown - time.monotonic()
+        if self.state == OPEN and remaining <= 0:
+            self._set_state(HALF_OPEN)
+        if self.state == HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        self.rejected += 1
+        raise CircuitOpenError(max(remaining, 1.0), self.last_failure)
+
+    def record(self, failed: bool | None, probe: bool = False, reason: str = "") -> None:
+        if not self.threshold:
+            return
+        if probe:
+            self._probing = False
+        if failed is None:
+            # 请求被取消，没有结果，不改变状态，只让出探测名额
+            return
+        if not failed:
+            self.failures = 0
+            if probe or self.state == HALF_OPEN:
+                self._set_state(CLOSED)
+            return
+        self.failures += 1
+        self.last_failure = reason or self.last_failure
+        if probe or (self.state == CLOSED and self.failures >= self.threshold):
+            self._trip()
+
+    def _trip(self) -> None:
+        self.trips += 1
+        self.opened_at = time.monotonic()
+        self._set_state(OPEN)
+
+    def snapshot(self) -> dict:
+        result = {
+            "state": self.state,
+            "enabled": bool(self.threshold),
+            "consecutive_failures": self.failures,
+            "threshold": self.threshold,
+            "cooldown_seconds": self.cooldown,
+            "trips": self.trips,
+            "rejected": self.rejected,
+        }
+        if self.state != CLOSED:
+            result["retry_after"] = round(max(self.opened_at + self.cooldown - time.monotonic(), 0.0), 1)
+            result["last_failure"] = self.last_failure
+        if self.transitions:
+            result["transitions"] = dict(self.transitions)
+        return result
+
+
+class AdaptiveLimiter:
+    """
+    AIMD 并发上限：限制同时在途的 ARL 请求数。
+
+    每个请求结束后按结果调整上限：耗时不超过 latency_target 且未失败时加法增长
+    （每完成约 limit 个请求加 1）；超时、5xx 或耗时超过目标时乘法减半。
+    减半后在一个 latency_target 内不再重复减半，避免同一批慢请求把上限一次压到底。
+    等待者按先来后到获取名额。
+    """
+
+    def __init__(self, min_limit: int, max_limit: int, latency_target: float):
+        self.min_limit = max(min_limit, 1)
+        self.max_limit = max(max_limit, self.min_limit)
+        self.latency_target = latency_target
+        self._limit = float(self.max_limit)
+        self.inflight = 0
+        self.increases = 0
+        self.decreases = 0
+        self._last_decrease = 0.0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def limit(self) -> int:
+        return max(self.min_limit, int(self._limit))
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # 与共享客户端一样，事件循环更换后旧的等待者已失效
+            self._loop = loop
+            self._waiters.clear()
+            self.inflight = 0
+        if self.inflight < self.limit and not self._waiters:
+            self.inflight += 1
+            return
+        waiter = loop.create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # 已分到名额但调用方被取消，把名额交给下一个等待者
+                self.inflight -= 1
+                self._wake()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self, elapsed: float | None = None, failed: bool = False) -> None:
+        """归还名额；elapsed 为 None（请求被取消或未发出）时不调整上限"""
+        self.inflight = max(self.inflight - 1, 0)
+        if elapsed is not None:
+            self._adjust(elapsed, failed)
+        self._wake()
+
+    def _adjust(self, elapsed: float, failed: bool) -> None:
+        if self.latency_target <= 0:
+            return
+        if failed or elapsed > self.latency_target:
+            now = time.monotonic()
+            if now - self._last_decrease >= self.latency_target and self._limit > self.min_limit:
+                self._limit = max(self._limit / 2, float(self.min_limit))
+                self._last_decrease = now
+                self.decreases += 1
+        elif self._limit < self.max_limit:
+            before = self.limit
+            self._limit = min(self._limit + 1 / self._limit, float(self.max_limit))
+            if self.limit > before:
+                self.increases += 1
+
+    def _wake(self) -> None:
+        while self._waiters and self.inflight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.inflight += 1
+                waiter.set_result(None)
+
+    def snapshot(self) -> dict:
+        return {
+            "limit": self.limit,
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "latency_target_seconds": self.latency_target,
+            "inflight": self.inflight,
+            "waiting": self.waiting,
+            "increases": self.increases,
+            "decreases": self.decreases,
+        }
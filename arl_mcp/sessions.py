@@ -0,0 +1,129 @@
+# MCP 客户端会话：网络传输模式下多个客户端共用一个进程，按会话限制同时执行的工具调用数并保存各自的设置
+import asyncio
+import contextvars
+import functools
+import inspect
+import itertools
+import weakref
+
+# 当前是否已处于某个工具调用内部；工具之间直接互相调用时，内层调用不再占用会话名额，
+# 否则外层持有名额等待内层会在名额用尽时死锁
+_in_tool = contextvars.ContextVar("arl_mcp_in_tool", default=False)
+
+# 搜索类工具未指定每页数量、会话也未设置 page_size 时的默认值
+DEFAULT_PAGE_SIZE = 100
+
+
+class ClientSession:
+    """
+    单个 MCP 客户端会话的并发名额、调用统计与设置。
+
+    设置只在事件循环线程中读写，各会话互不影响，无需加锁：
+    - language：回复语言，zh 或 en，由 detect_reply_language 设置
+    - scope_id：搜索类工具未指定 scope_id 时使用的默认资产范围
+    - page_size：搜索类工具未指定 size 时的每页数量，0 表示使用工具默认值
+    """
+
+    def __init__(self, label: str, limit: int):
+        self.label = label
+        self.limit = limit
+        self.semaphore = asyncio.Semaphore(limit)
+        self.active = 0
+        self.waiting = 0
+        self.calls = 0
+        self.language = "zh"
+        self.scope_id = ""
+        self.page_size = 0
+
+    def settings(self) -> dict:
+        return {
+            "language": self.language,
+            "scope_id": self.scope_id,
+            "page_size": self.page_size,
+        }
+
+    def snapshot(self) -> dict:
+        return {"active": self.active, "waiting": self.waiting, "calls": self.calls, "limit": self.limit}
+
+
+class SessionRegistry:
+    """
+    以 MCP 会话对象为键的弱引用表，会话断开并被回收后条目自动消失。
+
+    limit 为每个会话同时执行的工具调用数，0 表示不限制（stdio 模式只有一个客户端，保持 0）。
+    """
+
+    def __init__(self):
+        self.limit = 0
+        self._sessions: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._ids = itertools.count(1)
+        # 不在 MCP 请求中时（基准脚本等直接调用工具）共用的会话状态
+        self.local = ClientSession("local", 0)
+
+    def current(self) -> ClientSession | None:
+        """当前请求所属会话；不在 MCP 请求中（如基准脚本直接调用工具）时返回 None"""
+        from .app import mcp
+
+        try:
+            session = mcp.get_context().session
+        except (LookupError, ValueError):
+            return None
+        state = self._sessions.get(session)
+        if state is None:
+            client = getattr(getattr(session, "client_params", None), "clientInfo", None)
+            name = getattr(client, "name", "") or "client"
+            state = self._sessions[session] = ClientSession(f"{name}#{next(self._ids)}", self.limit)
+        return state
+
+    def state(self) -> ClientSession:
+        """当前会话的状态；不在 MCP 请求中时返回进程级的 local 会话"""
+        return self.current() or self.local
+
+    def snapshot(self) -> dict:
+        return {state.label: state.snapshot() for state in list(self._sessions.values())}
+
+
+sessions = SessionRegistry()
+
+
+def session_page_size(size: int, default: int = DEFAULT_PAGE_SIZE) -> int:
+    """搜索与列表工具的每页数量：显式指定的 size 优先，其次为会话设置的 page_size，最后为 default"""
+    if size > 0:
+        return size
+    return sessions.state().page_size or default
+
+
+def limit_per_client(fn):
+    """
+    包装异步工具：同一会话同时执行的调用数超过上限时排队，避免单个客户端的重型提取占满服务。
+
+    同步工具都是本地计算，直接在事件循环中执行，不做限制。
+    """
+    if not inspect.iscoroutinefunction(fn):
+        return fn
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        if _in_tool.get() or sessions.limit <= 0:
+            return await fn(*args, **kwargs)
+        state = sessions.current()
+        token = _in_tool.set(True)
+        try:
+            if state is None:
+                return await fn(*args, **kwargs)
+            state.waiting += 1
+            try:
+                await state.semaphore.acquire()
+            finally:
+                state.waiting -= 1
+            state.active += 1
+            state.calls += 1
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                state.active -= 1
+                state.semaphore.release()
+        finally:
+            _in_tool.reset(token)
+
+    return wrapper
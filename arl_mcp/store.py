@@ -0,0 +1,175 @@
+# 已完成任务结果的本地 SQLite 快照库与增量同步基线，由用到它的工具在首次调用时导入
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from .config import ARL_STORE_MAX_BYTES, ARL_STORE_PATH
+
+
+class ResultStore:
+    """
+    已完成（status=done）任务结果的本地快照。
+
+    任务完成后子域名、IP、站点、文件泄露等结果不再变化，首次拉取后以
+    zlib 压缩的 JSON 存入 SQLite，之后直接从本地读取；总大小超过上限时
+    按最近访问时间淘汰。方法均为阻塞调用，在事件循环中需经 asyncio.to_thread 执行。
+
+    同一库中还保存增量同步的基线（每个 结果类型+域名 一条），记录上次同步的
+    结果集及其指纹；基线会被下一次同步覆盖，不参与容量淘汰。
+    """
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path) and self.max_bytes > 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS snapshots (
+                    task_id TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    data BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (task_id, key)
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS baselines (
+                    kind TEXT NOT NULL,
+                    domain TEXT NOT NULL,
+                    digest TEXT NOT NULL,
+                    data BLOB NOT NULL,
+                    count INTEGER NOT NULL,
+                    synced_at REAL NOT NULL,
+                    PRIMARY KEY (kind, domain)
+                )
+                """
+            )
+            self._conn.commit()
+        return self._conn
+
+    def load(self, task_id: str, key: str):
+        """读取快照，不存在时返回 None"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT data FROM snapshots WHERE task_id = ? AND key = ?",
+                (task_id, key),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE snapshots SET accessed_at = ? WHERE task_id = ? AND key = ?",
+                (time.time(), task_id, key),
+            )
+            conn.commit()
+        return json.loads(zlib.decompress(row[0]))
+
+    def save(self, task_id: str, key: str, value) -> None:
+        """写入快照并按上限淘汰最久未访问的条目"""
+        if not self.enabled:
+            return
+        blob = zlib.compress(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+        if len(blob) > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?, ?)",
+                (task_id, key, blob, len(blob), now, now),
+            )
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM snapshots").fetchone()[0]
+            if total > self.max_bytes:
+                rows = conn.execute(
+                    "SELECT task_id, key, size FROM snapshots ORDER BY accessed_at"
+                ).fetchall()
+                for old_task_id, old_key, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    conn.execute(
+                        "DELETE FROM snapshots WHERE task_id = ? AND key = ?",
+                        (old_task_id, old_key),
+                    )
+                    total -= size
+            conn.commit()
+
+    def load_baseline(self, kind: str, domain: str) -> tuple[str, list[str], float] | None:
+        """读取增量同步基线，返回 (指纹, 结果集, 同步时间)，不存在时返回 None"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT digest, data, synced_at FROM baselines WHERE kind = ? AND domain = ?",
+                (kind, domain),
+            ).fetchone()
+        if row is None:
+            return None
+        digest, data, synced_at = row
+        return digest, json.loads(zlib.decompress(data)), synced_at
+
+    def save_baseline(self, kind: str, domain: str, digest: str, items: list[str]) -> None:
+        """覆盖写入增量同步基线"""
+        if not self.enabled:
+            return
+        blob = zlib.compress(json.dumps(items, ensure_ascii=False).encode("utf-8"))
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO baselines VALUES (?, ?, ?, ?, ?, ?)",
+                (kind, domain, digest, blob, len(items), time.time()),
+            )
+            conn.commit()
+
+    def touch_baseline(self, kind: str, domain: str) -> None:
+        """结果集未变化时只更新基线的同步时间"""
+        if not self.enabled:
+            return
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "UPDATE baselines SET synced_at = ? WHERE kind = ? AND domain = ?",
+                (time.time(), kind, domain),
+            )
+            conn.commit()
+
+    def stats(self) -> dict:
+        if not self.enabled:
+            return {"enabled": False}
+        with self._lock:
+            conn = self._connect()
+            count, total = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM snapshots"
+            ).fetchone()
+            baselines = conn.execute("SELECT COUNT(*) FROM baselines").fetchone()[0]
+        return {
+            "enabled": True,
+            "path": self.path,
+            "snapshots": count,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+            "baselines": baselines,
+        }
+
+
+result_store = ResultStore(ARL_STORE_PATH, ARL_STORE_MAX_BYTES)
@@ -0,0 +1,184 @@
+# 任务索引：任务名、任务 ID、目标、状态与所在节点的本地索引，按任务名或任务 ID 操作任务时先在本地解析
+import asyncio
+import re
+
+from .backends import MULTI_BACKEND, Backend, backends, current_backend, get_backend, locate_task
+
+# 索引保存的任务条数上限，超出时淘汰最久未更新的任务
+TASK_INDEX_SIZE = 10000
+
+# ARL 任务 ID 为 MongoDB ObjectId（24 位十六进制）
+_TASK_ID = re.compile(r"[0-9a-f]{24}")
+
+
+def looks_like_task_id(ref: str) -> bool:
+    return bool(_TASK_ID.fullmatch(ref))
+
+
+class IndexedTask:
+    __slots__ = ("task_id", "name", "target", "status", "backend")
+
+    def __init__(self, task_id: str, name: str, target: str, status: str, backend: str):
+        self.task_id = task_id
+        self.name = name
+        self.target = target
+        self.status = status
+        self.backend = backend
+
+
+class TaskIndex:
+    """
+    任务 ID -> 任务记录的本地索引，同时维护任务名 -> 任务 ID 的映射，记录目标、最近一次看到的
+    状态与所在节点。
+
+    由 list_all_tasks 的每一页、任务查询与任务提交的结果增量更新，只在事件循环线程中读写。
+    ARL 允许同名任务（一次提交多个目标会拆成多个同名任务），按任务名解析时取已知 ID 最大即最新
+    创建的一个；其他客户端新建的同名任务要等出现在任务列表或提交结果中才会被索引看到。
+    索引中的状态可能已过时，需要实时状态的工具仍按任务 ID 向所在节点查询。
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._tasks: dict[str, IndexedTask] = {}
+        self._names: dict[str, set[str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def update(self, item: dict, backend: str) -> None:
+        """写入 ARL 返回的任务记录"""
+        task_id = item.get("_id", "")
+        name = item.get("name", "")
+        if task_id and name:
+            self.add(task_id, name, item.get("target", ""), item.get("status", ""), backend)
+
+    def add(self, task_id: str, name: str, target: str, status: str, backend: str) -> None:
+        old = self._tasks.pop(task_id, None)
+        if old is not None:
+            self._unlink(old)
+        self._tasks[task_id] = IndexedTask(task_id, name, target, status, backend)
+        self._names.setdefault(name, set()).add(task_id)
+        while len(self._tasks) > self.max_entries:
+            self._unlink(self._tasks.pop(next(iter(self._tasks))))
+
+    def _unlink(self, task: IndexedTask) -> None:
+        ids = self._names.get(task.name)
+        if ids is not None:
+            ids.discard(task.task_id)
+            if not ids:
+                del self._names[task.name]
+
+    def discard(self, task_ids: list[str]) -> None:
+        for task_id in task_ids:
+            task = self._tasks.pop(task_id, None)
+            if task is not None:
+                self._unlink(task)
+
+    def find(self, ref: str) -> IndexedTask | None:
+        """按任务 ID 或任务名查找，同名时返回最新创建的任务"""
+        task = self._tasks.get(ref)
+        if task is None:
+            ids = self._names.get(ref)
+            task = self._tasks[max(ids)] if ids else None
+        if task is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return task
+
+    def clear(self) -> None:
+        self._tasks.clear()
+        self._names.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "tasks": len(self._tasks),
+            "names": len(self._names),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+task_index = TaskIndex(TASK_INDEX_SIZE)
+
+
+def _node(task: IndexedTask) -> Backend:
+    return get_backend(task.backend) or current_backend()
+
+
+async def _get_task(params: dict, backend: Backend) -> dict | None:
+    from .client import ARLRequestError, arl_get
+
+    resp = await arl_get("/api/task/", {**params, "size": "1"}, timeout=10, backend=backend)
+    if resp.status_code != 200:
+        raise ARLRequestError(f"HTTP {resp.status_code}")
+    items = resp.json().get("items", [])
+    return items[0] if items else None
+
+
+async def lookup_task(ref: str, backend: Backend | None = None) -> tuple[Backend, dict | None]:
+    """
+    按任务名或任务 ID 查询任务的实时记录，返回 (所在节点, 任务记录)，未找到时任务记录为 None。
+
+    索引中有该任务（按任务 ID 或任务名）时直接按任务 ID 向其所在节点查询，这次查询同时确认任务
+    仍然存在，重复按任务名查询不再发出按名称的请求；否则先按 ID（ref 为 ID 形式时）再按任务名
+    向 ARL 查询，同名时取 ARL 返回的第一条即最新创建的任务，配置了多个节点且未指定 backend 时
+    在全部节点中定位。查到的记录写回索引，已不存在的索引条目随之删除。
+    接口返回非 200 时抛出 ARLRequestError。
+    """
+    return await _lookup(ref, backend, task_index.find(ref))
+
+
+async def _lookup(ref: str, backend: Backend | None, indexed: IndexedTask | None) -> tuple[Backend, dict | None]:
+    if indexed is not None and (backend is None or indexed.backend == backend.name):
+        node = _node(indexed)
+        item = await _get_task({"_id": indexed.task_id}, node)
+        if item is not None:
+            task_index.update(item, node.name)
+            return node, item
+        # 任务已被删除；按任务名解析时可能还有同名的旧任务，照常向 ARL 查询
+        task_index.discard([indexed.task_id])
+
+    fields = ("task_id", "name") if looks_like_task_id(ref) else ("name",)
+    for field in fields:
+        if backend is None and MULTI_BACKEND:
+            node, item = await locate_task(**{field: ref})
+        else:
+            node = backend or current_backend()
+            item = await _get_task({"_id" if field == "task_id" else "name": ref}, node)
+        if item is not None:
+            task_index.update(item, node.name)
+            return node, item
+    return backend or current_backend(), None
+
+
+async def resolve_task_ids(refs: list[str]) -> tuple[dict[Backend, list[str]], list[str]]:
+    """
+    把任务名或任务 ID 解析为按所在节点分组的任务 ID，返回 (分组, 未找到的任务)。
+
+    索引中已有的任务 ID 不发请求；只有一个节点时 ID 形式的任务直接归入该节点，由 ARL 返回结果；
+    任务名与 lookup_task 相同：索引命中时按任务 ID 确认任务仍然存在，未命中时向 ARL 查询。
+    查询失败时抛出异常。
+    """
+    async def resolve(ref: str) -> tuple[Backend, str] | None:
+        indexed = task_index.find(ref)
+        if looks_like_task_id(ref):
+            if indexed is not None:
+                return _node(indexed), indexed.task_id
+            if not MULTI_BACKEND:
+                return backends[0], ref
+        backend, item = await _lookup(ref, None, indexed)
+        return (backend, item["_id"]) if item is not None else None
+
+    groups: dict[Backend, list[str]] = {}
+    missing = []
+    for ref, resolved in zip(refs, await asyncio.gather(*(resolve(ref) for ref in refs))):
+        if resolved is None:
+            missing.append(ref)
+            continue
+        backend, task_id = resolved
+        if task_id not in groups.setdefault(backend, []):
+            groups[backend].append(task_id)
+    return groups, missing
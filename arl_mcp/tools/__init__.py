@@ -0,0 +1,22 @@
+# 按分组注册 MCP 工具：导入分组模块即通过 app.tool() 向 mcp 注册其中的工具
+import importlib
+
+TOOL_GROUPS = ("extraction", "tasks", "assets", "nuclei", "export", "ops")
+
+
+def register_tools(groups: str = "") -> list[str]:
+    """
+    导入指定的工具分组并返回分组名列表。
+
+    分组模块只依赖轻量模块，tldextract、SQLite 快照库等较重的依赖在工具首次调用时才导入。
+
+    参数：
+    - groups: 逗号分隔的分组名，为空时导入全部分组
+    """
+    selected = [g.strip() for g in groups.split(",") if g.strip()] or list(TOOL_GROUPS)
+    unknown = [g for g in selected if g not in TOOL_GROUPS]
+    if unknown:
+        raise ValueError(f"未知的工具分组: {', '.join(unknown)}，可选值：{', '.join(TOOL_GROUPS)}")
+    for group in selected:
+        importlib.import_module(f"{__name__}.{group}")
+    return selected
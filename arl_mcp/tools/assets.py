@@ -0,0 +1,712 @@
+# 资产查询与资产范围管理工具
+import asyncio
+import time
+import uuid
+
+from ..app import tool
+from ..backends import MULTI_BACKEND, backends
+from ..client import (
+    ARLRequestError,
+    arl_post,
+    invalidate_reads,
+    iter_pages,
+    search_pages,
+    with_meta,
+)
+from ..collectors import (
+    collect_fileleaks,
+    collect_ips,
+    collect_sites,
+    collect_subdomains,
+    sync_delta,
+)
+from ..config import ARL_STREAM_IDLE_TIMEOUT, ARL_STREAM_MAX_OPEN
+from ..query import RowQuery
+from ..sessions import session_page_size, sessions
+
+# 可流式读取的结果类型：类型 -> (接口路径, 查询参数名, 取值字段)
+STREAM_SOURCES = {
+    "subdomains": ("/api/domain/", "domain", "domain"),
+    "ips": ("/api/ip/", "domain", "ip"),
+    "sites": ("/api/site/", "site", "site"),
+    "fileleaks": ("/api/fileleak/", "url", "url"),
+}
+
+
+class ResultStream:
+    """
+    基于 ARL 分页的结果游标。
+
+    按需向后翻页，缓冲区最多保留一页加一个分块的数据，
+    因此无论结果集多大，内存占用都与分块大小同阶。
+    配置了多个 ARL 节点时依次读完每个节点，total 为各节点之和，
+    并记录已输出的取值以去掉节点间的重复（这部分内存随结果数增长）。
+    """
+
+    def __init__(self, kind: str, domain: str):
+        path, param, field = STREAM_SOURCES[kind]
+        self.kind = kind
+        self.domain = domain
+        self.field = field
+        self.total: int | None = None
+        self.offset = 0
+        self.exhausted = False
+        self.last_access = time.monotonic()
+        self.lock = asyncio.Lock()
+        if MULTI_BACKEND:
+            self._pages = self._iter_backends(path, {param: domain})
+            self._seen: set[str] | None = set()
+        else:
+            self._pages = iter_pages(path, {param: domain})
+            self._seen = None
+        self._buffer: list[str] = []
+
+    @staticmethod
+    async def _iter_backends(path: str, params: dict):
+        """并发读取各节点首页得到合计 total，再按节点顺序逐页产出 (items, total)"""
+        pagers = [iter_pages(path, params, backend=backend) for backend in backends]
+        try:
+            firsts = await asyncio.gather(*(anext(pager) for pager in pagers))
+            total = sum(page_total or 0 for _, page_total in firsts)
+            for pager, (items, _) in zip(pagers, firsts):
+                yield items, total
+                async for items, _ in pager:
+                    yield items, total
+        finally:
+            for pager in pagers:
+                await pager.aclose()
+
+    async def next_chunk(self, chunk_size: int) -> list[str]:
+        self.last_access = time.monotonic()
+        while len(self._buffer) < chunk_size and not self.exhausted:
+            try:
+                items, total = await anext(self._pages)
+            except StopAsyncIteration:
+                self.exhausted = True
+                break
+            if self.total is None and isinstance(total, int):
+                self.total = total
+            values = [item.get(self.field) for item in items if item.get(self.field)]
+            if self._seen is not None:
+                values = [v for v in dict.fromkeys(values) if v not in self._seen]
+                self._seen.update(values)
+            self._buffer.extend(values)
+        chunk = self._buffer[:chunk_size]
+        del self._buffer[:chunk_size]
+        self.offset += len(chunk)
+        return chunk
+
+    @property
+    def has_more(self) -> bool:
+        return bool(self._buffer) or not self.exhausted
+
+    async def close(self) -> None:
+        await self._pages.aclose()
+
+
+_streams: dict[str, ResultStream] = {}
+
+
+async def _purge_streams() -> None:
+    """关闭空闲超时的游标"""
+    now = time.monotonic()
+    for cursor, stream in list(_streams.items()):
+        if now - stream.last_access > ARL_STREAM_IDLE_TIMEOUT:
+            del _streams[cursor]
+            await stream.close()
+
+
+async def _read_stream_chunk(cursor: str, stream: ResultStream, chunk_size: int) -> dict:
+    """读取一个分块，读完后自动释放游标"""
+    async with stream.lock:
+        chunk = await stream.next_chunk(chunk_size)
+        has_more = stream.has_more
+    if not has_more:
+        _streams.pop(cursor, None)
+        await stream.close()
+    return {
+        "status": "success",
+        "cursor": cursor if has_more else "",
+        "kind": stream.kind,
+        "domain": stream.domain,
+        "total": stream.total,
+        "offset": stream.offset,
+        "chunk": chunk,
+        "has_more": has_more
+    }
+
+
+async def _delta_response(key: str, collect, domain: str, baseline: str) -> dict:
+    try:
+        return await sync_delta(key, collect, domain, baseline)
+    except Exception as e:
+        return {"status": "exception", "reason": str(e)}
+
+
+@tool()
+async def get_all_subdomains(domain: str, delta: bool = False, baseline: str = "") -> list[str] | dict:
+    """
+    获取所有子域名
+
+    参数：
+    - domain: 主域名
+    - delta: 增量模式，只返回与上次增量调用相比新增（added）和消失（removed）的子域名
+    - baseline: 增量模式的基线名称，为空时使用所有调用方共享的默认基线；各自跟踪变化的调用方应使用不同名称
+    """
+    if delta:
+        return await _delta_response("subdomains", collect_subdomains, domain, baseline)
+    try:
+        return await collect_subdomains(domain)
+    except ARLRequestError as e:
+        return [str(e)]
+    except Exception as e:
+        return [f"Error: {str(e)}"]
+
+
+@tool()
+async def query_ip_list(domain: str, delta: bool = False, baseline: str = "") -> list[str] | dict:
+    """
+    获取IP列表
+
+    参数：
+    - domain: 主域名
+    - delta: 增量模式，只返回与上次增量调用相比新增（added）和消失（removed）的IP
+    - baseline: 增量模式的基线名称，为空时使用所有调用方共享的默认基线；各自跟踪变化的调用方应使用不同名称
+    """
+    if delta:
+        return await _delta_response("ips", collect_ips, domain, baseline)
+    try:
+        return await collect_ips(domain)
+    except Exception as e:
+        return [f"Error: {str(e)}"]
+
+
+@tool()
+async def query_site_list(domain: str, delta: bool = False, baseline: str = "") -> list[str] | dict:
+    """
+    获取站点列表
+
+    参数：
+    - domain: 主域名
+    - delta: 增量模式，只返回与上次增量调用相比新增（added）和消失（removed）的站点
+    - baseline: 增量模式的基线名称，为空时使用所有调用方共享的默认基线；各自跟踪变化的调用方应使用不同名称
+    """
+    if delta:
+        return await _delta_response("sites", collect_sites, domain, baseline)
+    try:
+        return await collect_sites(domain)
+    except Exception as e:
+        return [f"Error: {str(e)}"]
+
+
+@tool()
+async def query_fileleak_list(domain: str) -> list[str]:
+    """
+    获取文件泄露列表
+    """
+    try:
+        return await collect_fileleaks(domain)
+    except Exception as e:
+        return [f"Error: {str(e)}"]
+
+
+@tool()
+async def open_result_stream(kind: str, domain: str, chunk_size: int = 500) -> dict:
+    """
+    以游标方式分块读取大结果集，返回游标和第一块数据
+
+    适用于子域名、IP 等数量很大、一次性返回会超出消息大小的场景；
+    后续分块通过 fetch_result_chunk 读取。流式模式按 ARL 分页顺序输出，不做跨页去重；
+    配置了多个 ARL 节点时依次读取各节点，去掉节点间重复的条目。
+
+    参数：
+    - kind: 结果类型，可选值：subdomains, ips, sites, fileleaks
+    - domain: 主域名
+    - chunk_size: 每块条数，默认 500
+
+    返回：
+    - cursor（读完时为空）、total、offset、chunk、has_more
+    """
+    if kind not in STREAM_SOURCES:
+        return {
+            "status": "error",
+            "reason": f"不支持的结果类型: {kind}，可选值：{', '.join(STREAM_SOURCES)}"
+        }
+    if chunk_size <= 0:
+        return {"status": "error", "reason": "chunk_size 必须大于 0"}
+
+    await _purge_streams()
+    if len(_streams) >= ARL_STREAM_MAX_OPEN:
+        return {
+            "status": "error",
+            "reason": f"同时打开的游标已达上限 {ARL_STREAM_MAX_OPEN}，请先读完或等待已有游标过期"
+        }
+
+    cursor = uuid.uuid4().hex
+    stream = ResultStream(kind, domain)
+    _streams[cursor] = stream
+    try:
+        return await _read_stream_chunk(cursor, stream, chunk_size)
+    except Exception as e:
+        _streams.pop(cursor, None)
+        await stream.close()
+        return {"status": "exception", "reason": str(e)}
+
+
+@tool()
+async def fetch_result_chunk(cursor: str, chunk_size: int = 500) -> dict:
+    """
+    读取游标的下一块数据
+
+    参数：
+    - cursor: open_result_stream 返回的游标
+    - chunk_size: 每块条数，默认 500
+
+    返回：
+    - cursor（读完时为空）、total、offset、chunk、has_more
+    """
+    await _purge_streams()
+    stream = _streams.get(cursor)
+    if stream is None:
+        return {"status": "not_found", "reason": "游标不存在、已读完或已过期"}
+    if chunk_size <= 0:
+        return {"status": "error", "reason": "chunk_size 必须大于 0"}
+
+    try:
+        return await _read_stream_chunk(cursor, stream, chunk_size)
+    except Exception as e:
+        return {"status": "exception", "reason": str(e), "cursor": cursor}
+
+
+def _format_domain(item: dict) -> dict:
+    return {
+        "域名": item.get("domain", ""),
+        "类型": item.get("type", ""),
+        "解析值": item.get("record", ""),
+        "IP列表": item.get("ips", []),
+        "来源": item.get("source", "")
+    }
+
+
+def _format_ip(item: dict) -> dict:
+    port_info = item.get("port_info", [])
+    ports = [f"{p.get('port_id')}({p.get('service_name', 'unknown')})" for p in port_info]
+    return {
+        "IP": item.get("ip", ""),
+        "域名": item.get("domain", []),
+        "端口": ports,
+        "地理位置": item.get("geo_asn", {}).get("location", ""),
+        "CDN": item.get("cdn_name", "")
+    }
+
+
+def _format_site(item: dict) -> dict:
+    return {
+        "站点": item.get("site", ""),
+        "标题": item.get("title", ""),
+        "状态码": item.get("status", 0),
+        "指纹": item.get("finger", []),
+        "IP": item.get("ip", []),
+        "favicon": item.get("favicon", {}).get("hash", "")
+    }
+
+
+@tool()
+async def search_asset_domain(
+    domain: str = "",
+    scope_id: str = "",
+    page: int = 1,
+    size: int = 0,
+    where: str = "",
+    fields: str = "",
+    group_by: str = "",
+    all_pages: bool = False,
+    max_results: int = 0
+) -> dict:
+    """
+    搜索资产域名
+    
+    参数：
+    - domain: 域名关键词
+    - scope_id: 资产范围ID（可选），默认使用会话设置的 scope_id
+    - page: 页码
+    - size: 每页数量，默认使用会话设置的 page_size，未设置时为 100
+    - where: 本地过滤条件，分号分隔，如 "type = A; ips exists"
+    - fields: 只返回这些原始字段（逗号分隔，支持点分路径），为空时使用默认格式
+    - group_by: 按字段分组计数（支持点分路径），返回分组统计而非记录列表
+    - all_pages: 从 page 页起自动翻页（服务端并发预取），一次返回多页结果，按 _id 去重
+    - max_results: 自动翻页时最多返回的条数，达到后停止翻页；大于 0 时即启用自动翻页，
+      all_pages 未指定时默认 ARL_SEARCH_MAX_RESULTS（2000）
+    
+    返回：
+    - 域名列表及详细信息；指定 group_by 时返回各取值的计数，如 group_by="type"
+    - 自动翻页时附带 pagination：拉取页数、是否因 max_results 截断、去重条数
+    """
+    try:
+        query = RowQuery(where, fields, group_by)
+    except ValueError as e:
+        return {"status": "error", "reason": str(e)}
+
+    scope_id = scope_id or sessions.state().scope_id
+    size = session_page_size(size)
+    params = {}
+    
+    if domain:
+        params["domain"] = domain
+    if scope_id:
+        params["scope_id"] = scope_id
+    
+    try:
+        items, total, meta = await search_pages(
+            "/api/asset_domain/", params, page, size, all_pages, max_results, query.select, cache=True
+        )
+        if query.reshapes:
+            return with_meta(query.response(total, items, "domains"), meta)
+        
+        domains = [_format_domain(item) for item in items]
+        
+        return with_meta({
+            "status": "success",
+            "total": total,
+            "domains": domains
+        }, meta)
+    except ARLRequestError as e:
+        return {"status": "error", "reason": str(e)}
+    except Exception as e:
+        return {"status": "exception", "reason": str(e)}
+
+
+@tool()
+async def search_asset_ip(
+    ip: str = "",
+    domain: str = "",
+    scope_id: str = "",
+    page: int = 1,
+    size: int = 0,
+    where: str = "",
+    fields: str = "",
+    group_by: str = "",
+    all_pages: bool = False,
+    max_results: int = 0
+) -> dict:
+    """
+    搜索资产IP
+    
+    参数：
+    - ip: IP地址关键词
+    - domain: 关联域名
+    - scope_id: 资产范围ID（可选），默认使用会话设置的 scope_id
+    - page: 页码
+    - size: 每页数量，默认使用会话设置的 page_size，未设置时为 100
+    - where: 本地过滤条件，分号分隔，如 "cdn_name empty; port_info.port_id in 80,443"
+    - fields: 只返回这些原始字段（逗号分隔，支持点分路径），为空时使用默认格式
+    - group_by: 按字段分组计数（支持点分路径），返回分组统计而非记录列表
+    - all_pages: 从 page 页起自动翻页（服务端并发预取），一次返回多页结果，按 _id 去重
+    - max_results: 自动翻页时最多返回的条数，达到后停止翻页；大于 0 时即启用自动翻页，
+      all_pages 未指定时默认 ARL_SEARCH_MAX_RESULTS（2000）
+    
+    返回：
+    - IP列表及端口信息；指定 group_by 时返回各取值的计数，如 group_by="port_info.port_id" 得到端口分布
+    - 自动翻页时附带 pagination：拉取页数、是否因 max_results 截断、去重条数
+    """
+    try:
+        query = RowQuery(where, fields, group_by)
+    except ValueError as e:
+        return {"status": "error", "reason": str(e)}
+
+    scope_id = scope_id or sessions.state().scope_id
+    size = session_page_size(size)
+    params = {}
+    
+    if ip:
+        params["ip"] = ip
+    if domain:
+        params["domain"] = domain
+    if scope_id:
+        params["scope_id"] = scope_id
+    
+    try:
+        items, total, meta = await search_pages(
+            "/api/asset_ip/", params, page, size, all_pages, max_results, query.select
+        )
+        if query.reshapes:
+            return with_meta(query.response(total, items, "ips"), meta)
+        
+        ips = [_format_ip(item) for item in items]
+        
+        return with_meta({
+            "status": "success",
+            "total": total,
+            "ips": ips
+        }, meta)
+    except ARLRequestError as e:
+        return {"status": "error", "reason": str(e)}
+    except Exception as e:
+        return {"status": "exception", "reason": str(e)}
+
+
+@tool()
+async def search_site(
+    site: str = "",
+    title: str = "",
+    status: int = 0,
+    scope_id: str = "",
+    page: int = 1,
+    size: int = 0,
+    where: str = "",
+    fields: str = "",
+    group_by: str = "",
+    all_pages: bool = False,
+    max_results: int = 0
+) -> dict:
+    """
+    搜索站点
+    
+    参数：
+    - site: 站点URL关键词
+    - title: 站点标题关键词
+    - status: HTTP状态码
+    - scope_id: 资产范围ID（可选），默认使用会话设置的 scope_id
+    - page: 页码
+    - size: 每页数量，默认使用会话设置的 page_size，未设置时为 100
+    - where: 本地过滤条件，分号分隔，如 "status not in 404,502; title ~ 登录"
+    - fields: 只返回这些原始字段（逗号分隔，支持点分路径），为空时使用默认格式
+    - group_by: 按字段分组计数（支持点分路径），返回分组统计而非记录列表
+    - all_pages: 从 page 页起自动翻页（服务端并发预取），一次返回多页结果，按 _id 去重
+    - max_results: 自动翻页时最多返回的条数，达到后停止翻页；大于 0 时即启用自动翻页，
+      all_pages 未指定时默认 ARL_SEARCH_MAX_RESULTS（2000）
+    
+    返回：
+    - 站点列表及指纹信息；指定 group_by 时返回各取值的计数，如 group_by="finger.name" 得到指纹分布
+    - 自动翻页时附带 pagination：拉取页数、是否因 max_results 截断、去重条数
+    """
+    try:
+        query = RowQuery(where, fields, group_by)
+    except ValueError as e:
+        return {"status": "error", "reason": str(e)}
+
+    scope_id = scope_id or sessions.state().scope_id
+    size = session_page_size(size)
+    params = {}
+    
+    if site:
+        params["site"] = site
+    if title:
+        params["title"] = title
+    if status > 0:
+        params["status"] = status
+    if scope_id:
+        params["scope_id"] = scope_id
+    
+    try:
+        items, total, meta = await search_pages(
+            "/api/site/", params, page, size, all_pages, max_results, query.select, cache=True
+        )
+        if query.reshapes:
+            return with_meta(query.response(total, items, "sites"), meta)
+        
+        sites = [_format_site(item) for item in items]
+        
+        return with_meta({
+            "status": "success",
+            "total": total,
+            "sites": sites
+        }, meta)
+    except ARLRequestError as e:
+        return {"status": "error", "reason": str(e)}
+    except Exception as e:
+        return {"status": "exception", "reason": str(e)}
+
+
+@tool()
+async def sync_asset_index(scope_id: str = "", kinds: str = "domain,ip,site", full: bool = False) -> dict:
+    """
+    把资产范围内的域名、IP、站点同步到本地检索索引，供 search_asset_index 使用
+
+    首次同步拉取全部资产；之后默认增量同步，只拉取新增资产所在的页，
+    ARL 的资产总数与本地条数不一致（如有资产被删除）时自动改为全量同步。
+    已有资产的内容变化（标题、端口等）只在 full=True 时更新。
+    配置了多个 ARL 节点时分别同步每个节点。
+
+    参数：
+    - scope_id: 资产范围ID，默认使用会话设置的 scope_id
+    - kinds: 同步的资产类型，逗号分隔，可选值：domain, ip, site
+    - full: 是否全量重建该资产范围的索引，默认 False
+
+    返回：
+    - synced：各资产类型的同步方式（incremental/full）、新增条数 added、全量同步时删除的条数 removed 与本地条数 count；
+      配置了多个 ARL 节点时 backends 按节点分别给出
+    - failed：同步失败的资产类型及原因
+    """
+    from ..asset_index import ASSET_KINDS, asset_index, sync_assets
+
+    scope_id = scope_id or sessions.state().scope_id
+    if not scope_id:
+        return {"status": "error", "reason": "请指定资产范围ID（可通过 list_asset_scopes 获取）"}
+    selected = list(dict.fromkeys(k.strip() for k in kinds.split(",") if k.strip()))
+    unknown = [k for k in selected if k not in ASSET_KINDS]
+    if unknown or not selected:
+        return {"status": "error", "reason": f"未知资产类型: {', '.join(unknown) or kinds}，可选值：{', '.join(ASSET_KINDS)}"}
+    if not asset_index.enabled:
+        return {"status": "error", "reason": "本地资产索引未启用，请设置 ARL_ASSET_INDEX_PATH"}
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(sync_assets(k, scope_id, full) for k in selected), return_exceptions=True)
+    synced, failed = {}, {}
+    for kind, result in zip(selected, results):
+        if isinstance(result, Exception):
+            failed[kind] = str(result) or type(result).__name__
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            synced[kind] = result
+            if result.get("failed"):
+                failed[kind] = result["failed"]
+    return {
+        "status": "success" if not failed else ("partial" if synced else "error"),
+        "scope_id": scope_id,
+        "synced": synced,
+        "failed": failed,
+        "elapsed_s": round(time.perf_counter() - start, 2)
+    }
+
+
+@tool()
+async def search_asset_index(
+    domain: str = "",
+    ip: str = "",
+    site: str = "",
+    title: str = "",
+    finger: str = "",
+    port: int = 0,
+    kind: str = "",
+    scope_id: str = "",
+    page: int = 1,
+    size: int = 0
+) -> dict:
+    """
+    在本地资产索引中检索资产，不访问 ARL；需先用 sync_asset_index 同步资产范围
+
+    关键词不区分大小写，默认按子串匹配，以 * 结尾时按前缀匹配（如 "admin*"）；多个条件需同时满足。
+
+    参数：
+    - domain: 域名关键词（站点按其主机名匹配）
+    - ip: IP关键词
+    - site: 站点URL关键词
+    - title: 站点标题关键词
+    - finger: 指纹关键词（站点指纹，IP 为端口的服务名与产品名）
+    - port: 端口号（IP 的开放端口，站点 URL 的端口）
+    - kind: 资产类型，可选值：domain, ip, site，为空时检索全部类型
+    - scope_id: 资产范围ID，默认使用会话设置的 scope_id，均未设置时检索全部已同步的资产范围
+    - page: 页码
+    - size: 每页数量，默认使用会话设置的 page_size，未设置时为 100
+
+    返回：
+    - 命中总数 total，以及按类型分组的 domains、ips、sites（格式同 search_asset_domain 等工具）；
+      配置了多个 ARL 节点时每条附带“节点”
+    """
+    from ..asset_index import ASSET_KINDS, asset_index
+
+    if kind and kind not in ASSET_KINDS:
+        return {"status": "error", "reason": f"未知资产类型: {kind}，可选值：{', '.join(ASSET_KINDS)}"}
+    if not asset_index.enabled:
+        return {"status": "error", "reason": "本地资产索引未启用，请设置 ARL_ASSET_INDEX_PATH"}
+
+    scope_id = scope_id or sessions.state().scope_id
+    size = session_page_size(size)
+    terms = {"domain": domain, "ip": ip, "site": site, "title": title, "finger": finger}
+    terms = {column: value.strip() for column, value in terms.items() if value.strip()}
+    try:
+        total, rows = await asyncio.to_thread(
+            asset_index.search, kind, scope_id, terms, port, size, (max(page, 1) - 1) * size
+        )
+    except Exception as e:
+        return {"status": "exception", "reason": str(e)}
+
+    formatters = {"domain": ("domains", _format_domain), "ip": ("ips", _format_ip), "site": ("sites", _format_site)}
+    result = {"status": "success", "total": total, "page": page, "size": size}
+    for backend, item_kind, item in rows:
+        key, format_item = formatters[item_kind]
+        row = format_item(item)
+        if MULTI_BACKEND:
+            row["节点"] = backend
+        result.setdefault(key, []).append(row)
+    return result
+
+
+@tool()
+async def list_asset_scopes(page: int = 1, size: int = 0, all_pages: bool = False, max_results: int = 0) -> dict:
+    """
+    列出所有资产范围/分组
+    
+    参数：
+    - page: 页码
+    - size: 每页数量，默认使用会话设置的 page_size，未设置时为 100
+    - all_pages: 从 page 页起自动翻页（服务端并发预取），一次返回多页结果，按 _id 去重
+    - max_results: 自动翻页时最多返回的条数，达到后停止翻页；大于 0 时即启用自动翻页，
+      all_pages 未指定时默认 ARL_SEARCH_MAX_RESULTS（2000）
+    
+    返回：
+    - 资产范围列表；配置了多个 ARL 节点时合并全部节点，“节点”为资产范围所在节点，
+      backends 给出各节点的数量或错误信息
+    """
+    size = session_page_size(size)
+    try:
+        items, total, meta = await search_pages(
+            "/api/asset_scope/", {}, page, size, all_pages, max_results, cache=True
+        )
+        
+        scopes = []
+        for item in items:
+            scope = {
+                "ID": item.get("_id", ""),
+                "名称": item.get("name", ""),
+                "范围": item.get("scope_array", []),
+                "创建时间": item.get("date", "")
+            }
+            if "_backend" in item:
+                scope["节点"] = item["_backend"]
+            scopes.append(scope)
+        
+        return with_meta({
+            "status": "success",
+            "total": total,
+            "scopes": scopes
+        }, meta)
+    except ARLRequestError as e:
+        return {"status": "error", "reason": str(e)}
+    except Exception as e:
+        return {"status": "exception", "reason": str(e)}
+
+
+@tool()
+async def create_asset_scope(name: str, scope: str) -> dict:
+    """
+    创建资产范围/分组
+    
+    参数：
+    - name: 范围名称
+    - scope: 范围内容（域名、IP或IP段，多个用换行符分隔）
+    
+    返回：
+    - 创建结果；配置了多个 ARL 节点时创建在第一个节点上
+    """
+    payload = {
+        "name": name,
+        "scope": scope
+    }
+    
+    try:
+        resp = await arl_post("/api/asset_scope/", payload)
+        invalidate_reads("/api/asset_scope/")
+        if resp.status_code != 200:
+            return {"status": "error", "reason": f"HTTP {resp.status_code}", "response": resp.text}
+        
+        data = resp.json()
+        return {
+            "status": "success",
+            "message": f"成功创建资产范围: {name}",
+            "response": data
+        }
+    except Exception as e:
+        return {"status": "exception", "reason": str(e)}
@@ -0,0 +1,173 @@
+# 任务数据导出工具
+import asyncio
+import contextlib
+import os
+import re
+import uuid
+
+from ..app import server_path, tool
+from ..backends import Backend
+from ..client import arl_download, arl_get
+from ..config import ARL_EXPORT_CONCURRENCY, ARL_EXPORT_DIR
+from ..task_index import resolve_task_ids
+
+# 导出文件扩展名：优先取 Content-Disposition 中的文件名，其次按 Content-Type 推断
+_EXPORT_EXTENSIONS = {
+    "application/json": ".json",
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": ".xlsx",
+    "application/vnd.ms-excel": ".xls",
+    "text/csv": ".csv",
+    "text/plain": ".txt",
+}
+_DISPOSITION_FILENAME = re.compile(r"filename\*?=(?:[\w-]+'[\w-]*')?\"?([^\";]+)", re.IGNORECASE)
+_TASK_ID = re.compile(r"^[\w-]+$")
+
+
+@tool()
+async def export_task_data(task_id: str) -> dict:
+    """
+    导出任务数据（获取任务的完整导出数据）
+    
+    参数：
+    - task_id: 任务ID或任务名
+    
+    返回：
+    - 任务的完整数据导出；已结束任务的导出结果会保存到本地，source 为 local_store 表示来自本地快照
+    """
+    from ..store import result_store
+
+    try:
+        groups, _ = await resolve_task_ids([task_id])
+        if not groups:
+            return {"status": "error", "reason": f"任务不存在: {task_id}"}
+        backend, ids = next(iter(groups.items()))
+        task_id = ids[0]
+
+        snapshot = await asyncio.to_thread(result_store.load, task_id, "export")
+        if snapshot is not None:
+            return {
+                "status": "success",
+                "task_id": task_id,
+                "source": "local_store",
+                "data": snapshot
+            }
+
+        resp = await arl_get(f"/api/export/{task_id}", backend=backend)
+        if resp.status_code != 200:
+            return {"status": "error", "reason": f"HTTP {resp.status_code}"}
+        
+        # 返回原始数据
+        try:
+            data = resp.json()
+        except:
+            data = resp.text
+
+        if await _task_is_done(task_id, backend):
+            await asyncio.to_thread(result_store.save, task_id, "export", data)
+
+        return {
+            "status": "success",
+            "task_id": task_id,
+            "source": "arl",
+            "data": data
+        }
+    except Exception as e:
+        return {"status": "exception", "reason": str(e)}
+
+
+async def _task_is_done(task_id: str, backend: Backend | None = None) -> bool:
+    """按任务 ID 查询任务是否已结束（status=done）"""
+    resp = await arl_get("/api/task/", {"_id": task_id, "size": "1"}, timeout=10, backend=backend)
+    if resp.status_code != 200:
+        return False
+    items = resp.json().get("items", [])
+    return bool(items) and items[0].get("status") == "done"
+
+
+def _export_extension(content_type: str, content_disposition: str) -> str:
+    match = _DISPOSITION_FILENAME.search(content_disposition)
+    if match:
+        extension = os.path.splitext(match.group(1).strip())[1]
+        if re.fullmatch(r"\.\w{1,8}", extension):
+            return extension.lower()
+    return _EXPORT_EXTENSIONS.get(content_type.split(";")[0].strip().lower(), ".bin")
+
+
+@tool()
+async def export_tasks_to_files(task_ids: str, output_dir: str = "", concurrency: int = 0) -> dict:
+    """
+    批量导出任务数据到本地文件，只返回文件路径、大小和校验值
+
+    导出内容以流式分块写入磁盘，不会整体载入内存，适合数百 MB 的大任务；
+    多个任务按并发上限同时导出，单个任务失败不影响其他任务。
+    配置了多个 ARL 节点时从每个任务所在的节点导出。
+
+    参数：
+    - task_ids: 任务ID或任务名，逗号、空格或换行分隔
+    - output_dir: 输出目录，默认使用 ARL_EXPORT_DIR；网络模式下须位于 ARL_MCP_FILE_DIRS 内
+    - concurrency: 同时进行的导出数，默认使用 ARL_EXPORT_CONCURRENCY
+
+    返回：
+    - files：每个任务的 path、bytes、sha256
+    - failed：导出失败的任务及原因
+    """
+    refs = list(dict.fromkeys(t for t in re.split(r"[\s,;]+", task_ids) if t))
+    if not refs:
+        return {"status": "error", "reason": "请提供至少一个任务ID"}
+    try:
+        directory = server_path(output_dir or ARL_EXPORT_DIR)
+    except PermissionError as e:
+        return {"status": "error", "reason": str(e)}
+    try:
+        groups, missing = await resolve_task_ids(refs)
+    except Exception as e:
+        return {"status": "exception", "reason": str(e)}
+    located = {task_id: backend for backend, ids in groups.items() for task_id in ids}
+    # 任务 ID 用作文件名，只接受 ARL 形式的 ID
+    invalid = [t for t in located if not _TASK_ID.match(t)]
+    if invalid:
+        return {"status": "error", "reason": f"无效的任务ID: {', '.join(invalid)}"}
+
+    try:
+        os.makedirs(directory, exist_ok=True)
+    except OSError as e:
+        return {"status": "error", "reason": f"无法创建输出目录: {e}"}
+
+    semaphore = asyncio.Semaphore(max(concurrency or ARL_EXPORT_CONCURRENCY, 1))
+
+    async def export(task_id: str, backend: Backend) -> dict:
+        # 扩展名要等响应头到达后才能确定，先下载到唯一的隐藏文件，再改名为 <任务ID><扩展名>；
+        # 同一任务被并发或重复导出时各自写入不同的临时文件，最终文件被原子替换而不是堆积
+        staging = os.path.join(directory, f".{task_id}.{uuid.uuid4().hex}")
+        async with semaphore:
+            try:
+                info = await arl_download(f"/api/export/{task_id}", staging, backend=backend)
+            except Exception as e:
+                return {"task_id": task_id, "status": "error", "reason": str(e) or type(e).__name__}
+        path = os.path.join(directory, task_id + _export_extension(info["content_type"], info["content_disposition"]))
+        try:
+            os.replace(staging, path)
+        except OSError as e:
+            with contextlib.suppress(OSError):
+                os.remove(staging)
+            return {"task_id": task_id, "status": "error", "reason": f"无法写入导出文件: {e}"}
+        return {
+            "task_id": task_id,
+            "status": "success",
+            "path": path,
+            "bytes": info["bytes"],
+            "sha256": info["sha256"]
+        }
+
+    results = await asyncio.gather(*(export(t, b) for t, b in located.items()))
+    files = [{k: v for k, v in r.items() if k != "status"} for r in results if r["status"] == "success"]
+    failed = [{"task_id": r["task_id"], "reason": r["reason"]} for r in results if r["status"] != "success"]
+    failed.extend({"task_id": ref, "reason": "任务不存在"} for ref in missing)
+    return {
+        "status": "success" if not failed else ("partial" if files else "error"),
+        "output_dir": directory,
+        "files": files,
+        "failed": failed,
+        "total_bytes": sum(f["bytes"] for f in files),
+        "message": f"导出成功 {len(files)} 个，失败 {len(failed)} 个"
+    }
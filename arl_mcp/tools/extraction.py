@@ -0,0 +1,184 @@
+# 辅助工具：主域名提取、流量主机名提取、回复语言检测与会话设置
+import asyncio
+import os
+import re
+from collections import Counter
+
+from ..app import server_path, tool
+from ..sessions import sessions
+
+REPLY_LANGUAGES = ("zh", "en")
+
+
+@tool()
+def extract_main_domain(RequestBody: str) -> str:
+    """
+    从原始 HTTP 数据包中提取主域名。
+
+    参数：
+    - RequestBody：包含 Host 字段的原始 HTTP 请求包
+
+    返回：
+    - 主域名，例如 'baidu.com'、'dzhsj.cn'。
+    """
+    from ..domains import registrable_domain
+
+    match = re.search(r"Host:\s*([^\s:]+)", RequestBody)
+    if not match:
+        return "host not found"
+
+    host = match.group(1).strip()
+    return registrable_domain(host) or host
+
+
+@tool()
+def extract_domain_or_ip(text: str) -> str:
+    """
+    功能：根据输入文本判断并返回主域名、IP 地址或 IP 段。
+    支持输入：域名字符串、IP 地址、IP 段（如 192.168.0.0/24）。
+    注意：不解析完整 URL，只提取纯域名/IP。
+
+    参数：
+    - text: str，用户输入，如 www.baidu.com、1.1.1.1、192.168.0.0/24
+
+    返回：
+    - str：提取出的主域名或 IP 内容。
+    """
+    from ..domains import normalize_target
+
+    return normalize_target(text)
+
+
+@tool()
+def extract_domains_batch(hosts: str) -> dict:
+    """
+    批量提取主域名并计数。
+
+    参数：
+    - hosts: 主机名、IP 或 IP 段列表，换行、逗号或空白分隔，可一次传入数千条
+
+    返回：
+    - domains：主域名（IP/IP 段原样保留）及出现次数，按次数降序
+    - unresolved：无法识别公共后缀的输入
+    """
+    from ..domains import IPV4_PREFIX, registrable_domain
+
+    counts = Counter()
+    unresolved = []
+    for host in re.split(r"[\s,;]+", hosts):
+        if not host:
+            continue
+        if "/" in host or IPV4_PREFIX.match(host):
+            counts[host] += 1
+            continue
+        domain = registrable_domain(host)
+        if domain:
+            counts[domain] += 1
+        else:
+            unresolved.append(host)
+    return {
+        "status": "success",
+        "input_count": sum(counts.values()) + len(unresolved),
+        "unique_count": len(counts),
+        "domains": dict(counts.most_common()),
+        "unresolved": list(dict.fromkeys(unresolved))
+    }
+
+
+@tool()
+async def extract_hosts_from_traffic(path: str = "", text: str = "", top: int = 0) -> dict:
+    """
+    从大体量 HTTP 流量数据中批量提取主域名并计数。
+
+    支持 Burp 导出、HAR、代理日志等文本格式，扫描所有 Host 头和 URL。
+    传入 path 时以 mmap 映射文件扫描，不会把整个文件读成字符串，适合数十 MB 的导出文件。
+
+    参数：
+    - path: 服务器本地的流量文件路径（与 text 二选一），网络模式下须位于 ARL_MCP_FILE_DIRS 内
+    - text: 直接传入的流量文本
+    - top: 只返回出现次数最多的前 N 个主域名，0 表示全部
+
+    返回：
+    - domains：主域名（IP 原样保留）及提到它的请求数（同一请求中的 URL 与 Host 头只计一次），按次数降序
+    - host_hits：匹配到的主机名总次数（不去重）
+    """
+    if not path and not text:
+        return {"status": "error", "reason": "请提供 path 或 text"}
+
+    from ..domains import scan_traffic, scan_traffic_file
+
+    try:
+        if path:
+            path = server_path(path)
+            if not os.path.isfile(path):
+                return {"status": "error", "reason": f"文件不存在: {path}"}
+            domains, hits, size = await asyncio.to_thread(scan_traffic_file, path)
+        else:
+            data = text.encode("utf-8", "ignore")
+            size = len(data)
+            domains, hits = await asyncio.to_thread(scan_traffic, data)
+    except PermissionError as e:
+        return {"status": "error", "reason": str(e)}
+    except Exception as e:
+        return {"status": "exception", "reason": str(e)}
+
+    ranked = domains.most_common(top or None)
+    return {
+        "status": "success",
+        "bytes_scanned": size,
+        "host_hits": hits,
+        "unique_domains": len(domains),
+        "domains": dict(ranked)
+    }
+
+
+@tool()
+def detect_reply_language(user_prompt: str) -> str:
+    """
+    根据用户输入自动检测语言，设置当前会话的回复语言（只影响发起调用的客户端会话）。
+
+    参数：
+    - user_prompt: 用户输入的原始提示
+
+    返回：
+    - 确认设置的语言提示信息
+    """
+    state = sessions.state()
+    if re.search(r"[\u4e00-\u9fff]", user_prompt):
+        state.language = "zh"
+        return "已自动切换为中文回复模式。"
+    else:
+        state.language = "en"
+        return "Auto-switched to English reply mode."
+
+
+@tool()
+def session_settings(
+    language: str | None = None,
+    scope_id: str | None = None,
+    page_size: int | None = None
+) -> dict:
+    """
+    查看或修改当前会话的设置，各客户端会话互不影响；不传参数时只查看
+
+    参数：
+    - language: 回复语言，可选值：zh, en
+    - scope_id: 默认资产范围ID，search_asset_domain、search_asset_ip、search_site 未指定 scope_id 时使用，传空字符串清除
+    - page_size: 默认每页数量，搜索与列表工具未指定 size 时使用，传 0 恢复工具默认值
+
+    返回：
+    - language、scope_id、page_size
+    """
+    if language is not None and language not in REPLY_LANGUAGES:
+        return {"status": "error", "reason": f"不支持的语言: {language}，可选值：{', '.join(REPLY_LANGUAGES)}"}
+    if page_size is not None and page_size < 0:
+        return {"status": "error", "reason": "page_size 不能小于 0"}
+
+    state = sessions.state()
+    if language is not None:
+        state.language = language
+    if scope_id is not None:
+        state.scope_id = scope_id.strip()
+    if page_size is not None:
+        state.page_size = page_size
+    return {"status": "success", "session": state.label, **state.settings()}
@@ -0,0 +1,59 @@
+# 安全扫描结果工具
+from ..app import tool
+from ..client import ARLRequestError, search_pages, with_meta
+from ..sessions import session_page_size
+
+
+@tool()
+async def search_nuclei_result(
+    url: str = "",
+    page: int = 1,
+    size: int = 0,
+    all_pages: bool = False,
+    max_results: int = 0
+) -> dict:
+    """
+    搜索 Nuclei 漏洞扫描结果
+    
+    参数：
+    - url: URL关键词
+    - page: 页码
+    - size: 每页数量，默认使用会话设置的 page_size，未设置时为 100
+    - all_pages: 从 page 页起自动翻页（服务端并发预取），一次返回多页结果，按 _id 去重
+    - max_results: 自动翻页时最多返回的条数，达到后停止翻页；大于 0 时即启用自动翻页，
+      all_pages 未指定时默认 ARL_SEARCH_MAX_RESULTS（2000）
+    
+    返回：
+    - 漏洞列表；自动翻页时附带 pagination
+    """
+    size = session_page_size(size)
+    params = {}
+    
+    if url:
+        params["url"] = url
+    
+    try:
+        items, total, meta = await search_pages(
+            "/api/nuclei_result/", params, page, size, all_pages, max_results, cache=True
+        )
+        
+        results = []
+        for item in items:
+            results.append({
+                "URL": item.get("url", ""),
+                "模板ID": item.get("template_id", ""),
+                "模板名称": item.get("template_name", ""),
+                "严重程度": item.get("severity", ""),
+                "匹配内容": item.get("matched", ""),
+                "提取内容": item.get("extracted_results", [])
+            })
+        
+        return with_meta({
+            "status": "success",
+            "total": total,
+            "results": results
+        }, meta)
+    except ARLRequestError as e:
+        return {"status": "error", "reason": str(e)}
+    except Exception as e:
+        return {"status": "exception", "reason": str(e)}
@@ -0,0 +1,66 @@
+# 运维诊断工具
+from ..app import server_path, tool
+from ..client import response_cache
+from ..config import CACHE_TTLS
+from ..metrics import dump, metrics
+
+
+@tool()
+def cache_stats(clear: bool = False) -> dict:
+    """
+    查看只读接口响应缓存的命中情况
+
+    参数：
+    - clear: 是否在返回统计后清空缓存，默认 False
+
+    返回：
+    - 条目数、占用字节、命中/未命中/淘汰次数、命中率及各接口 TTL
+    - 已完成任务本地快照库的条目数、占用字节与增量同步基线数
+    - 任务索引（任务名、任务ID -> 所在节点）的条目数与命中情况
+    - 本地资产索引的路径、占用字节与各资产范围的同步时间和条数
+    """
+    from ..asset_index import asset_index
+    from ..store import result_store
+    from ..task_index import task_index
+
+    stats = response_cache.stats()
+    stats["ttls"] = CACHE_TTLS
+    if clear:
+        response_cache.invalidate()
+    return {
+        "status": "success",
+        "cache": stats,
+        "result_store": result_store.stats(),
+        "task_index": task_index.stats(),
+        "asset_index": asset_index.stats()
+    }
+
+
+@tool()
+def server_stats(reset: bool = False, dump_path: str = "", format: str = "json") -> dict:
+    """
+    查看工具调用与 ARL 请求的运行指标，用于定位慢在 ARL、网络还是本地解析
+
+    参数：
+    - reset: 是否在返回后清零指标，默认 False
+    - dump_path: 同时把指标写入该文件，为空则不写；网络模式下须位于 ARL_MCP_FILE_DIRS 内
+    - format: 写入文件的格式，可选值：json, prometheus
+
+    返回：
+    - tools：各工具的调用次数、耗时分布（p50/p95/p99）与错误类型
+    - requests：各 ARL 接口的请求次数、耗时分布、状态码、接收字节数、拉取页数与异常类型
+    - json_decode：分页响应 JSON 解析耗时分布
+    - breaker / concurrency：ARL 熔断器状态与自适应并发上限；配置了多个节点时为 backends，按节点名分别给出
+    """
+    if format not in ("json", "prometheus"):
+        return {"status": "error", "reason": f"不支持的格式: {format}，可选值：json, prometheus"}
+
+    result = {"status": "success", **metrics.snapshot()}
+    if dump_path:
+        try:
+            result["dump_path"] = dump(server_path(dump_path), format)
+        except OSError as e:
+            result["dump_error"] = str(e)
+    if reset:
+        metrics.reset()
+    return result
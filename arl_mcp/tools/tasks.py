@@ -0,0 +1,924 @@
+# 任务管理工具：提交、查询、等待、提取、停止与删除扫描任务
+import asyncio
+import re
+
+import httpx
+
+from ..app import tool
+from ..backends import (
+    MULTI_BACKEND,
+    Backend,
+    backends,
+    current_backend,
+    fan_out,
+    least_loaded,
+    pick_backend,
+    should_fan_out,
+    submit_loads,
+    use_backend,
+)
+from ..client import (
+    ARLRequestError,
+    TokenBucket,
+    arl_get,
+    arl_post,
+    fetch_all_items,
+    invalidate_reads,
+    search_pages,
+    with_meta,
+)
+from ..collectors import (
+    collect_fileleaks,
+    collect_ips,
+    collect_sites,
+    collect_subdomains,
+    extract_module,
+)
+from ..config import (
+    ARL_BULK_CONCURRENCY,
+    ARL_BULK_RATE,
+    ARL_EXTRACT_TIMEOUT,
+    ARL_POLL_BACKOFF,
+    ARL_POLL_INITIAL,
+    ARL_POLL_MAX,
+)
+from ..sessions import session_page_size
+from ..task_index import lookup_task, resolve_task_ids, task_index
+
+# 任务模块（ARL service 名称）及任务结束状态
+TASK_MODULES = ("arl_search", "port_scan", "site_spider", "file_leak")
+TASK_FINAL_STATUSES = frozenset({"done", "stop", "error"})
+
+
+def _completed_services(item: dict) -> set[str]:
+    return {s.get("name") for s in item.get("service", []) if s.get("name")}
+
+
+def _index_created(name: str, data, backend: Backend) -> None:
+    """把新建任务记入任务索引；ARL 把多个目标拆成多个同名任务，逐个记录"""
+    items = data.get("items") if isinstance(data, dict) else None
+    for item in items if isinstance(items, list) else []:
+        if isinstance(item, dict) and item.get("task_id"):
+            task_index.add(item["task_id"], name, item.get("target", ""), "waiting", backend.name)
+
+
+def _with_backend(result: dict, backend: Backend) -> dict:
+    """配置了多个节点时在返回值中注明任务所在节点"""
+    if MULTI_BACKEND:
+        result["backend"] = backend.name
+    return result
+
+
+class TaskWatcher:
+    """
+    单个任务的共享轮询循环。
+
+    同一任务的多个等待者共用一个 watcher：循环按自适应间隔查询 /api/task/，
+    每次查询后通知所有等待者；任务结束或不再有等待者时退出。
+    配置了多个节点时，找到任务后只轮询其所在节点。
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.backend: Backend | None = None
+        self.item: dict | None = None
+        self.error = ""
+        self.not_found = False
+        self.finished = False
+        self.polls = 0
+        self.waiters = 0
+        self.changed = asyncio.Condition()
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def _poll(self) -> None:
+        try:
+            # 首次解析后按任务 ID 轮询，等待期间新建的同名任务不会替换正在等待的任务
+            ref = self.item["_id"] if self.item and self.item.get("_id") else self.name
+            backend, self.item = await lookup_task(ref, self.backend)
+            self.backend = backend if self.item else None
+            self.not_found = self.item is None
+            self.error = ""
+        except Exception as e:
+            self.error = str(e)
+        finally:
+            self.polls += 1
+
+    async def _run(self) -> None:
+        interval = ARL_POLL_INITIAL
+        progress = None
+        try:
+            while self.waiters > 0:
+                await self._poll()
+                async with self.changed:
+                    self.changed.notify_all()
+                if self.not_found or (self.item and self.item.get("status") in TASK_FINAL_STATUSES):
+                    break
+
+                current = _completed_services(self.item) if self.item else None
+                if current != progress:
+                    interval = ARL_POLL_INITIAL
+                    progress = current
+                else:
+                    interval = min(interval * ARL_POLL_BACKOFF, ARL_POLL_MAX)
+                await asyncio.sleep(interval)
+        finally:
+            self.finished = True
+            if _task_watchers.get(self.name) is self:
+                del _task_watchers[self.name]
+            async with self.changed:
+                self.changed.notify_all()
+
+
+_task_watchers: dict[str, TaskWatcher] = {}
+
+
+def _get_task_watcher(name: str) -> TaskWatcher:
+    watcher = _task_watchers.get(name)
+    if watcher is None:
+        watcher = TaskWatcher(name)
+        _task_watchers[name] = watcher
+        watcher.waiters += 1
+        watcher.start()
+    else:
+        watcher.waiters += 1
+    return watcher
+
+
+def _scan_task_payload(name: str, target: str, **switches: bool) -> dict:
+    """默认扫描配置的任务请求体，switches 覆盖各模块开关"""
+    payload = {
+        "name": name,
+        "target": target,
+        "domain_brute_type": "big",
+        "port_scan_type": "top1000",
+        "domain_brute": True,
+        "alt_dns": True,
+        "dns_query_plugin": True,
+        "arl_search": True,
+        "port_scan": True,
+        "service_detection": False,
+        "os_detection": False,
+        "ssl_cert": False,
+        "skip_scan_cdn_ip": True,
+        "site_identify": True,
+        "search_engines": True,
+        "site_spider": True,
+        "site_capture": False,
+        "file_leak": True,
+        "findvhost": True,
+        "nuclei_scan": False
+    }
+    payload.update(switches)
+    return payload
+
+
+@tool()
+async def add_scan_task_and_prompt(
+    name: str,
+    target: str,
+    domain_brute: bool = True,
+    alt_dns: bool = True,
+    dns_query_plugin: bool = True,
+    arl_search: bool = True,
+    port_scan: bool = True,
+    skip_scan_cdn_ip: bool = True,
+    site_identify: bool = True,
+    search_engines: bool = True,
+    site_spider: bool = True,
+    file_leak: bool = True,
+    findvhost: bool = True
+) -> dict:
+    """
+    工具名称：add_scan_task_and_prompt
+    功能：向 ARL 平台提交扫描任务，并向用户返回预计完成时间提示。
+    配置了多个 ARL 节点时提交到运行中任务最少的节点，返回值中的 backend 为所在节点。
+    """
+    payload = _scan_task_payload(
+        name,
+        target,
+        domain_brute=domain_brute,
+        alt_dns=alt_dns,
+        dns_query_plugin=dns_query_plugin,
+        arl_search=arl_search,
+        port_scan=port_scan,
+        skip_scan_cdn_ip=skip_scan_cdn_ip,
+        site_identify=site_identify,
+        search_engines=search_engines,
+        site_spider=site_spider,
+        file_leak=file_leak,
+        findvhost=findvhost
+    )
+    try:
+        backend = await pick_backend()
+        resp = await arl_post("/api/task/", payload, backend=backend)
+        invalidate_reads()
+        if resp.status_code != 200:
+            return {
+                "status": "fail",
+                "reason": f"HTTP {resp.status_code}",
+                "response": resp.text,
+                "next_step": "请稍后手动查询任务状态"
+            }
+
+        data = resp.json()
+        _index_created(name, data, backend)
+        msg = (
+            f"任务已成功创建：{name}\n"
+            f"目标：{target}\n"
+            f"预估子域名枚举完成时间：5-10 分钟\n"
+            f"预估文件泄露检测完成时间：15-30 分钟\n"
+            f"请稍后输入：查询任务状态 {name}\n"
+            f"以检查扫描进度并决定是否提取数据。"
+        )
+        return _with_backend({
+            "status": "success",
+            "task_info": data,
+            "message": msg
+        }, backend)
+
+    except Exception as e:
+        return {
+            "status": "error",
+            "reason": str(e),
+            "next_step": "请稍后手动查询任务状态"
+        }
+@tool()
+async def add_scan_task_with_policy(
+    name: str,
+    target: str,
+    policy_id: str,
+    task_tag: str = "task"
+) -> dict:
+    """
+    使用指定策略创建扫描任务
+
+    参数：
+    - name: 任务名称
+    - target: 扫描目标（域名、IP或IP段）
+    - policy_id: 策略ID（从list_policies获取）
+    - task_tag: 任务类型标签，默认为"task"
+
+    返回：
+    - 任务创建结果和预计完成时间；配置了多个 ARL 节点时在存在该策略的节点中
+      选择运行中任务最少的一个提交，backend 为所在节点
+    """
+    payload = {
+        "name": name,
+        "target": target,
+        "policy_id": policy_id,
+        "task_tag": task_tag
+    }
+
+    try:
+        backend = await pick_backend(policy_id)
+        resp = await arl_post("/api/task/", payload, backend=backend)
+        invalidate_reads()
+        if resp.status_code != 200:
+            return {
+                "status": "fail",
+                "reason": f"HTTP {resp.status_code}",
+                "response": resp.text
+            }
+
+        data = resp.json()
+        _index_created(name, data, backend)
+        msg = (
+            f"任务已成功创建：{name}\n"
+            f"目标：{target}\n"
+            f"使用策略ID：{policy_id}\n"
+            f"预估子域名枚举完成时间：5-10 分钟\n"
+            f"预估完整扫描完成时间：30-60 分钟\n"
+            f"请稍后输入：查询任务状态 {name}\n"
+            f"以检查扫描进度并决定是否提取数据。"
+        )
+        return _with_backend({
+            "status": "success",
+            "task_info": data,
+            "message": msg
+        }, backend)
+
+    except Exception as e:
+        return {
+            "status": "error",
+            "reason": str(e)
+        }
+
+
+def _split_targets(text: str) -> list[str]:
+    """按换行、逗号或空白拆分目标列表"""
+    return [t for t in re.split(r"[\s,;]+", text) if t]
+
+
+async def _active_task_targets() -> set[str]:
+    """正在运行或排队中的任务所覆盖的目标（已规范化）"""
+    from ..domains import normalize_target
+
+    targets = set()
+    for status in ("running", "waiting"):
+        items = await fetch_all_items("/api/task/", {"status": status})
+        for item in items:
+            targets.update(normalize_target(t) for t in _split_targets(item.get("target", "")))
+    return targets
+
+
+@tool()
+async def add_scan_tasks_bulk(
+    targets: str = "",
+    scope_id: str = "",
+    name_prefix: str = "",
+    policy_id: str = "",
+    concurrency: int = 0,
+    rate: float = 0
+) -> dict:
+    """
+    批量提交扫描任务，每个目标一个任务
+
+    目标先经 extract_domain_or_ip 规范化并去重，再跳过已有运行中/排队中任务的目标，
+    然后按并发上限和令牌桶速率提交，避免压垮 ARL 的 celery worker。
+    配置了多个 ARL 节点时，每个任务依次分配给（已分配的任务计入后）运行中任务最少的节点。
+
+    参数：
+    - targets: 目标列表，换行、逗号或空格分隔（域名、IP 或 IP 段）
+    - scope_id: 资产范围ID，指定时追加该范围内的全部目标
+    - name_prefix: 任务名前缀，任务名为 前缀+目标
+    - policy_id: 策略ID，为空时使用 add_scan_task_and_prompt 的默认扫描配置
+    - concurrency: 同时在途的提交请求数，默认使用 ARL_BULK_CONCURRENCY
+    - rate: 每秒最多提交的任务数（须大于 0），默认使用 ARL_BULK_RATE
+
+    返回：
+    - 提交成功/失败的目标及任务信息，以及因重复或已在扫描而跳过的目标
+    """
+    from ..domains import normalize_target
+
+    # 0 表示使用默认值；负数会让令牌桶的等待时间为负而空转
+    if rate < 0:
+        return {"status": "error", "reason": f"rate 必须大于 0: {rate}"}
+
+    raw_targets = _split_targets(targets)
+    try:
+        if scope_id:
+            try:
+                items, _, _ = await search_pages("/api/asset_scope/", {"_id": scope_id}, 1, 1)
+            except ARLRequestError as e:
+                return {"status": "error", "reason": f"读取资产范围失败: {e}"}
+            if not items:
+                return {"status": "error", "reason": f"资产范围不存在: {scope_id}"}
+            raw_targets.extend(items[0].get("scope_array", []))
+
+        normalized = [normalize_target(t) for t in raw_targets]
+        unique_targets = list(dict.fromkeys(normalized))
+        duplicates = len(normalized) - len(unique_targets)
+        if not unique_targets:
+            return {"status": "error", "reason": "没有可提交的目标"}
+
+        active = await _active_task_targets()
+        loads = await submit_loads(policy_id)
+    except Exception as e:
+        return {"status": "exception", "reason": str(e)}
+
+    skipped_active = [t for t in unique_targets if t in active]
+    to_submit = [t for t in unique_targets if t not in active]
+
+    semaphore = asyncio.Semaphore(max(concurrency or ARL_BULK_CONCURRENCY, 1))
+    bucket = TokenBucket(rate or ARL_BULK_RATE)
+
+    async def submit(target: str) -> dict:
+        name = f"{name_prefix}{target}"
+        if policy_id:
+            payload = {"name": name, "target": target, "policy_id": policy_id, "task_tag": "task"}
+        else:
+            payload = _scan_task_payload(name, target)
+        async with semaphore:
+            await bucket.acquire()
+            backend = least_loaded(loads)
+            loads[backend.name] += 1
+            try:
+                resp = await arl_post("/api/task/", payload, backend=backend)
+            except Exception as e:
+                return _with_backend({"target": target, "status": "error", "reason": str(e)}, backend)
+        if resp.status_code != 200:
+            return _with_backend({"target": target, "status": "fail", "reason": f"HTTP {resp.status_code}"}, backend)
+        try:
+            data = resp.json()
+        except ValueError:
+            # 非 JSON 的 200 响应只计入该目标的失败，不影响其他目标的结果汇总与缓存失效
+            return _with_backend({"target": target, "status": "fail", "reason": "响应不是有效的 JSON"}, backend)
+        _index_created(name, data, backend)
+        return _with_backend({"target": target, "status": "success", "name": name, "task_info": data}, backend)
+
+    results = await asyncio.gather(*(submit(t) for t in to_submit))
+    if to_submit:
+        invalidate_reads()
+
+    submitted = [r for r in results if r["status"] == "success"]
+    failed = [r for r in results if r["status"] != "success"]
+    return {
+        "status": "success" if not failed else "partial",
+        "submitted": submitted,
+        "failed": failed,
+        "skipped_active": skipped_active,
+        "duplicates_removed": duplicates,
+        "message": (
+            f"提交成功 {len(submitted)} 个，失败 {len(failed)} 个，"
+            f"跳过已在扫描的目标 {len(skipped_active)} 个，去除重复 {duplicates} 个"
+        )
+    }
+
+
+@tool()
+async def list_all_tasks(page: int = 1, size: int = 0, status: str = "") -> dict:
+    """
+    列出所有任务
+    
+    参数：
+    - page: 页码，默认为 1
+    - size: 每页数量，默认使用会话设置的 page_size，未设置时为 10
+    - status: 任务状态过滤，可选值：waiting, running, done, stop, error
+    
+    返回：
+    - 任务列表，包含任务名称、目标、状态、开始时间、结束时间等信息
+    - 配置了多个 ARL 节点时每个节点各取第 page 页后合并，total 为各节点之和，
+      每个任务附带“节点”，backends 给出各节点的任务数或错误信息
+    """
+    size = session_page_size(size, 10)
+    if not should_fan_out():
+        return await _list_tasks(page, size, status)
+
+    tasks, total, nodes = [], 0, {}
+    for backend, result in await fan_out(_list_tasks, page, size, status):
+        if isinstance(result, BaseException):
+            nodes[backend.name] = {"error": str(result) or type(result).__name__}
+            continue
+        if result.get("status") != "success":
+            nodes[backend.name] = {"error": result.get("reason", "")}
+            continue
+        nodes[backend.name] = {"total": result["total"]}
+        total += result["total"] or 0
+        tasks.extend({**task, "节点": backend.name} for task in result["tasks"])
+    if not any("total" in node for node in nodes.values()):
+        return {"status": "error", "reason": "所有节点均查询失败", "backends": nodes}
+    return {
+        "status": "success",
+        "total": total,
+        "page": page,
+        "size": size,
+        "tasks": tasks,
+        "backends": nodes,
+        "message": f"{len(backends)} 个节点共找到 {total} 个任务，当前显示各节点第 {page} 页"
+    }
+
+
+async def _list_tasks(page: int, size: int, status: str) -> dict:
+    """在当前节点上执行 list_all_tasks"""
+    url = f"{current_backend().url}/api/task/"
+    params = {"page": str(page), "size": str(size)}
+    
+    if status:
+        params["status"] = status
+    
+    try:
+        resp = await arl_get("/api/task/", params)
+        
+        # 详细的错误信息
+        if resp.status_code != 200:
+            return {
+                "status": "error",
+                "reason": f"HTTP {resp.status_code}",
+                "response_text": resp.text[:500],
+                "url": url,
+                "params": params
+            }
+        
+        # 解析响应
+        try:
+            data = resp.json()
+        except Exception as json_err:
+            return {
+                "status": "error",
+                "reason": "JSON解析失败",
+                "error": str(json_err),
+                "response_text": resp.text[:500]
+            }
+        
+        # 检查响应格式
+        if not isinstance(data, dict):
+            return {
+                "status": "error",
+                "reason": "响应格式错误，期望dict",
+                "data_type": str(type(data)),
+                "data": str(data)[:500]
+            }
+        
+        items = data.get("items", [])
+        total = data.get("total", 0)
+        code = data.get("code", 200)
+        
+        # 检查 API 返回的状态码
+        if code != 200:
+            return {
+                "status": "error",
+                "reason": f"API返回错误码: {code}",
+                "message": data.get("message", ""),
+                "data": data
+            }
+        
+        # 简化任务信息，同时增量更新任务索引
+        backend = current_backend()
+        tasks = []
+        for item in items:
+            task_index.update(item, backend.name)
+            task_info = {
+                "任务ID": item.get("_id", ""),
+                "任务名": item.get("name", ""),
+                "目标": item.get("target", ""),
+                "状态": item.get("status", ""),
+                "开始时间": item.get("start_date", ""),
+                "结束时间": item.get("end_date", ""),
+                "统计": item.get("statistic", {})
+            }
+            tasks.append(task_info)
+        
+        return {
+            "status": "success",
+            "total": total,
+            "page": page,
+            "size": size,
+            "tasks": tasks,
+            "message": f"共找到 {total} 个任务，当前显示第 {page} 页"
+        }
+        
+    except httpx.TimeoutException:
+        return {
+            "status": "exception",
+            "reason": "请求超时，请检查 ARL 服务是否正常运行"
+        }
+    except httpx.NetworkError as e:
+        return {
+            "status": "exception",
+            "reason": f"连接错误: {str(e)}"
+        }
+    except Exception as e:
+        return {
+            "status": "exception",
+            "reason": f"未知错误: {str(e)}",
+            "error_type": type(e).__name__
+        }
+
+
+@tool()
+async def query_task_status(name: str) -> dict:
+    """
+    查询任务状态
+
+    参数：
+    - name: 任务名称或任务ID；任务索引中已有的任务（任务名取最新创建的同名任务）直接按任务ID向所在节点查询
+
+    返回：
+    - 各模块完成情况；配置了多个 ARL 节点时在全部节点中查找，“节点”为任务所在节点
+    """
+    _, result = await _task_status(name)
+    return result
+
+
+async def _task_status(name: str) -> tuple[Backend | None, dict]:
+    """执行 query_task_status，同时返回任务所在节点（未找到或出错时为 None）"""
+    try:
+        backend, item = await lookup_task(name)
+        if item is None:
+            return None, {
+                "state": "not_found"
+            }
+
+        completed_services = [s.get("name") for s in item.get("service", []) if s.get("name")]
+
+        status_map = {
+            "子域名爆破": "arl_search" in completed_services,
+            "IP收集": "port_scan" in completed_services,
+            "站点探测": "site_spider" in completed_services,
+            "文件泄露检测": "file_leak" in completed_services
+        }
+
+        all_done = all(status_map.values())
+        name = item.get("name", name)
+        if all_done:
+            next_step = f"全部模块已完成！请输入：提取任务结果 {name} <主域名> 获取全部扫描数据。"
+        else:
+            next_step = f"部分模块尚未完成，请稍后再次查询。"
+
+        result = {
+            "任务名": name,
+            "任务ID": item.get("_id", ""),
+            "任务状态": item.get("status", ""),
+            "子域名爆破": "已完成" if status_map["子域名爆破"] else "未完成",
+            "IP收集": "已完成" if status_map["IP收集"] else "未完成",
+            "站点探测": "已完成" if status_map["站点探测"] else "未完成",
+            "文件泄露检测": "已完成" if status_map["文件泄露检测"] else "未完成",
+            "next_step": next_step
+        }
+        if MULTI_BACKEND:
+            result["节点"] = backend.name
+        return backend, result
+    except ARLRequestError as e:
+        return None, {
+            "state": "error",
+            "reason": str(e)
+        }
+    except Exception as e:
+        return None, {
+            "state": "exception",
+            "reason": str(e)
+        }
+
+
+@tool()
+async def wait_for_task(
+    name: str,
+    modules: str = "arl_search,port_scan,site_spider,file_leak",
+    timeout: float = 300
+) -> dict:
+    """
+    在服务端等待任务指定模块完成，避免反复调用 query_task_status 轮询
+
+    服务端按自适应间隔轮询任务状态（有进展时缩短、无进展时逐步拉长），
+    多个调用等待同一任务时共用一个轮询循环。
+
+    参数：
+    - name: 任务名称或任务ID
+    - modules: 需要等待完成的模块，逗号分隔，可选值：arl_search, port_scan, site_spider, file_leak
+    - timeout: 最长等待时间（秒），默认 300
+
+    返回：
+    - status：done（模块均已完成）、timeout（超时）、finished（任务已结束但仍有模块未完成）、not_found、error
+    - 已完成模块、未完成模块、等待耗时与轮询次数
+    """
+    requested = [m.strip() for m in modules.split(",") if m.strip()]
+    unknown = [m for m in requested if m not in TASK_MODULES]
+    if unknown or not requested:
+        return {
+            "status": "error",
+            "reason": f"未知模块: {', '.join(unknown) or modules}，可选值：{', '.join(TASK_MODULES)}"
+        }
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    deadline = started + timeout
+    watcher = _get_task_watcher(name)
+    polls_before = watcher.polls
+
+    try:
+        async with watcher.changed:
+            while True:
+                item = watcher.item
+                completed = _completed_services(item) if item else set()
+                missing = [m for m in requested if m not in completed]
+                if watcher.not_found:
+                    result_status = "not_found"
+                    break
+                if item and not missing:
+                    result_status = "done"
+                    break
+                if item and item.get("status") in TASK_FINAL_STATUSES:
+                    result_status = "finished"
+                    break
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    result_status = "timeout"
+                    break
+                try:
+                    await asyncio.wait_for(watcher.changed.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+    finally:
+        watcher.waiters -= 1
+
+    if result_status == "not_found":
+        return {"status": "not_found", "任务名": name, "next_step": "请检查任务名称"}
+
+    if result_status == "done":
+        next_step = f"所需模块已完成，可调用 query_and_extract 提取 {name} 的结果。"
+    elif result_status == "finished":
+        next_step = f"任务已结束（{item.get('status')}），但以下模块未完成：{', '.join(missing)}。"
+    else:
+        next_step = f"等待超时，以下模块尚未完成：{', '.join(missing)}，可再次调用 wait_for_task 继续等待。"
+
+    result = {
+        "status": result_status,
+        "任务名": name,
+        "任务ID": item.get("_id", "") if item else "",
+        "任务状态": item.get("status", "") if item else "",
+        "已完成模块": [m for m in requested if m not in missing],
+        "未完成模块": missing,
+        "等待秒数": round(loop.time() - started, 1),
+        "轮询次数": watcher.polls - polls_before,
+        "next_step": next_step
+    }
+    if watcher.error:
+        result["last_error"] = watcher.error
+    return result
+
+
+@tool()
+async def query_and_extract(name: str, domain: str, timeout: float = 0) -> dict:
+    """
+    提取任务结果
+
+    已完成模块的数据（子域名、IP、站点、文件泄露）并发拉取，共享同一个耗时预算；
+    预算内未完成的模块列入“超时模块”（不计入“已完成模块”），其余模块照常返回。
+
+    参数：
+    - name: 任务名称或任务ID
+    - domain: 主域名
+    - timeout: 整体耗时预算（秒），默认使用 ARL_EXTRACT_TIMEOUT
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + (timeout or ARL_EXTRACT_TIMEOUT)
+
+    backend, status = await _task_status(name)
+
+    if status.get("state") in ["error", "exception", "not_found"]:
+        return {
+            "status": status.get("state"),
+            "reason": status.get("reason", "任务未找到或出错"),
+            "next_step": f"请检查任务名称或稍后重新调用"
+        }
+
+    collectors = {
+        "子域名爆破": ("subdomains", collect_subdomains),
+        "IP收集": ("ips", collect_ips),
+        "站点探测": ("sites", collect_sites),
+        "文件泄露检测": ("fileleaks", collect_fileleaks),
+    }
+    # 只拉取该任务的结果；任务已结束后结果不会再变化，可从本地快照读取
+    task_id = status.get("任务ID", "")
+    snapshot = status.get("任务状态") == "done"
+
+    extracted_data = {}
+    pending_modules = []
+    timed_out_modules = []
+    jobs = {}
+
+    # 任务的结果只在其所在节点上；任务创建时复制当前上下文，因此在 with 块内创建即可固定节点
+    with use_backend(backend):
+        for module, (_, collector) in collectors.items():
+            if status.get(module) == "已完成":
+                key = collectors[module][0]
+                jobs[module] = asyncio.create_task(
+                    extract_module(key, collector, domain, task_id, snapshot)
+                )
+            else:
+                pending_modules.append(module)
+
+    if jobs:
+        done, not_done = await asyncio.wait(jobs.values(), timeout=max(deadline - loop.time(), 0))
+        for job in not_done:
+            job.cancel()
+        for module, job in jobs.items():
+            if job in done:
+                extracted_data[collectors[module][0]] = job.result()
+            else:
+                timed_out_modules.append(module)
+
+    all_done = len(pending_modules) == 0
+
+    if timed_out_modules:
+        result_status = "partial"
+        next_step = f"以下模块数据在耗时预算内未提取完：{', '.join(timed_out_modules)}，可增大 timeout 后重新调用。"
+    elif all_done:
+        result_status = "done"
+        next_step = "全部数据已提取，无需再次查询。"
+    else:
+        result_status = "running"
+        next_step = f"以下模块尚未完成：{', '.join(pending_modules)}。"
+
+    return {
+        "status": result_status,
+        "已完成模块": [k for k in collectors if k not in pending_modules and k not in timed_out_modules],
+        "未完成模块": pending_modules,
+        "超时模块": timed_out_modules,
+        "extracted_data": extracted_data,
+        "next_step": next_step
+    }
+
+
+@tool()
+async def delete_task(task_id: str) -> dict:
+    """
+    删除任务
+    
+    参数：
+    - task_id: 任务ID或任务名（可以是单个或逗号分隔的多个）
+    
+    返回：
+    - 删除结果；配置了多个 ARL 节点时按任务所在节点分别删除，response 按节点名给出
+    - not_found：未找到的任务名
+    """
+    # 支持单个或多个任务ID
+    refs = [tid.strip() for tid in task_id.split(",") if tid.strip()]
+    
+    try:
+        groups, missing = await resolve_task_ids(refs)
+        if not groups:
+            return {"status": "error", "reason": f"任务不存在: {', '.join(missing)}"}
+        task_ids = [tid for ids in groups.values() for tid in ids]
+        resps = await asyncio.gather(*(
+            arl_post("/api/task/delete/", {"task_id": ids}, backend=backend) for backend, ids in groups.items()
+        ))
+        invalidate_reads()
+        task_index.discard(task_ids)
+        for resp in resps:
+            if resp.status_code != 200:
+                return {"status": "error", "reason": f"HTTP {resp.status_code}", "response": resp.text}
+        
+        if MULTI_BACKEND:
+            data = {backend.name: resp.json() for backend, resp in zip(groups, resps)}
+        else:
+            data = resps[0].json()
+        result = {
+            "status": "success",
+            "message": f"成功删除 {len(task_ids)} 个任务",
+            "deleted_ids": task_ids,
+            "response": data
+        }
+        if missing:
+            result["not_found"] = missing
+        return result
+    except Exception as e:
+        return {"status": "exception", "reason": str(e)}
+
+
+@tool()
+async def stop_task(task_id: str) -> dict:
+    """
+    停止正在运行的任务
+    
+    参数：
+    - task_id: 任务ID或任务名
+    
+    返回：
+    - 停止结果；配置了多个 ARL 节点时发往任务所在节点
+    """
+    try:
+        groups, _ = await resolve_task_ids([task_id])
+        if not groups:
+            return {"status": "error", "reason": f"任务不存在: {task_id}"}
+        backend, ids = next(iter(groups.items()))
+        task_id = ids[0]
+        resp = await arl_get(f"/api/task/stop/{task_id}", backend=backend)
+        invalidate_reads()
+        if resp.status_code != 200:
+            return {"status": "error", "reason": f"HTTP {resp.status_code}", "response": resp.text}
+        
+        data = resp.json()
+        return _with_backend({
+            "status": "success",
+            "message": f"任务 {task_id} 已停止",
+            "response": data
+        }, backend)
+    except Exception as e:
+        return {"status": "exception", "reason": str(e)}
+
+
+@tool()
+async def list_policies(page: int = 1, size: int = 0, all_pages: bool = False, max_results: int = 0) -> dict:
+    """
+    列出所有扫描策略
+    
+    参数：
+    - page: 页码
+    - size: 每页数量，默认使用会话设置的 page_size，未设置时为 100
+    - all_pages: 从 page 页起自动翻页（服务端并发预取），一次返回多页结果，按 _id 去重
+    - max_results: 自动翻页时最多返回的条数，达到后停止翻页；大于 0 时即启用自动翻页，
+      all_pages 未指定时默认 ARL_SEARCH_MAX_RESULTS（2000）
+    
+    返回：
+    - 策略列表；配置了多个 ARL 节点时合并全部节点，“节点”为策略所在节点，
+      backends 给出各节点的策略数或错误信息
+    """
+    size = session_page_size(size)
+    try:
+        items, total, meta = await search_pages(
+            "/api/policy/", {}, page, size, all_pages, max_results, cache=True
+        )
+        
+        policies = []
+        for item in items:
+            policy = {
+                "ID": item.get("_id", ""),
+                "名称": item.get("name", ""),
+                "策略": item.get("policy", {})
+            }
+            if "_backend" in item:
+                policy["节点"] = item["_backend"]
+            policies.append(policy)
+        
+        return with_meta({
+            "status": "success",
+            "total": total,
+            "policies": policies
+        }, meta)
+    except ARLRequestError as e:
+        return {"status": "error", "reason": str(e)}
+    except Exception as e:
+        return {"status": "exception", "reason": str(e)}
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# 主域名提取基准：对比 tldextract 默认逐条调用与服务端离线 trie + LRU 记忆化路径
+#
+# 用法：
+#   python benchmarks/bench_domain_extract.py --hosts 20000 --unique 2000 --rounds 3
+#
+# 注意：tldextract 默认实例首次调用时会尝试联网刷新后缀表，
+# 在隔离网络中这一步会卡到超时，计入 "first call" 一栏。
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("ARL_TOKEN", "benchmark")
+
+import tldextract  # noqa: E402
+
+from arl_mcp.domains import registrable_domain  # noqa: E402
+from arl_mcp.tools.extraction import extract_domain_or_ip, extract_domains_batch  # noqa: E402
+
+SUFFIXES = ["com", "cn", "com.cn", "co.uk", "org", "net", "gov.cn", "github.io", "io", "edu.cn"]
+LABELS = ["www", "api", "mail", "dev", "test", "cdn", "static", "vpn", "oa", "m"]
+
+
+def make_hosts(total: int, unique: int, seed: int) -> list[str]:
+    """生成 total 个主机名，其中约 unique 个互不相同（模拟真实流量中的重复）"""
+    rng = random.Random(seed)
+    pool = []
+    for i in range(unique):
+        depth = rng.randint(0, 2)
+        labels = [rng.choice(LABELS) for _ in range(depth)]
+        pool.append(".".join(labels + [f"site{i}", rng.choice(SUFFIXES)]))
+    return [rng.choice(pool) for _ in range(total)]
+
+
+def legacy_extract(host: str) -> str:
+    """改造前的逐条调用路径"""
+    extracted = tldextract.extract(host)
+    if extracted.domain and extracted.suffix:
+        return f"{extracted.domain}.{extracted.suffix}"
+    return host
+
+
+def run(name: str, fn, hosts: list[str], rounds: int) -> list[str]:
+    start = time.perf_counter()
+    fn(hosts[0])
+    first = time.perf_counter() - start
+
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        results = [fn(h) for h in hosts]
+        timings.append(time.perf_counter() - start)
+
+    best = min(timings)
+    print(
+        f"{name:<28} first call {first * 1000:9.2f} ms   "
+        f"best of {rounds}: {best * 1000:9.2f} ms   "
+        f"{len(hosts) / best:12.0f} hosts/s"
+    )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="主域名提取基准")
+    parser.add_argument("--hosts", type=int, default=20000, help="每轮处理的主机名数量")
+    parser.add_argument("--unique", type=int, default=2000, help="互不相同的主机名数量")
+    parser.add_argument("--rounds", type=int, default=3, help="重复轮数，取最快一轮")
+    parser.add_argument("--seed", type=int, default=1, help="随机种子")
+    args = parser.parse_args()
+
+    hosts = make_hosts(args.hosts, args.unique, args.seed)
+    print(f"hosts={args.hosts} unique={args.unique} rounds={args.rounds}")
+
+    legacy = run("tldextract.extract", legacy_extract, hosts, args.rounds)
+    current = run("extract_domain_or_ip", extract_domain_or_ip, hosts, args.rounds)
+
+    start = time.perf_counter()
+    extract_domains_batch("\n".join(hosts))
+    batch = time.perf_counter() - start
+    print(f"{'extract_domains_batch':<28} single call {batch * 1000:8.2f} ms")
+    print(f"LRU: {registrable_domain.cache_info()}")
+
+    mismatches = sum(1 for a, b in zip(legacy, current) if a != b)
+    print(f"结果不一致条数: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# 启动耗时基准：以 stdio 方式拉起 MCP 服务器，测量从进程启动到 tools/list 返回的时间
+#
+# 用法：
+#   python benchmarks/bench_startup.py --rounds 10
+#   python benchmarks/bench_startup.py --script /path/to/old/server.py   # 对比其他版本
+#
+# 每轮都是全新进程，与 MCP 客户端每次拉起服务器的开销一致。
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def send(proc: subprocess.Popen, message: dict) -> None:
+    proc.stdin.write((json.dumps(message) + "\n").encode("utf-8"))
+    proc.stdin.flush()
+
+
+def receive(proc: subprocess.Popen, request_id: int) -> dict:
+    """读取指定 id 的 JSON-RPC 响应，跳过日志等非 JSON 输出"""
+    while True:
+        line = proc.stdout.readline()
+        if not line:
+            raise RuntimeError(f"服务器提前退出: {proc.stderr.read().decode('utf-8', 'replace')[-2000:]}")
+        try:
+            message = json.loads(line)
+        except ValueError:
+            continue
+        if message.get("id") == request_id:
+            return message
+
+
+def measure(script: str, env: dict) -> tuple[float, float, int]:
+    """返回 (initialize 耗时, tools/list 耗时, 工具数)，均从进程启动开始计时"""
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, script],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=env,
+    )
+    try:
+        send(proc, {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "initialize",
+            "params": {
+                "protocolVersion": "2024-11-05",
+                "capabilities": {},
+                "clientInfo": {"name": "bench-startup", "version": "0"},
+            },
+        })
+        receive(proc, 1)
+        initialized = time.perf_counter() - start
+
+        send(proc, {"jsonrpc": "2.0", "method": "notifications/initialized"})
+        send(proc, {"jsonrpc": "2.0", "id": 2, "method": "tools/list"})
+        tools = receive(proc, 2)["result"]["tools"]
+        listed = time.perf_counter() - start
+    finally:
+        proc.stdin.close()
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+        proc.stdout.close()
+        proc.stderr.close()
+    return initialized, listed, len(tools)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MCP 服务器启动耗时基准")
+    parser.add_argument("--script", default=os.path.join(ROOT, "server.py"), help="服务器入口脚本")
+    parser.add_argument("--rounds", type=int, default=10, help="测量轮数")
+    parser.add_argument("--groups", default=None, help="设置 ARL_TOOL_GROUPS，只加载部分工具分组")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault("ARL_TOKEN", "benchmark")
+    env.setdefault("ARL_URL", "http://127.0.0.1:9")
+    if args.groups is not None:
+        env["ARL_TOOL_GROUPS"] = args.groups
+
+    # 预热一轮，排除首次编译 .pyc 的影响
+    measure(args.script, env)
+
+    init_times, list_times = [], []
+    tool_count = 0
+    for _ in range(args.rounds):
+        initialized, listed, tool_count = measure(args.script, env)
+        init_times.append(initialized)
+        list_times.append(listed)
+
+    print(f"script={args.script} rounds={args.rounds} tools={tool_count}")
+    for name, values in (("initialize", init_times), ("tools/list", list_times)):
+        print(
+            f"{name:<12} min {min(values) * 1000:8.1f} ms   "
+            f"median {statistics.median(values) * 1000:8.1f} ms   "
+            f"max {max(values) * 1000:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
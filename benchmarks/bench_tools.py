@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# 工具基准：拉起 benchmarks/mock_arl.py，测量各工具的单次延迟与并发吞吐
+#
+# 用法：
+#   python benchmarks/bench_tools.py --records 20000 --latency 20
+#   python benchmarks/bench_tools.py --save before.json          # 保存结果
+#   python benchmarks/bench_tools.py --compare before.json       # 与保存的结果对比
+#   python benchmarks/bench_tools.py --only get_all_subdomains,query_and_extract
+#   python benchmarks/bench_tools.py --nodes 3                   # 3 个模拟节点，测量多节点扇出与合并
+#
+# 默认关闭本地快照库并在每次调用前清空响应缓存，测量的是完整访问 ARL 的路径。
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def start_mock(args, node: int = 0) -> tuple[subprocess.Popen, str]:
+    """以子进程启动模拟 ARL，返回 (进程, 地址)"""
+    proc = subprocess.Popen(
+        [
+            sys.executable,
+            os.path.join(ROOT, "benchmarks", "mock_arl.py"),
+            "--port", "0",
+            "--node", str(node),
+            "--records", str(args.records),
+            "--latency", str(args.latency),
+            "--jitter", str(args.jitter),
+            "--export-mb", str(args.export_mb),
+        ],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    line = proc.stdout.readline()
+    if not line.startswith("listening on "):
+        proc.kill()
+        raise RuntimeError(f"模拟 ARL 启动失败: {line!r}")
+    return proc, line.split()[-1]
+
+
+def build_scenarios(export_dir: str) -> dict:
+    """场景名 -> 无参协程函数；必须在设置好环境变量之后调用"""
+    from arl_mcp.tools import assets, export, extraction, tasks
+
+    hosts = "\n".join(f"www.d{i}.example{i % 50}.com" for i in range(20000))
+
+    async def result_stream():
+        page = await assets.open_result_stream("subdomains", "example.com", 1000)
+        count = len(page.get("chunk", []))
+        while page.get("cursor"):
+            page = await assets.fetch_result_chunk(page["cursor"], 1000)
+            count += len(page.get("chunk", []))
+        return {"status": page["status"], "count": count}
+
+    async def domains_batch():
+        return extraction.extract_domains_batch(hosts)
+
+    return {
+        "get_all_subdomains": lambda: assets.get_all_subdomains("example.com"),
+        "query_ip_list": lambda: assets.query_ip_list("example.com"),
+        "query_site_list": lambda: assets.query_site_list("example.com"),
+        "query_and_extract": lambda: tasks.query_and_extract("bench-0", "example.com"),
+        "query_task_status": lambda: tasks.query_task_status("bench-0"),
+        "search_asset_ip": lambda: assets.search_asset_ip(domain="example.com", size=100),
+        "search_asset_ip_group_by": lambda: assets.search_asset_ip(
+            domain="example.com", size=1000, group_by="port_info.port_id"
+        ),
+        "search_asset_ip_all_pages": lambda: assets.search_asset_ip(
+            domain="example.com", all_pages=True, max_results=5000, group_by="port_info.port_id"
+        ),
+        "search_site_where": lambda: assets.search_site(
+            site="example.com", size=1000, where="status not in 404,500", fields="site,title"
+        ),
+        "result_stream": result_stream,
+        "export_tasks_to_files": lambda: export.export_tasks_to_files("bench-0", output_dir=export_dir),
+        "extract_domains_batch": domains_batch,
+    }
+
+
+def check(name: str, result) -> None:
+    """工具返回错误时中止基准，避免把失败的快速返回计入结果"""
+    failed = False
+    if isinstance(result, dict):
+        failed = result.get("status", result.get("state")) in ("error", "exception", "fail", "partial")
+    elif isinstance(result, list) and result and isinstance(result[0], str):
+        failed = result[0].startswith(("Error", "Request failed"))
+    if failed:
+        raise RuntimeError(f"{name} 返回错误: {str(result)[:300]}")
+
+
+async def run_scenario(name: str, fn, iterations: int, concurrency: int, use_cache: bool) -> dict:
+    from arl_mcp.client import response_cache
+    from arl_mcp.metrics import metrics
+
+    def prepare():
+        if not use_cache:
+            response_cache.invalidate()
+
+    prepare()
+    check(name, await fn())  # 预热：建立连接、载入后缀表等
+
+    metrics.reset()
+    latencies = []
+    for _ in range(iterations):
+        prepare()
+        start = time.perf_counter()
+        check(name, await fn())
+        latencies.append(time.perf_counter() - start)
+    requests = sum(stats.calls for stats in metrics.requests.values())
+    received = sum(stats.bytes for stats in metrics.requests.values())
+
+    prepare()
+    start = time.perf_counter()
+    for result in await asyncio.gather(*(fn() for _ in range(concurrency))):
+        check(name, result)
+    elapsed = time.perf_counter() - start
+
+    ordered = sorted(latencies)
+    return {
+        "iterations": iterations,
+        "min_ms": round(ordered[0] * 1000, 2),
+        "median_ms": round(statistics.median(ordered) * 1000, 2),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 2),
+        "max_ms": round(ordered[-1] * 1000, 2),
+        "requests_per_call": round(requests / iterations, 1),
+        "kib_per_call": round(received / iterations / 1024, 1),
+        "concurrency": concurrency,
+        "throughput_per_s": round(concurrency / elapsed, 2),
+    }
+
+
+def print_table(results: dict, baseline: dict | None) -> None:
+    header = f"{'scenario':<26}{'min ms':>10}{'median ms':>11}{'p95 ms':>10}{'req/call':>10}{'KiB/call':>10}{'calls/s':>10}"
+    if baseline:
+        header += f"{'Δmedian':>10}{'Δcalls/s':>10}"
+    print(header)
+    for name, r in results.items():
+        line = (
+            f"{name:<26}{r['min_ms']:>10.1f}{r['median_ms']:>11.1f}{r['p95_ms']:>10.1f}"
+            f"{r['requests_per_call']:>10.1f}{r['kib_per_call']:>10.1f}{r['throughput_per_s']:>10.2f}"
+        )
+        base = (baseline or {}).get(name)
+        if base:
+            line += f"{_change(base['median_ms'], r['median_ms']):>10}{_change(base['throughput_per_s'], r['throughput_per_s']):>10}"
+        print(line)
+
+
+def _change(before: float, after: float) -> str:
+    if not before:
+        return "-"
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+async def run(args, export_dir: str) -> dict:
+    scenarios = build_scenarios(export_dir)
+    selected = [s.strip() for s in args.only.split(",") if s.strip()] or list(scenarios)
+    unknown = [s for s in selected if s not in scenarios]
+    if unknown:
+        raise SystemExit(f"未知场景: {', '.join(unknown)}，可选值：{', '.join(scenarios)}")
+
+    results = {}
+    for name in selected:
+        results[name] = await run_scenario(name, scenarios[name], args.iterations, args.concurrency, args.cache)
+        print(f"  {name}: median {results[name]['median_ms']} ms", file=sys.stderr)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ARL MCP 工具基准（基于本地模拟 ARL）")
+    parser.add_argument("--records", type=int, default=5000, help="模拟 ARL 每个结果接口的记录数")
+    parser.add_argument("--latency", type=float, default=10, help="模拟 ARL 每个请求的固定延迟（毫秒）")
+    parser.add_argument("--jitter", type=float, default=0, help="模拟 ARL 每个请求的随机延迟上限（毫秒）")
+    parser.add_argument("--export-mb", type=float, default=8, help="模拟导出文件大小（MB）")
+    parser.add_argument("--nodes", type=int, default=1, help="模拟 ARL 节点数，大于 1 时通过 ARL_BACKENDS 配置")
+    parser.add_argument("--iterations", type=int, default=5, help="每个场景顺序调用的次数")
+    parser.add_argument("--concurrency", type=int, default=8, help="吞吐测量时同时发起的调用数")
+    parser.add_argument("--cache", action="store_true", help="保留响应缓存（默认每次调用前清空）")
+    parser.add_argument("--only", default="", help="只运行这些场景，逗号分隔")
+    parser.add_argument("--save", default="", help="把结果保存为 JSON 文件")
+    parser.add_argument("--compare", default="", help="与之前保存的 JSON 结果对比")
+    args = parser.parse_args()
+
+    mocks = [start_mock(args, node) for node in range(max(args.nodes, 1))]
+    export_dir = tempfile.mkdtemp(prefix="arl-bench-export-")
+    os.environ.update({
+        "ARL_URL": mocks[0][1],
+        "ARL_TOKEN": os.environ.get("ARL_TOKEN", "benchmark"),
+        "ARL_STORE_PATH": "",
+    })
+    if len(mocks) > 1:
+        os.environ["ARL_BACKENDS"] = ",".join(f"node{node}={url}" for node, (_, url) in enumerate(mocks))
+    try:
+        results = asyncio.run(run(args, export_dir))
+    finally:
+        for proc, _ in mocks:
+            proc.terminate()
+            proc.wait()
+        for name in os.listdir(export_dir):
+            os.remove(os.path.join(export_dir, name))
+        os.rmdir(export_dir)
+
+    config = {
+        k: getattr(args, k)
+        for k in ("records", "latency", "jitter", "export_mb", "iterations", "concurrency", "cache", "nodes")
+    }
+    print(f"config: {json.dumps(config)}")
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            saved = json.load(f)
+        if saved.get("config") != config:
+            print(f"注意：对比文件的配置不同: {json.dumps(saved.get('config'))}")
+        baseline = saved.get("results", {})
+    print_table(results, baseline)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"config": config, "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"结果已保存到 {args.save}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# 本地模拟 ARL 服务：按参数生成确定性的分页数据，并可注入延迟，供基准测试使用
+#
+# 用法：
+#   python benchmarks/mock_arl.py --port 18080 --records 20000 --latency 20
+#   python benchmarks/mock_arl.py --port 18081 --node 1 --running 2   # 多节点测试中的第二个节点
+#
+# 启动后在 stdout 输出一行 "listening on http://127.0.0.1:<port>"；--port 0 时自动选择端口。
+# 数据按序号即时生成，不预先占用内存，记录数可以设到数百万。
+import argparse
+import json
+import random
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+SERVICES = ("arl_search", "port_scan", "site_spider", "file_leak")
+PORTS = ((80, "http"), (443, "https"), (8080, "http-proxy"), (22, "ssh"), (3306, "mysql"))
+FINGERS = ("nginx", "Apache", "IIS", "Tomcat", "Spring Boot")
+STATUSES = (200, 301, 403, 404, 500)
+SEVERITIES = ("info", "low", "medium", "high", "critical")
+
+
+def object_id(n: int) -> str:
+    """与 MongoDB ObjectId 同格式的 24 位十六进制 ID"""
+    return f"{n:024x}"
+
+
+def make_domain(i: int, domain: str) -> dict:
+    return {
+        "_id": object_id(i),
+        "domain": f"d{i}.{domain}",
+        "type": "CNAME" if i % 7 == 0 else "A",
+        "record": [f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}"],
+        "ips": [f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}"],
+        "source": "domain_brute" if i % 3 else "arl_search",
+    }
+
+
+def make_ip(i: int, domain: str) -> dict:
+    ports = [PORTS[(i + k) % len(PORTS)] for k in range(1 + i % 3)]
+    return {
+        "_id": object_id(i),
+        "ip": f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}",
+        "domain": [f"d{i}.{domain}"],
+        "port_info": [{"port_id": port, "service_name": name} for port, name in ports],
+        "geo_asn": {"location": "CN" if i % 2 else "US", "number": 4134 + i % 5},
+        "cdn_name": "cloudflare" if i % 10 == 0 else "",
+    }
+
+
+def make_site(i: int, domain: str) -> dict:
+    return {
+        "_id": object_id(i),
+        "site": f"https://d{i}.{domain}",
+        "title": f"站点 {i}" if i % 4 else "登录",
+        "status": STATUSES[i % len(STATUSES)],
+        "finger": [{"name": FINGERS[i % len(FINGERS)], "icon": ""}],
+        "ip": [f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}"],
+        "favicon": {"hash": 116323821 + i % 50},
+    }
+
+
+def make_fileleak(i: int, domain: str) -> dict:
+    return {
+        "_id": object_id(i),
+        "url": f"https://d{i}.{domain}/.git/config",
+        "site": f"https://d{i}.{domain}",
+        "title": "",
+        "status_code": 200,
+        "content_length": 92 + i % 400,
+    }
+
+
+def make_nuclei(i: int, domain: str) -> dict:
+    return {
+        "_id": object_id(i),
+        "url": f"https://d{i}.{domain}",
+        "template_id": f"tpl-{i % 40}",
+        "template_name": f"Template {i % 40}",
+        "severity": SEVERITIES[i % len(SEVERITIES)],
+        "matched": f"https://d{i}.{domain}/admin",
+        "extracted_results": [],
+    }
+
+
+class MockARL:
+    """数据集配置与任务表"""
+
+    def __init__(self, args):
+        self.records = args.records
+        self.tasks = args.tasks
+        self.node = args.node
+        self.running = args.running
+        self.latency = args.latency / 1000
+        self.jitter = args.jitter / 1000
+        self.export_bytes = int(args.export_mb * 1024 * 1024)
+        self.rng = random.Random(args.seed)
+        self.created = 0
+        # 接口路径 -> (记录生成函数, 默认查询参数名, 记录数)
+        self.datasets = {
+            "/api/domain/": (make_domain, "domain", self.records),
+            "/api/ip/": (make_ip, "domain", self.records),
+            "/api/site/": (make_site, "site", self.records),
+            "/api/fileleak/": (make_fileleak, "url", self.records),
+            "/api/asset_domain/": (make_domain, "domain", self.records),
+            "/api/asset_ip/": (make_ip, "domain", self.records),
+            "/api/asset_site/": (make_site, "site", self.records),
+            "/api/nuclei_result/": (make_nuclei, "url", max(self.records // 10, 1)),
+        }
+
+    def task(self, n: int) -> dict:
+        return {
+            "_id": object_id(0xBE0000 + self.node * 0x10000 + n),
+            "name": f"node{self.node}-bench-{n}" if self.node else f"bench-{n}",
+            "target": f"example{n}.com",
+            "status": "running" if n < self.running else "done",
+            "start_date": "2024-01-01 00:00:00",
+            "end_date": "2024-01-01 01:00:00",
+            "service": [{"name": name, "elapsed": 60.0} for name in SERVICES],
+            "statistic": {"domain_cnt": self.records, "ip_cnt": self.records, "site_cnt": self.records},
+        }
+
+    def sleep(self) -> None:
+        if self.latency or self.jitter:
+            time.sleep(self.latency + self.rng.uniform(0, self.jitter))
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "MockARL/1.0"
+    # 响应头与响应体分两次写出，不关闭 Nagle 时 keep-alive 连接上每个请求会多出约 40ms 的延迟确认等待
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    @property
+    def arl(self) -> MockARL:
+        return self.server.arl
+
+    def send_json(self, body: dict, status: int = 200) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def page(self, query: dict, total: int, make, domain: str) -> dict:
+        page = max(int(query.get("page", ["1"])[0]), 1)
+        size = max(int(query.get("size", ["10"])[0]), 1)
+        start = (page - 1) * size
+        items = [make(i, domain) for i in range(start, min(start + size, total))]
+        return {"code": 200, "message": "success", "total": total, "items": items}
+
+    def do_GET(self):
+        self.arl.sleep()
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        path = url.path
+
+        if path == "/api/task/":
+            tasks = [self.arl.task(n) for n in range(self.arl.tasks)]
+            for key in ("name", "_id", "status"):
+                if key in query:
+                    tasks = [t for t in tasks if t[key] == query[key][0]]
+            return self.send_json(self.page(query, len(tasks), lambda i, _: tasks[i], ""))
+
+        if path.startswith("/api/task/stop/"):
+            return self.send_json({"code": 200, "message": "success"})
+
+        if path.startswith("/api/export/"):
+            return self.send_export(path.rsplit("/", 1)[-1])
+
+        if path == "/api/asset_scope/":
+            scopes = [
+                {
+                    "_id": object_id(0xA5000 + self.arl.node * 0x100 + n),
+                    "name": f"scope-{n}",
+                    "scope_array": [f"example{n}.com"],
+                    "date": "",
+                }
+                for n in range(3)
+            ]
+            if "_id" in query:
+                scopes = [s for s in scopes if s["_id"] == query["_id"][0]]
+            return self.send_json(self.page(query, len(scopes), lambda i, _: scopes[i], ""))
+
+        if path == "/api/policy/":
+            policies = [
+                {"_id": object_id(0x90000 + self.arl.node * 0x100 + n), "name": f"policy-{n}", "policy": {}}
+                for n in range(3)
+            ]
+            if "_id" in query:
+                policies = [p for p in policies if p["_id"] == query["_id"][0]]
+            return self.send_json(self.page(query, len(policies), lambda i, _: policies[i], ""))
+
+        if path in self.arl.datasets:
+            make, param, total = self.arl.datasets[path]
+            domain = query.get(param, query.get("domain", ["example.com"]))[0]
+            domain = domain.replace("https://", "").replace("http://", "") or "example.com"
+            return self.send_json(self.page(query, total, make, domain))
+
+        self.send_json({"code": 404, "message": "not found"}, 404)
+
+    def do_POST(self):
+        self.arl.sleep()
+        length = int(self.headers.get("Content-Length", "0"))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        if self.path in ("/api/task/", "/api/asset_scope/"):
+            self.arl.created += 1
+            item = {"target": payload.get("target", ""), "task_id": object_id(0xC00000 + self.arl.node * 0x10000 + self.arl.created)}
+            return self.send_json({"code": 200, "message": "success", "items": [item]})
+        if self.path == "/api/task/delete/":
+            return self.send_json({"code": 200, "message": "success"})
+        self.send_json({"code": 404, "message": "not found"}, 404)
+
+    def send_export(self, task_id: str) -> None:
+        size = self.arl.export_bytes
+        self.send_response(200)
+        self.send_header("Content-Type", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+        self.send_header("Content-Disposition", f'attachment; filename="{task_id}.xlsx"')
+        self.send_header("Content-Length", str(size))
+        self.end_headers()
+        block = (task_id.encode("ascii", "ignore") or b"0") * (65536 // max(len(task_id), 1) + 1)
+        block = block[:65536]
+        sent = 0
+        while sent < size:
+            chunk = block[: size - sent]
+            self.wfile.write(chunk)
+            sent += len(chunk)
+
+
+class MockServer(ThreadingHTTPServer):
+    # 默认 backlog 只有 5，基准并发请求时会出现连接排队
+    request_queue_size = 128
+    daemon_threads = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="模拟 ARL 服务")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18080, help="监听端口，0 为自动选择")
+    parser.add_argument("--records", type=int, default=5000, help="每个结果接口的记录数")
+    parser.add_argument("--tasks", type=int, default=3, help="任务数，任务名为 bench-0、bench-1 ...")
+    parser.add_argument("--running", type=int, default=0, help="前几个任务的状态为 running，其余为 done")
+    parser.add_argument(
+        "--node", type=int, default=0,
+        help="节点序号，用于模拟多个 ARL 节点：大于 0 时任务名为 node<序号>-bench-<n>，任务/策略/资产范围 ID 互不重叠",
+    )
+    parser.add_argument("--latency", type=float, default=0, help="每个请求注入的固定延迟（毫秒）")
+    parser.add_argument("--jitter", type=float, default=0, help="每个请求额外的随机延迟上限（毫秒）")
+    parser.add_argument("--export-mb", type=float, default=8, help="/api/export/ 返回的字节数（MB）")
+    parser.add_argument("--seed", type=int, default=1, help="延迟抖动的随机种子")
+    args = parser.parse_args()
+
+    server = MockServer((args.host, args.port), Handler)
+    server.arl = MockARL(args)
+    print(f"listening on http://{args.host}:{server.server_address[1]}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
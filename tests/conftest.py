@@ -0,0 +1,60 @@
+# 测试公共配置：导入 arl_mcp 前设置必需的环境变量，并提供本地模拟 ARL（benchmarks/mock_arl.py）
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# config 在导入时读取环境变量；关闭快照库与资产索引，测试不读写用户目录
+os.environ.setdefault("ARL_TOKEN", "test-token")
+os.environ["ARL_STORE_PATH"] = ""
+os.environ["ARL_ASSET_INDEX_PATH"] = ""
+os.environ.pop("ARL_BACKENDS", None)
+
+# 模拟 ARL 的数据量：每个结果接口 50 条记录，任务 bench-0 ~ bench-2
+MOCK_RECORDS = 50
+MOCK_TASKS = 3
+
+
+def _run_mock(*args: str):
+    proc = subprocess.Popen(
+        [
+            sys.executable, os.path.join(ROOT, "benchmarks", "mock_arl.py"),
+            "--port", "0", "--records", str(MOCK_RECORDS), "--tasks", str(MOCK_TASKS), "--export-mb", "0.01", *args,
+        ],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        yield proc.stdout.readline().split()[-1]
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+@pytest.fixture(scope="session")
+def mock_arl_url():
+    yield from _run_mock()
+
+
+@pytest.fixture(scope="session")
+def mock_arl_node1_url():
+    """多节点测试中的第二个模拟节点，任务名为 node1-bench-<n>"""
+    yield from _run_mock("--node", "1")
+
+
+@pytest.fixture
+def mock_arl(mock_arl_url, monkeypatch):
+    """把唯一的 ARL 节点指向模拟服务，前后清空响应缓存与任务索引"""
+    from arl_mcp.backends import backends
+    from arl_mcp.client import response_cache
+    from arl_mcp.task_index import task_index
+
+    monkeypatch.setattr(backends[0], "url", mock_arl_url)
+    response_cache.invalidate()
+    task_index.clear()
+    yield mock_arl_url
+    response_cache.invalidate()
+    task_index.clear()
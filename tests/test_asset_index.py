@@ -0,0 +1,97 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from arl_mcp import asset_index as asset_index_module
+from arl_mcp.asset_index import AssetIndex, sync_assets
+
+pytestmark = pytest.mark.skipif(
+    sqlite3.sqlite_version_info < (3, 34, 0), reason="FTS5 trigram 分词需要 SQLite 3.34 及以上"
+)
+
+DOMAINS = [
+    {"_id": "d1", "domain": "admin.example.com", "ips": ["10.0.0.1"]},
+    {"_id": "d2", "domain": "www.example.com", "ips": ["10.0.0.2"], "record": ["10.0.0.2"]},
+    {"_id": "d3", "domain": "api.test.org", "ips": []},
+]
+IPS = [
+    {"_id": "i1", "ip": "10.0.0.1", "domain": ["admin.example.com"],
+     "port_info": [{"port_id": 22, "service_name": "ssh"}, {"port_id": 8080, "service_name": "http-proxy"}]},
+    {"_id": "i2", "ip": "10.0.0.2", "domain": ["www.example.com"],
+     "port_info": [{"port_id": 443, "service_name": "https", "product": "nginx"}]},
+]
+SITES = [
+    {"_id": "s1", "site": "https://admin.example.com", "title": "Admin Login", "finger": [{"name": "Nginx"}]},
+    {"_id": "s2", "site": "http://www.example.com:8080/", "title": "100% 可用", "finger": [{"name": "Tomcat"}]},
+]
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = AssetIndex(str(tmp_path / "assets.db"))
+    index.save("domain", "scope1", "default", DOMAINS)
+    index.save("ip", "scope1", "default", IPS)
+    index.save("site", "scope2", "default", SITES)
+    return index
+
+
+def ids(index: AssetIndex, kind: str = "", scope_id: str = "", port: int = 0, **terms) -> list[str]:
+    _, rows = index.search(kind, scope_id, terms, port)
+    return [data["_id"] for _, _, data in rows]
+
+
+def test_substring_and_case_insensitive(index):
+    assert ids(index, "domain", domain="ADMIN") == ["d1"]
+    assert ids(index, domain="admin") == ["d1", "i1", "s1"]
+    assert ids(index, "site", title="login") == ["s1"]
+    assert ids(index, "ip", finger="nginx") == ["i2"]
+
+
+def test_short_terms_and_prefix(index):
+    # 少于 3 个字符的关键词不经过 FTS5，逐条比较
+    assert ids(index, "domain", domain="pi") == ["d3"]
+    assert ids(index, "domain", domain="api*") == ["d3"]
+    assert ids(index, "domain", domain="test*") == []
+    # 多个取值以空格拼接，前缀可以匹配任一取值
+    assert ids(index, "domain", ip="10.0.0.2*") == ["d2"]
+
+
+def test_special_characters_are_literal(index):
+    assert ids(index, "site", title="100%") == ["s2"]
+    assert ids(index, "site", title="0%") == ["s2"]
+    assert ids(index, "site", title='"admin') == []
+
+
+def test_port_and_scope_filters(index):
+    assert ids(index, port=8080) == ["i1", "s2"]
+    # 站点未写端口时按协议取默认端口
+    assert ids(index, "site", port=443) == ["s1"]
+    assert ids(index, scope_id="scope2", domain="example") == ["s1", "s2"]
+
+
+def test_total_limit_and_offset(index):
+    total, rows = index.search("", "", {"domain": "example"}, limit=2, offset=1)
+    assert total == 6
+    assert [data["_id"] for _, _, data in rows] == ["d2", "i1"]
+
+
+def test_save_replaces_existing_records(index):
+    index.save("domain", "scope1", "default", [{"_id": "d1", "domain": "portal.example.com"}])
+    assert ids(index, "domain", domain="admin") == []
+    assert ids(index, "domain", domain="portal") == ["d1"]
+    count = index.save("domain", "scope1", "default", [{"_id": "d9", "domain": "new.example.com"}], replace=True)
+    assert count == 1
+    assert ids(index, "domain") == ["d9"]
+    assert index.known_ids("domain", "scope1", "default") == {"d9"}
+
+
+def test_sync_from_arl(mock_arl, tmp_path, monkeypatch):
+    monkeypatch.setattr(asset_index_module, "asset_index", AssetIndex(str(tmp_path / "assets.db")))
+    result = asyncio.run(sync_assets("ip", "scope1"))
+    assert (result["mode"], result["count"]) == ("full", 50)
+    # 已同步过的资产范围改为增量同步，读到已有记录即停止
+    result = asyncio.run(sync_assets("ip", "scope1"))
+    assert (result["mode"], result["added"], result["count"]) == ("incremental", 0, 50)
+    total, _ = asset_index_module.asset_index.search("ip", "scope1", {}, port=22)
+    assert total > 0
@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from arl_mcp import store
+from arl_mcp.metrics import metrics
+from arl_mcp.store import ResultStore
+from arl_mcp.tools import assets
+
+# 模拟 ARL 每个结果接口的记录数
+RECORDS = 50
+
+
+@pytest.fixture
+def result_store(tmp_path, monkeypatch):
+    result_store = ResultStore(str(tmp_path / "results.db"), 1 << 20)
+    monkeypatch.setattr(store, "result_store", result_store)
+    return result_store
+
+
+def test_delta_requires_store(mock_arl):
+    result = asyncio.run(assets.get_all_subdomains("example.com", delta=True))
+    assert result["status"] == "error"
+
+
+def test_delta_reports_added_and_removed(mock_arl, result_store, monkeypatch):
+    first = asyncio.run(assets.get_all_subdomains("example.com", delta=True))
+    assert first["baseline_created"]
+    assert (first["total"], len(first["added"]), first["removed"]) == (RECORDS, RECORDS, [])
+
+    again = asyncio.run(assets.get_all_subdomains("example.com", delta=True))
+    assert (again["baseline_created"], again["changed"], again["added"]) == (False, False, [])
+    assert again["last_sync"]
+
+    collect = assets.collect_subdomains
+
+    async def changed(domain):
+        # d0 消失，新增 new.example.com
+        return [d for d in await collect(domain) if d != "d0.example.com"] + ["new.example.com"]
+
+    monkeypatch.setattr(assets, "collect_subdomains", changed)
+    delta = asyncio.run(assets.get_all_subdomains("example.com", delta=True))
+    assert (delta["added"], delta["removed"]) == (["new.example.com"], ["d0.example.com"])
+    assert (delta["total"], delta["previous_total"], delta["unchanged_count"]) == (RECORDS, RECORDS, RECORDS - 1)
+
+
+def test_named_baselines_are_independent(mock_arl, result_store):
+    asyncio.run(assets.query_ip_list("example.com", delta=True))
+    # 另一个调用方的命名基线首次同步，不受默认基线已消费的变化影响
+    named = asyncio.run(assets.query_ip_list("example.com", delta=True, baseline="weekly"))
+    assert named["baseline_created"]
+    assert len(named["added"]) == RECORDS
+    assert not asyncio.run(assets.query_ip_list("example.com", delta=True, baseline="weekly"))["changed"]
+
+
+def test_max_results_caps_auto_pagination(mock_arl):
+    metrics.reset()
+    result = asyncio.run(assets.search_asset_domain(size=10, max_results=25))
+    assert len(result["domains"]) == 25
+    assert result["pagination"] == {"pages": 3, "max_results": 25, "truncated": True, "duplicates": 0}
+    # 凑满 25 条只需 3 页，不预取之后的页
+    assert metrics.request("GET", "/api/asset_domain/").calls == 3
+
+
+def test_all_pages_from_start_page(mock_arl):
+    result = asyncio.run(assets.search_asset_domain(page=2, size=20, all_pages=True))
+    assert len(result["domains"]) == RECORDS - 20
+    assert result["total"] == RECORDS
+    assert (result["pagination"]["pages"], result["pagination"]["truncated"]) == (2, False)
+
+
+def test_max_results_counts_rows_after_where(mock_arl):
+    # 每 10 个 IP 有一个使用 CDN，上限按过滤后的条数计算
+    result = asyncio.run(assets.search_asset_ip(size=10, max_results=3, where="cdn_name exists", fields="ip"))
+    assert result["ips"] == [{"ip": "10.0.0.0"}, {"ip": "10.0.0.10"}, {"ip": "10.0.0.20"}]
+    assert (result["pagination"]["pages"], result["pagination"]["truncated"]) == (3, True)
@@ -0,0 +1,65 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# MULTI_BACKEND 在导入时确定，多节点场景在配置了 ARL_BACKENDS 的子进程中运行
+SCRIPT = """
+import asyncio, json
+from arl_mcp.task_index import lookup_task
+from arl_mcp.tools.assets import search_asset_domain
+from arl_mcp.tools.tasks import list_all_tasks
+
+async def main():
+    backend, item = await lookup_task("node1-bench-2")
+    return {
+        "search": await search_asset_domain(size=10, fields="domain,_backend"),
+        "paged": await search_asset_domain(size=10, max_results=15),
+        "tasks": await list_all_tasks(size=10),
+        "lookup": [backend.name, item["_id"]],
+    }
+
+print(json.dumps(asyncio.run(main()), ensure_ascii=False))
+"""
+
+
+@pytest.fixture(scope="module")
+def fan_out(mock_arl_url, mock_arl_node1_url):
+    env = {
+        **os.environ,
+        "ARL_BACKENDS": f"n0={mock_arl_url},n1={mock_arl_node1_url},down=http://127.0.0.1:9",
+        # 不可达节点的连接失败不重试，测试不必等待退避
+        "ARL_MAX_RETRIES": "0",
+    }
+    out = subprocess.run([sys.executable, "-c", SCRIPT], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+def test_search_merges_nodes_and_reports_failures(fan_out):
+    result = fan_out["search"]
+    assert result["status"] == "success"
+    assert result["total"] == 100
+    # 两个节点返回相同的资产，只保留配置顺序中靠前节点的记录
+    assert {row["_backend"] for row in result["domains"]} == {"n0"}
+    assert len({row["domain"] for row in result["domains"]}) == 10
+    assert result["backends"]["n1"] == {"total": 50}
+    assert "error" in result["backends"]["down"]
+
+
+def test_merged_auto_pagination_respects_max_results(fan_out):
+    result = fan_out["paged"]
+    assert len(result["domains"]) == 15
+    assert result["pagination"]["truncated"]
+    assert result["pagination"]["duplicates"] == 15
+
+
+def test_task_listing_and_lookup_span_nodes(fan_out):
+    result = fan_out["tasks"]
+    assert result["total"] == 6
+    assert {(task["任务名"], task["节点"]) for task in result["tasks"]} >= {("bench-0", "n0"), ("node1-bench-0", "n1")}
+    assert "error" in result["backends"]["down"]
+    assert fan_out["lookup"] == ["n1", f"{0xBF0002:024x}"]
@@ -0,0 +1,128 @@
+import asyncio
+
+import httpx
+import pytest
+
+from arl_mcp.client import ResponseCache, TokenBucket, arl_get, inflight_requests, invalidate_reads
+from arl_mcp.metrics import metrics
+
+
+def response(body: bytes) -> httpx.Response:
+    return httpx.Response(200, content=body)
+
+
+def test_key_ignores_parameter_order_and_types():
+    key = ResponseCache.make_key("/api/domain/", {"size": 10, "domain": "a.com"})
+    assert key == ResponseCache.make_key("/api/domain/", {"domain": "a.com", "size": "10"})
+    assert key != ResponseCache.make_key("/api/domain/", {"domain": "b.com", "size": "10"})
+    assert key != ResponseCache.make_key("/api/domain/", {"domain": "a.com", "size": "10"}, "node1")
+    assert ResponseCache.make_key("/api/domain/", None) == ResponseCache.make_key("/api/domain/", {})
+
+
+def test_hit_miss_and_expiry():
+    cache = ResponseCache(10, 1024)
+    key = cache.make_key("/api/task/", {})
+    assert cache.get(key) is None
+    cache.put(key, response(b"ok"), ttl=60)
+    assert cache.get(key).content == b"ok"
+    # ttl 为 0 的条目写入后即过期
+    cache.put(key, response(b"stale"), ttl=0)
+    assert cache.get(key) is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"], stats["bytes"]) == (1, 2, 0, 0)
+
+
+def test_lru_eviction_by_entries():
+    cache = ResponseCache(2, 1024)
+    a, b, c = (cache.make_key(path, {}) for path in ("/a", "/b", "/c"))
+    cache.put(a, response(b"a"), 60)
+    cache.put(b, response(b"b"), 60)
+    cache.get(a)
+    cache.put(c, response(b"c"), 60)
+    assert cache.get(b) is None
+    assert cache.get(a) is not None and cache.get(c) is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_eviction_by_bytes():
+    cache = ResponseCache(10, 10)
+    a, b = cache.make_key("/a", {}), cache.make_key("/b", {})
+    cache.put(a, response(b"123456"), 60)
+    cache.put(b, response(b"123456"), 60)
+    assert cache.get(a) is None
+    assert cache.stats()["bytes"] == 6
+    # 超过总字节上限的单个响应不缓存
+    cache.put(a, response(b"x" * 11), 60)
+    assert cache.get(a) is None
+    assert cache.get(b) is not None
+
+
+def test_disabled_cache_stores_nothing():
+    cache = ResponseCache(0, 1024)
+    key = cache.make_key("/a", {})
+    cache.put(key, response(b"a"), 60)
+    assert cache.get(key) is None
+
+
+def test_invalidate_by_prefix():
+    cache = ResponseCache(10, 1024)
+    keys = [cache.make_key(path, {}) for path in ("/api/task/", "/api/task/stop/1", "/api/domain/")]
+    for key in keys:
+        cache.put(key, response(b"x"), 60)
+    cache.invalidate("/api/task/")
+    assert [cache.get(key) is not None for key in keys] == [False, False, True]
+    cache.invalidate()
+    assert cache.stats()["entries"] == 0
+
+
+@pytest.mark.parametrize("rate", [0, -1])
+def test_token_bucket_rejects_non_positive_rate(rate):
+    with pytest.raises(ValueError):
+        TokenBucket(rate)
+
+
+def test_token_bucket_limits_rate():
+    async def run() -> float:
+        bucket = TokenBucket(20, capacity=1)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for _ in range(4):
+            await bucket.acquire()
+        return loop.time() - start
+
+    # 首个令牌立即可用，其余 3 个各需约 1/20 秒
+    assert asyncio.run(run()) >= 0.14
+
+
+def test_concurrent_identical_gets_share_one_request(mock_arl):
+    metrics.reset()
+
+    async def run() -> list[httpx.Response]:
+        same = [arl_get("/api/domain/", {"domain": "a.com", "page": 1}) for _ in range(5)]
+        other = arl_get("/api/domain/", {"domain": "b.com", "page": 1})
+        return await asyncio.gather(*same, other)
+
+    responses = asyncio.run(run())
+    assert len({id(resp) for resp in responses[:5]}) == 1
+    assert responses[5].json()["items"][0]["domain"].endswith("b.com")
+    stats = metrics.request("GET", "/api/domain/")
+    assert (stats.calls, stats.coalesced) == (2, 4)
+    # 请求结束后即移除，之后的相同调用重新发起请求
+    assert len(inflight_requests) == 0
+    asyncio.run(arl_get("/api/domain/", {"domain": "a.com", "page": 1}))
+    assert (stats.calls, stats.coalesced) == (3, 4)
+
+
+def test_write_stops_reuse_of_inflight_read(mock_arl):
+    metrics.reset()
+
+    async def run() -> None:
+        first = asyncio.ensure_future(arl_get("/api/task/", {"page": 1}))
+        await asyncio.sleep(0)
+        invalidate_reads("/api/task/")
+        # 写操作之后的读取不复用写之前发出的请求
+        await asyncio.gather(first, arl_get("/api/task/", {"page": 1}))
+
+    asyncio.run(run())
+    stats = metrics.request("GET", "/api/task/")
+    assert (stats.calls, stats.coalesced) == (2, 0)
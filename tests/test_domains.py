@@ -0,0 +1,65 @@
+from arl_mcp.domains import _tld_extractor, normalize_target, registrable_domain, scan_traffic, scan_traffic_file
+
+RAW_REQUESTS = (
+    b"GET http://www.a.com/login HTTP/1.1\r\nHost: www.a.com\r\nReferer: https://b.com/\r\n\r\n"
+    b"POST /api HTTP/1.1\r\nHost: api.a.com\r\n\r\n"
+)
+
+HAR = (
+    b'{"log": {"entries": ['
+    b'{"request": {"method": "GET", "url": "https://a.com/", "headers": [{"name": "Host", "value": "a.com"}]}},'
+    b'{"request": {"method": "GET", "url": "https://c.org/x", "headers": [{"name": "host", "value": "c.org"}]}}'
+    b']}}'
+)
+
+def test_suffix_list_is_offline():
+    # 未配置 ARL_SUFFIX_LIST 时只用 tldextract 自带的快照，不联网
+    assert _tld_extractor.suffix_list_urls == ()
+    assert _tld_extractor.fallback_to_snapshot
+
+
+def test_registrable_domain():
+    assert registrable_domain("www.bbc.co.uk") == "bbc.co.uk"
+    assert registrable_domain("x.y.com.cn") == "y.com.cn"
+    assert registrable_domain("localhost") == ""
+    registrable_domain.cache_clear()
+    for _ in range(3):
+        registrable_domain("api.a.com")
+    assert (registrable_domain.cache_info().hits, registrable_domain.cache_info().misses) == (2, 1)
+
+
+def test_normalize_target_keeps_ips():
+    assert normalize_target("www.a.com") == "a.com"
+    assert normalize_target("1.1.1.1") == "1.1.1.1"
+    assert normalize_target(" 10.0.0.0/24") == "10.0.0.0/24"
+    assert normalize_target("intranet") == "intranet"
+
+
+def test_request_counted_once_per_domain():
+    domains, hits = scan_traffic(RAW_REQUESTS)
+    # 第一个请求的 URL 与 Host 头只计一次
+    assert domains == {"a.com": 2, "b.com": 1}
+    assert hits == 4
+
+
+def test_har_entry_counted_once_per_domain():
+    domains, hits = scan_traffic(HAR)
+    assert domains == {"a.com": 1, "c.org": 1}
+    assert hits == 4
+
+
+def test_text_without_request_boundaries_counts_every_match():
+    domains, hits = scan_traffic(b"https://a.com/1\nhttps://a.com/2\n10.0.0.1 http://10.0.0.1:8080/\n")
+    assert domains == {"a.com": 2, "10.0.0.1": 1}
+    assert hits == 3
+
+
+def test_scan_file_matches_bytes(tmp_path):
+    path = tmp_path / "dump.txt"
+    path.write_bytes(RAW_REQUESTS * 3)
+    domains, hits, size = scan_traffic_file(str(path))
+    assert (domains, hits, size) == ({"a.com": 6, "b.com": 3}, 12, len(RAW_REQUESTS) * 3)
+
+    empty = tmp_path / "empty.txt"
+    empty.write_bytes(b"")
+    assert scan_traffic_file(str(empty)) == ({}, 0, 0)
@@ -0,0 +1,51 @@
+import asyncio
+import hashlib
+import os
+
+from arl_mcp.tools.export import export_tasks_to_files
+
+
+def mock_task_id(n: int) -> str:
+    return f"{0xBE0000 + n:024x}"
+
+
+def test_export_streams_each_task_to_a_file(mock_arl, tmp_path):
+    result = asyncio.run(export_tasks_to_files(
+        f"bench-0, {mock_task_id(1)} bench-0 nope", output_dir=str(tmp_path), concurrency=2
+    ))
+    assert result["status"] == "partial"
+    assert result["failed"] == [{"task_id": "nope", "reason": "任务不存在"}]
+    files = {f["task_id"]: f for f in result["files"]}
+    assert sorted(files) == [mock_task_id(0), mock_task_id(1)]
+    for task_id, info in files.items():
+        path = tmp_path / f"{task_id}.xlsx"
+        assert info["path"] == str(path)
+        data = path.read_bytes()
+        assert (info["bytes"], info["sha256"]) == (len(data), hashlib.sha256(data).hexdigest())
+    assert result["total_bytes"] == sum(f["bytes"] for f in files.values())
+    # 下载用的隐藏临时文件已全部改名，没有残留
+    assert sorted(p.name for p in tmp_path.iterdir()) == [f"{t}.xlsx" for t in sorted(files)]
+
+
+def test_repeat_export_replaces_file(mock_arl, tmp_path):
+    for _ in range(2):
+        result = asyncio.run(export_tasks_to_files("bench-2", output_dir=str(tmp_path)))
+        assert result["status"] == "success"
+    assert [p.name for p in tmp_path.iterdir()] == [f"{mock_task_id(2)}.xlsx"]
+
+
+def test_failed_rename_removes_staging_file(mock_arl, tmp_path, monkeypatch):
+    replace = os.replace
+
+    def deny_final(src, dst):
+        # 下载完成的 .part 文件照常改名，只让改名为最终文件这一步失败
+        if dst.endswith(".xlsx"):
+            raise PermissionError("denied")
+        replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", deny_final)
+    result = asyncio.run(export_tasks_to_files("bench-1", output_dir=str(tmp_path)))
+    assert result["status"] == "error"
+    assert result["failed"][0]["reason"].startswith("无法写入导出文件")
+    # 改名失败时删除已下载的隐藏临时文件
+    assert list(tmp_path.iterdir()) == []
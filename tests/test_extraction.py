@@ -0,0 +1,40 @@
+import asyncio
+
+from arl_mcp.tools.extraction import extract_domain_or_ip, extract_domains_batch, extract_hosts_from_traffic
+
+
+def test_extract_domain_or_ip():
+    assert extract_domain_or_ip("www.baidu.com") == "baidu.com"
+    assert extract_domain_or_ip("192.168.0.0/24") == "192.168.0.0/24"
+
+
+def test_extract_domains_batch_counts_and_unresolved():
+    result = extract_domains_batch("www.a.com,api.a.com\nb.co.uk 1.1.1.1;10.0.0.0/24 localhost intranet localhost")
+    assert result["status"] == "success"
+    assert result["domains"] == {"a.com": 2, "b.co.uk": 1, "1.1.1.1": 1, "10.0.0.0/24": 1}
+    assert result["unresolved"] == ["localhost", "intranet"]
+    assert (result["input_count"], result["unique_count"]) == (8, 4)
+
+
+def test_extract_hosts_from_traffic_text_and_path(tmp_path):
+    dump = (
+        "GET http://www.a.com/ HTTP/1.1\nHost: www.a.com\n\n"
+        "GET /x HTTP/1.1\nHost: api.a.com\nReferer: http://b.com/\n\n"
+        "GET /y HTTP/1.1\nHost: c.org\n\n"
+    )
+    result = asyncio.run(extract_hosts_from_traffic(text=dump, top=2))
+    assert result["status"] == "success"
+    assert result["domains"] == {"a.com": 2, "b.com": 1}
+    assert (result["host_hits"], result["unique_domains"]) == (5, 3)
+
+    path = tmp_path / "burp.txt"
+    path.write_text(dump * 2)
+    result = asyncio.run(extract_hosts_from_traffic(path=str(path)))
+    assert result["domains"] == {"a.com": 4, "b.com": 2, "c.org": 2}
+    assert result["bytes_scanned"] == len(dump) * 2
+
+
+def test_extract_hosts_from_traffic_errors(tmp_path):
+    assert asyncio.run(extract_hosts_from_traffic())["status"] == "error"
+    result = asyncio.run(extract_hosts_from_traffic(path=str(tmp_path / "missing.har")))
+    assert result["status"] == "error"
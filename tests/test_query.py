@@ -0,0 +1,129 @@
+import asyncio
+
+import pytest
+
+from arl_mcp.query import RowQuery
+
+ITEMS = [
+    {
+        "_id": "1",
+        "ip": "10.0.0.1",
+        "port_info": [{"port_id": 80, "service_name": "http"}, {"port_id": 443, "service_name": "https"}],
+        "cdn_name": "",
+        "geo_asn": {"location": "CN"},
+    },
+    {
+        "_id": "2",
+        "ip": "10.0.0.2",
+        "port_info": [{"port_id": 22, "service_name": "ssh"}],
+        "cdn_name": "cloudflare",
+        "geo_asn": {"location": "US"},
+    },
+    {"_id": "3", "ip": "10.0.0.3", "port_info": [], "geo_asn": {}},
+]
+
+
+def ids(where: str) -> list[str]:
+    return [item["_id"] for item in RowQuery(where).filter(ITEMS)]
+
+
+@pytest.mark.parametrize(
+    "where, expected",
+    [
+        ("port_info.port_id = 80", ["1"]),
+        ("geo_asn.location = cn", ["1"]),
+        ("port_info.service_name ~ HTTP", ["1"]),
+        ("port_info.port_id >= 443", ["1"]),
+        ("port_info.port_id < 80", ["2"]),
+        ("port_info.port_id in 80, 22", ["1", "2"]),
+        ("cdn_name exists", ["2"]),
+        ("cdn_name empty; port_info.port_id = 443", ["1"]),
+        ("", ["1", "2", "3"]),
+    ],
+)
+def test_positive_operators(where, expected):
+    assert ids(where) == expected
+
+
+@pytest.mark.parametrize(
+    "where, expected",
+    [
+        # 列表字段任一元素命中即排除：记录 1 还有 443 端口，但含 80 端口，不满足 != 80
+        ("port_info.port_id != 80", ["2", "3"]),
+        ("port_info.service_name !~ http", ["2", "3"]),
+        ("port_info.port_id not in 80,22", ["3"]),
+        ("port_info.port_id NOT  IN 443", ["2", "3"]),
+        # 缺失字段、空字符串、空列表与空对象都视为 empty
+        ("cdn_name empty", ["1", "3"]),
+        ("port_info empty", ["3"]),
+        ("geo_asn.location empty", ["3"]),
+    ],
+)
+def test_negated_operators(where, expected):
+    assert ids(where) == expected
+
+
+def test_numeric_comparison_skips_non_numeric_values():
+    assert ids("ip > 1") == []
+
+
+@pytest.mark.parametrize("where", ["port_info.port_id", "= 80", "port_info.port_id between 1,2"])
+def test_unparsable_clause(where):
+    with pytest.raises(ValueError):
+        RowQuery(where)
+
+
+def test_select_and_reshapes():
+    assert RowQuery().select is None
+    assert RowQuery("cdn_name exists").select is not None
+    assert not RowQuery("cdn_name empty").reshapes
+    assert RowQuery(fields="ip").reshapes
+    assert RowQuery(group_by="ip").reshapes
+
+
+def test_project_nested_fields():
+    query = RowQuery(fields="ip, port_info.port_id, geo_asn.location")
+    assert query.project(ITEMS[:2]) == [
+        {"ip": "10.0.0.1", "port_info.port_id": [80, 443], "geo_asn.location": "CN"},
+        {"ip": "10.0.0.2", "port_info.port_id": [22], "geo_asn.location": "US"},
+    ]
+
+
+def test_group_counts_each_value_once_per_record():
+    items = [{"tags": ["a", "a", "b"]}, {"tags": "a"}, {"tags": []}]
+    assert RowQuery(group_by="tags").group(items) == [
+        {"value": "a", "count": 2},
+        {"value": "b", "count": 1},
+        {"value": "(none)", "count": 1},
+    ]
+
+
+def test_response_formats():
+    grouped = RowQuery("cdn_name empty", group_by="geo_asn.location")
+    result = grouped.response(10, grouped.filter(ITEMS), "ips")
+    assert result == {
+        "status": "success",
+        "total": 10,
+        "matched": 2,
+        "group_by": "geo_asn.location",
+        "groups": [{"value": "CN", "count": 1}, {"value": "(none)", "count": 1}],
+    }
+    projected = RowQuery(fields="ip").response(3, ITEMS, "ips")
+    assert projected["ips"] == [{"ip": "10.0.0.1"}, {"ip": "10.0.0.2"}, {"ip": "10.0.0.3"}]
+
+
+def test_search_tool_applies_where(mock_arl):
+    from arl_mcp.tools.assets import search_asset_ip
+
+    # 模拟数据中序号为 10 的倍数的 IP 带 CDN
+    result = asyncio.run(search_asset_ip(size=50, where="cdn_name exists", fields="ip,cdn_name"))
+    assert result["status"] == "success"
+    assert result["matched"] == 5
+    assert {row["cdn_name"] for row in result["ips"]} == {"cloudflare"}
+
+    result = asyncio.run(search_asset_ip(size=50, where="port_info.port_id = 22", group_by="geo_asn.location"))
+    assert result["status"] == "success"
+    assert sum(group["count"] for group in result["groups"]) == result["matched"] > 0
+
+    result = asyncio.run(search_asset_ip(where="cdn_name"))
+    assert result["status"] == "error"
@@ -0,0 +1,122 @@
+import asyncio
+
+import pytest
+
+from arl_mcp.resilience import CLOSED, HALF_OPEN, OPEN, AdaptiveLimiter, CircuitBreaker, CircuitOpenError
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(threshold=2, cooldown=60)
+    breaker.record(True, reason="timeout")
+    breaker.record(False)
+    breaker.record(True, reason="timeout")
+    assert breaker.state == CLOSED
+    breaker.record(True, reason="HTTP 502")
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError) as error:
+        breaker.before_request()
+    assert "HTTP 502" in str(error.value)
+    assert error.value.retry_after > 1
+    assert breaker.snapshot()["rejected"] == 1
+
+
+def test_half_open_allows_one_probe():
+    breaker = CircuitBreaker(threshold=1, cooldown=0)
+    breaker.record(True)
+    assert breaker.before_request() is True
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    breaker.record(False, probe=True)
+    assert breaker.state == CLOSED
+    assert breaker.before_request() is False
+
+
+def test_failed_probe_reopens():
+    breaker = CircuitBreaker(threshold=3, cooldown=0)
+    for _ in range(3):
+        breaker.record(True)
+    probe = breaker.before_request()
+    breaker.record(True, probe=probe)
+    assert breaker.state == OPEN
+    assert breaker.trips == 2
+    assert breaker.snapshot()["transitions"] == {"closed->open": 1, "open->half_open": 1, "half_open->open": 1}
+
+
+def test_cancelled_probe_releases_slot():
+    breaker = CircuitBreaker(threshold=1, cooldown=0)
+    breaker.record(True)
+    probe = breaker.before_request()
+    breaker.record(None, probe=probe)
+    assert breaker.state == HALF_OPEN
+    assert breaker.before_request() is True
+
+
+def test_breaker_disabled():
+    breaker = CircuitBreaker(threshold=0, cooldown=60)
+    for _ in range(10):
+        breaker.record(True)
+    assert breaker.before_request() is False
+    assert breaker.state == CLOSED
+
+
+def test_limiter_halves_on_slow_requests_once_per_window():
+    async def run(limiter: AdaptiveLimiter) -> None:
+        await limiter.acquire()
+        limiter.release(elapsed=2.0)
+        await limiter.acquire()
+        limiter.release(failed=True, elapsed=0.1)
+
+    limiter = AdaptiveLimiter(1, 8, latency_target=1.0)
+    asyncio.run(run(limiter))
+    # 第二次失败紧接第一次减半，不重复减半
+    assert limiter.limit == 4
+    assert limiter.decreases == 1
+
+
+def test_limiter_grows_additively():
+    async def run(limiter: AdaptiveLimiter) -> None:
+        for _ in range(4):
+            await limiter.acquire()
+            limiter.release(elapsed=0.01)
+
+    limiter = AdaptiveLimiter(1, 8, latency_target=1.0)
+    limiter._limit = 4.0
+    asyncio.run(run(limiter))
+    # 每次成功增加 1/limit，约 limit 次后上限加 1
+    assert limiter.limit == 4
+    asyncio.run(run(limiter))
+    assert limiter.limit == 5
+    assert limiter.increases == 1
+
+
+def test_limiter_respects_bounds():
+    limiter = AdaptiveLimiter(0, 0, latency_target=1.0)
+    assert (limiter.min_limit, limiter.max_limit, limiter.limit) == (1, 1, 1)
+    limiter = AdaptiveLimiter(2, 4, latency_target=0)
+    limiter._adjust(10.0, True)
+    assert limiter.limit == 4
+
+
+def test_limiter_queues_in_order_and_skips_cancelled_waiters():
+    async def run() -> list[str]:
+        limiter = AdaptiveLimiter(1, 1, latency_target=0)
+        order = []
+
+        async def worker(name: str) -> None:
+            await limiter.acquire()
+            order.append(name)
+            await asyncio.sleep(0.01)
+            limiter.release()
+
+        await limiter.acquire()
+        tasks = [asyncio.create_task(worker(name)) for name in "abc"]
+        await asyncio.sleep(0)
+        assert limiter.waiting == 3
+        tasks[1].cancel()
+        limiter.release()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        assert limiter.inflight == 0
+        return order
+
+    assert asyncio.run(run()) == ["a", "c"]
@@ -0,0 +1,93 @@
+import asyncio
+import contextvars
+import inspect
+import types
+
+import pytest
+
+from arl_mcp import app
+from arl_mcp.sessions import limit_per_client, sessions
+from arl_mcp.tools.assets import search_asset_domain
+from arl_mcp.tools.extraction import detect_reply_language, session_settings
+
+_session = contextvars.ContextVar("test_session", default=None)
+
+
+class FakeSession:
+    """代替 MCP 的 ServerSession，只作为会话表的键"""
+
+    def __init__(self, name: str):
+        self.client_params = types.SimpleNamespace(clientInfo=types.SimpleNamespace(name=name))
+
+
+@pytest.fixture
+def in_session(monkeypatch):
+    """让 mcp.get_context() 返回当前上下文中的模拟会话；返回以指定会话调用工具的协程函数"""
+    def get_context():
+        session = _session.get()
+        if session is None:
+            raise LookupError("not in a request")
+        return types.SimpleNamespace(session=session)
+
+    monkeypatch.setattr(app.mcp, "get_context", get_context)
+
+    async def call(session: FakeSession, fn, *args, **kwargs):
+        _session.set(session)
+        result = fn(*args, **kwargs)
+        return await result if inspect.isawaitable(result) else result
+
+    return call
+
+
+def test_settings_are_per_session(mock_arl, in_session):
+    alice, bob = FakeSession("alice"), FakeSession("bob")
+
+    async def run():
+        await in_session(alice, session_settings, page_size=5, scope_id="s1")
+        await in_session(alice, detect_reply_language, "scan this domain")
+        await in_session(bob, detect_reply_language, "扫描这个域名")
+        return (
+            await in_session(alice, search_asset_domain),
+            await in_session(bob, search_asset_domain),
+            await in_session(alice, session_settings),
+            await in_session(bob, session_settings),
+        )
+
+    alice_search, bob_search, alice_settings, bob_settings = asyncio.run(run())
+    assert len(alice_search["domains"]) == 5
+    assert len(bob_search["domains"]) == 50
+    assert (alice_settings["language"], alice_settings["scope_id"], alice_settings["page_size"]) == ("en", "s1", 5)
+    assert (bob_settings["language"], bob_settings["scope_id"], bob_settings["page_size"]) == ("zh", "", 0)
+    assert alice_settings["session"].startswith("alice#")
+    # 不在 MCP 请求中的调用使用进程级的 local 会话，不受上面的设置影响
+    assert sessions.local.settings() == {"language": "zh", "scope_id": "", "page_size": 0}
+
+
+def test_call_limit_is_per_session(in_session, monkeypatch):
+    monkeypatch.setattr(sessions, "limit", 1)
+    active, peak = {}, {}
+
+    @limit_per_client
+    async def slow_tool(name: str) -> None:
+        active[name] = active.get(name, 0) + 1
+        peak[name] = max(peak.get(name, 0), active[name])
+        await asyncio.sleep(0.05)
+        active[name] -= 1
+
+    alice, bob = FakeSession("alice"), FakeSession("bob")
+
+    async def run() -> float:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await asyncio.gather(
+            in_session(alice, slow_tool, "alice"),
+            in_session(alice, slow_tool, "alice"),
+            in_session(bob, slow_tool, "bob"),
+            in_session(bob, slow_tool, "bob"),
+        )
+        return loop.time() - start
+
+    elapsed = asyncio.run(run())
+    # 每个会话同时只执行一个调用，两个会话互不阻塞：总耗时约两次调用而不是四次
+    assert peak == {"alice": 1, "bob": 1}
+    assert elapsed < 0.15
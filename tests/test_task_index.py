@@ -0,0 +1,107 @@
+import asyncio
+
+from arl_mcp import task_index as task_index_module
+from arl_mcp.task_index import TaskIndex, looks_like_task_id, lookup_task, resolve_task_ids, task_index
+
+# 模拟 ARL 中任务 bench-<n> 的 ID
+def mock_task_id(n: int) -> str:
+    return f"{0xBE0000 + n:024x}"
+
+
+def test_looks_like_task_id():
+    assert looks_like_task_id("65a1b2c3d4e5f60718293a4b")
+    assert not looks_like_task_id("65A1B2C3D4E5F60718293A4B")
+    assert not looks_like_task_id("bench-1")
+
+
+def test_find_by_id_and_newest_name():
+    index = TaskIndex(10)
+    index.add("a" * 24, "scan", "a.com", "done", "default")
+    index.add("b" * 24, "scan", "b.com", "running", "default")
+    assert index.find("a" * 24).target == "a.com"
+    # 同名任务取 ID 最大即最新创建的一个
+    assert index.find("scan").task_id == "b" * 24
+    assert index.find("other") is None
+    assert (index.stats()["hits"], index.stats()["misses"]) == (2, 1)
+
+
+def test_update_requires_id_and_name():
+    index = TaskIndex(10)
+    index.update({"_id": "a" * 24}, "default")
+    index.update({"name": "scan"}, "default")
+    index.update({"_id": "b" * 24, "name": "scan", "status": "running"}, "node1")
+    assert index.stats()["tasks"] == 1
+    task = index.find("b" * 24)
+    assert (task.status, task.backend, task.target) == ("running", "node1", "")
+
+
+def test_eviction_and_discard():
+    index = TaskIndex(2)
+    for n in range(3):
+        index.add(str(n) * 24, f"t{n}", "", "done", "default")
+    assert index.find("0" * 24) is None
+    assert index.find("t0") is None
+    index.discard(["1" * 24, "9" * 24])
+    assert index.find("t1") is None
+    assert (index.stats()["tasks"], index.stats()["names"]) == (1, 1)
+    index.clear()
+    assert index.stats()["tasks"] == 0
+
+
+def test_lookup_by_name_and_id(mock_arl):
+    backend, item = asyncio.run(lookup_task("bench-1"))
+    assert item["_id"] == mock_task_id(1)
+    assert task_index.find(mock_task_id(1)).name == "bench-1"
+
+    _, item = asyncio.run(lookup_task(mock_task_id(2)))
+    assert item["name"] == "bench-2"
+
+    _, item = asyncio.run(lookup_task("nope"))
+    assert item is None
+
+
+def test_lookup_drops_deleted_index_entries(mock_arl):
+    deleted = "f" * 24
+    task_index.add(deleted, "gone", "", "done", "default")
+    _, item = asyncio.run(lookup_task(deleted))
+    assert item is None
+    assert task_index.find(deleted) is None
+
+
+def test_resolve_groups_ids_and_reports_missing(mock_arl):
+    groups, missing = asyncio.run(resolve_task_ids(["bench-0", mock_task_id(1), "bench-0", "nope"]))
+    assert [ids for ids in groups.values()] == [[mock_task_id(0), mock_task_id(1)]]
+    assert missing == ["nope"]
+
+
+def test_resolve_name_drops_deleted_index_entry(mock_arl):
+    # 索引中的同名任务已被删除，按任务 ID 确认失败后改为按任务名向 ARL 查询
+    task_index.add("0" * 24, "bench-2", "", "done", "default")
+    groups, missing = asyncio.run(resolve_task_ids(["bench-2"]))
+    assert [ids for ids in groups.values()] == [[mock_task_id(2)]]
+    assert missing == []
+
+
+def test_repeat_name_lookup_skips_name_query(mock_arl, monkeypatch):
+    queries = []
+    get_task = task_index_module._get_task
+
+    async def spy(params, backend):
+        queries.append(set(params) - {"size"})
+        return await get_task(params, backend)
+
+    monkeypatch.setattr(task_index_module, "_get_task", spy)
+    for _ in range(3):
+        _, item = asyncio.run(lookup_task("bench-1"))
+        assert item["_id"] == mock_task_id(1)
+    # 只有第一次按任务名查询，之后按索引中的任务 ID 确认
+    assert queries == [{"name"}, {"_id"}, {"_id"}]
+
+
+def test_newer_same_name_task_from_list_replaces_older(mock_arl):
+    task_index.add(mock_task_id(0), "bench-1", "", "done", "default")
+    assert task_index.find("bench-1").task_id == mock_task_id(0)
+    # list_all_tasks 的结果页写入更新的同名任务后按任务名解析到它
+    task_index.update({"_id": mock_task_id(1), "name": "bench-1"}, "default")
+    _, item = asyncio.run(lookup_task("bench-1"))
+    assert item["_id"] == mock_task_id(1)
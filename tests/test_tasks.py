@@ -0,0 +1,86 @@
+import asyncio
+
+import httpx
+
+from arl_mcp.tools import tasks
+
+
+def test_bulk_submit_non_json_reply_fails_only_that_target(mock_arl, monkeypatch):
+    post = tasks.arl_post
+    invalidated = []
+
+    async def flaky_post(path, payload, **kwargs):
+        if payload["target"] == "b.com":
+            return httpx.Response(200, content=b"<html>502 Bad Gateway</html>")
+        return await post(path, payload, **kwargs)
+
+    monkeypatch.setattr(tasks, "arl_post", flaky_post)
+    monkeypatch.setattr(tasks, "invalidate_reads", lambda: invalidated.append(True))
+    result = asyncio.run(tasks.add_scan_tasks_bulk(targets="a.com b.com c.com", rate=1000))
+    assert result["status"] == "partial"
+    assert [r["target"] for r in result["submitted"]] == ["a.com", "c.com"]
+    assert [(r["target"], r["status"]) for r in result["failed"]] == [("b.com", "fail")]
+    # 请求已发出，ARL 可能已经建了任务，读缓存仍要失效
+    assert invalidated
+
+
+def test_extract_timed_out_module_is_not_reported_complete(mock_arl, monkeypatch):
+    extract = tasks.extract_module
+
+    async def slow_ips(key, collect, domain, task_id, snapshot=False):
+        if key == "ips":
+            await asyncio.sleep(5)
+        return await extract(key, collect, domain, task_id, snapshot)
+
+    monkeypatch.setattr(tasks, "extract_module", slow_ips)
+    result = asyncio.run(tasks.query_and_extract("bench-0", "example.com", timeout=0.5))
+    assert result["status"] == "partial"
+    assert result["超时模块"] == ["IP收集"]
+    assert result["已完成模块"] == ["子域名爆破", "站点探测", "文件泄露检测"]
+    assert "ips" not in result["extracted_data"]
+
+
+def test_concurrent_waiters_share_one_poll_loop(mock_arl, monkeypatch):
+    lookup = tasks.lookup_task
+    calls = []
+
+    async def progressing_lookup(ref, backend=None):
+        # 前两次轮询时任务还在运行，没有模块完成
+        node, item = await lookup(ref, backend)
+        calls.append(ref)
+        if len(calls) <= 2:
+            item = {**item, "status": "running", "service": []}
+        return node, item
+
+    monkeypatch.setattr(tasks, "lookup_task", progressing_lookup)
+    monkeypatch.setattr(tasks, "ARL_POLL_INITIAL", 0.01)
+    monkeypatch.setattr(tasks, "ARL_POLL_MAX", 0.02)
+
+    async def run() -> list[dict]:
+        return await asyncio.gather(*(tasks.wait_for_task("bench-1", timeout=10) for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert [r["status"] for r in results] == ["done"] * 5
+    # 五个等待者共用一个轮询循环，首次按任务名、之后按任务 ID 查询
+    assert len(calls) == 3
+    assert calls[1:] == [results[0]["任务ID"]] * 2
+    assert not tasks._task_watchers
+
+
+def test_bulk_submit_removes_duplicate_targets(mock_arl, monkeypatch):
+    posted = []
+    post = tasks.arl_post
+
+    async def spy_post(path, payload, **kwargs):
+        posted.append(payload["target"])
+        return await post(path, payload, **kwargs)
+
+    monkeypatch.setattr(tasks, "arl_post", spy_post)
+    result = asyncio.run(tasks.add_scan_tasks_bulk(
+        targets="a.com www.a.com,api.a.com\nb.a.com 10.0.0.0/24 10.0.0.0/24", rate=1000
+    ))
+    assert result["status"] == "success"
+    # 子域名归一到主域名后去重，每个目标只提交一次
+    assert sorted(posted) == ["10.0.0.0/24", "a.com"]
+    assert result["duplicates_removed"] == 4
+    assert result["skipped_active"] == []